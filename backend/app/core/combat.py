@@ -1,6 +1,6 @@
 # backend/app/core/combat.py
 from typing import Dict, Any, Tuple, List, TYPE_CHECKING
-from .. import schemas # For ServerResponse types
+from . import events # Turn events sent to the client
 from .tiles import TILE_FLOOR # For map updates
 
 if TYPE_CHECKING:
@@ -41,12 +41,12 @@ def resolve_player_attack_on_monster(
     monster_hp_after_attack: int,
     monster_died: bool, 
     base_combat_message: str
-) -> List[schemas.ServerResponse]:
-    responses: List[schemas.ServerResponse] = []
+) -> List[events.TurnResponse]:
+    responses: List[events.TurnResponse] = []
     
     target_monster["hp"] = monster_hp_after_attack 
 
-    responses.append(schemas.CombatEventServerResponse(
+    responses.append(events.CombatEvent(
         attacker_faction="player", defender_id=target_monster["id"], defender_type=target_monster["type_name"],
         damage_done=damage_dealt, defender_hp_current=target_monster["hp"], 
         defender_hp_max=target_monster["max_hp"], message=base_combat_message
@@ -58,9 +58,9 @@ def resolve_player_attack_on_monster(
         if xp_gain > 0:
             death_message += f" You gain {xp_gain} XP."
         
-        responses.append(schemas.EntityDiedServerResponse(
+        responses.append(events.EntityDied(
             entity_id=target_monster["id"], entity_type=target_monster["type_name"], 
-            pos=schemas.Position(x=target_monster["x"],y=target_monster["y"]), 
+            x=target_monster["x"], y=target_monster["y"], 
             message=death_message
         ))
         
@@ -71,17 +71,14 @@ def resolve_player_attack_on_monster(
         
         gs.entity_manager.remove_monster(target_monster)
         
-        responses.append(schemas.TileChangeServerResponse(
-            pos=schemas.Position(x=target_monster["x"],y=target_monster["y"]), 
-            new_tile_type=TILE_FLOOR
-        ))
+        responses.append(events.TileChange(target_monster["x"], target_monster["y"], TILE_FLOOR))
         
         if xp_gain > 0: 
             xp_responses, leveled_up = gs.player.grant_xp(xp_gain)
             responses.extend(xp_responses)
             # Ensure PlayerStatsUpdate is sent if XP changed but no level up (grant_xp handles level up case)
-            if not leveled_up and not any(isinstance(r, schemas.PlayerStatsUpdateServerResponse) for r in xp_responses):
-                 responses.append(schemas.PlayerStatsUpdateServerResponse(stats=gs.player.create_player_stats_response()))
+            if not leveled_up and not any(isinstance(r, events.PlayerStatsUpdate) for r in xp_responses):
+                 responses.append(events.PlayerStatsUpdate(stats=gs.player.create_player_stats_response()))
     return responses
 
 def resolve_monster_attack_on_player(
@@ -89,8 +86,8 @@ def resolve_monster_attack_on_player(
     attacking_monster_stats: Dict[str, Any], 
     damage_dealt: int,
     base_combat_message: str # This should be the direct output from apply_attack
-) -> List[schemas.ServerResponse]:
-    responses: List[schemas.ServerResponse] = []
+) -> List[events.TurnResponse]:
+    responses: List[events.TurnResponse] = []
     player_effective_stats_before_hit = gs.player.get_effective_stats()
 
     player_died_from_attack = gs.player.take_damage(damage_dealt)
@@ -99,7 +96,7 @@ def resolve_monster_attack_on_player(
     # base_combat_message might be "Monster hits you for X damage."
     # If retaliation, GameState's handle_player_move can prepend "Monster retaliates! "
     
-    responses.append(schemas.CombatEventServerResponse(
+    responses.append(events.CombatEvent(
         attacker_id=attacking_monster_stats["id"], attacker_type=attacking_monster_stats["type_name"], 
         defender_faction="player", damage_done=damage_dealt, 
         defender_hp_current=gs.player.hp, defender_hp_max=player_effective_stats_before_hit["max_hp"], 
@@ -108,7 +105,7 @@ def resolve_monster_attack_on_player(
 
     if player_died_from_attack:
         gs.game_over = True
-        responses.append(schemas.PlayerDiedServerResponse(message=f"You have been slain by {attacking_monster_stats['type_name']}!"))
+        responses.append(events.PlayerDied(message=f"You have been slain by {attacking_monster_stats['type_name']}!"))
     
-    responses.append(schemas.PlayerStatsUpdateServerResponse(stats=gs.player.create_player_stats_response()))
+    responses.append(events.PlayerStatsUpdate(stats=gs.player.create_player_stats_response()))
     return responses
\ No newline at end of file
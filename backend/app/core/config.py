@@ -16,6 +16,29 @@ DEF_GAIN_PER_LEVEL = 1
 
 PLAYER_VIEW_RADIUS = 5
 
+# --- Field of View Configuration ---
+# When True, update_fov only re-checks tiles entering/leaving the view (plus newly revealed tiles)
+# after the first full sync of a level, instead of rescanning the whole map every turn.
+FOV_INCREMENTAL_UPDATES = True
+# Visibility algorithm used by MapManager.update_fov:
+#   "bresenham"        - one Bresenham ray walked per tile in the view square (reference)
+#   "bresenham_cached" - identical results, rays precomputed as bitmasks, single pass per turn
+#   "shadowcast"       - recursive shadowcasting, single pass; slightly more permissive at wall corners
+FOV_ALGORITHM = "bresenham_cached"
+
+# --- Pathfinding Configuration ---
+# Search used by MapManager.find_path (monster and player pathing): "bfs" or "astar".
+PATHFINDING_ALGORITHM = "astar"
+# Multiplier on the A* Manhattan heuristic. 1.0 keeps paths shortest; larger values expand
+# fewer nodes but may return longer routes.
+PATHFINDING_HEURISTIC_WEIGHT = 1.0
+# Monsters heading for the player step down one shared distance field (rebuilt only after the player
+# moves or terrain changes) instead of each running its own search.
+MONSTER_CHASE_USE_DISTANCE_FIELD = True
+# Monsters reuse their previous path (e.g. toward a last known player position) while the target and
+# terrain are unchanged and the next step is still free.
+MONSTER_PATH_CACHE_ENABLED = True
+
 # --- Monster Configuration ---
 MONSTER_DATA = {
     "goblin": {
@@ -75,4 +98,57 @@ DG_MONSTER_TYPE_DISTRIBUTION = {
 # --- AI Configuration ---
 MONSTER_LKP_TIMEOUT_TURNS = 5 
 AI_RANDOM_MOVE_CHANCE_NO_PATH = 0.75 
-AI_DEFAULT_IDLE_MOVE_CHANCE = 0.5 # Default if monster template doesn't specify "move_chance"
\ No newline at end of file
+AI_DEFAULT_IDLE_MOVE_CHANCE = 0.5 # Default if monster template doesn't specify "move_chance"
+# --- Protocol Configuration ---
+# Drop player_stats_update / player_moved responses superseded by a later one in the same turn.
+COALESCE_STATE_SNAPSHOTS = True
+# Defaults for per-connection protocol options; clients opt in with query parameters on /ws/dungeon.
+# Merge a turn's tile_change responses into a single delta-encoded tile_changes message (?tile_changes=batched).
+BATCH_TILE_CHANGES = False
+# Wrap all responses of an action in one turn_result frame instead of one frame per response (?envelope=turn_result).
+TURN_RESULT_ENVELOPE = False
+# "json" (text frames) or "binary" (raw map bytes, packed tile records, MessagePack events); clients pick with ?format=.
+WIRE_FORMAT = "json"
+# Send player_stats_delta (changed fields only) instead of full player_stats_update messages (?stats=delta).
+PLAYER_STATS_DELTA = False
+
+# --- Level Pool Configuration ---
+LEVEL_POOL_ENABLED = True # Build each session's next level in worker processes while the current one is played
+LEVEL_POOL_WORKERS = 2
+LEVEL_POOL_MAX_PENDING = 256 # Prefetched levels kept across all sessions; the oldest is dropped past this
+
+# --- Turn Execution Configuration ---
+# "inline" runs each /ws/dungeon turn on the event loop; "thread" runs it in a thread pool so the loop only does I/O.
+TURN_EXECUTION = "thread"
+# Turns are pure-Python CPU work and hold the GIL, so extra threads only contend for it; one thread already keeps
+# the loop free. The cost: a worker plays one turn at a time for all of its sessions, so a turn queues behind every
+# other session's (a dungeon generation takes tens of ms), and turn p99 grows with the active sessions per worker
+# (benchmarks/bench_turn_offload.py: 5 ms at 1 player, 70 ms at 96 on one core). Scale out with one uvicorn worker
+# per core and SESSION_STORE = "sqlite" so sessions resume on any worker; nothing shards sessions within a worker.
+TURN_WORKER_THREADS = 1
+
+# --- Session Store Configuration ---
+# Where games of clients that asked for a session (?session=) are kept between connections: "memory" (this worker
+# only) or "sqlite" (shared by every worker on the host, survives restarts). With "sqlite", resuming a session on
+# another worker takes it over: the worker that held it closes its connection (CLOSE_RESUMED_ELSEWHERE) at its next save.
+SESSION_STORE = "memory"
+SESSION_STORE_PATH = "sessions.sqlite3"
+SNAPSHOT_COMPRESSION_LEVEL = 1 # zlib level of GameState snapshots; sessions are saved after every turn
+SESSION_TTL_SECONDS = 900 # A session not saved for this long (its client went away) can no longer be resumed
+SESSION_MEMORY_MAX_SESSIONS = 2000 # "memory" store: least recently saved games past this many are dropped
+RESUME_COMPRESSION_LEVEL = 6 # zlib level of the full-state frame sent once when a session is resumed
+
+# --- Session Memory Configuration ---
+# A background task closes connections idle this long; the games of session connections stay resumable. Keep it
+# below SESSION_TTL_SECONDS, which also bounds how long an evicted game waits on disk.
+SESSION_IDLE_TIMEOUT_SECONDS = 300
+SESSION_MEMORY_BUDGET_BYTES = 512 * 1024 * 1024 # Games held in memory per worker (open connections' and the "memory" store's)
+# Over budget, the least recently used games are snapshotted to SESSION_SPILL_PATH ("disk") or discarded ("drop").
+# The spill file is only created when a game is first evicted.
+SESSION_EVICTION = "disk"
+SESSION_SPILL_PATH = "evicted_sessions.sqlite3"
+SESSION_REAP_INTERVAL_SECONDS = 10
+
+# --- Simulation Configuration ---
+SIMULATION_MAX_TURNS = 2000 # Player actions per headless game before it is stopped
+SIMULATION_HEAL_FRACTION = 0.4 # The "descend" policy drinks a potion below this fraction of max HP
@@ -1,6 +1,7 @@
 # backend/app/core/dungeon_generator.py
 import random
 import math 
+from array import array
 from typing import Optional, List, Set, Tuple, Deque, Dict, Any
 from collections import deque 
 from .tiles import (
@@ -9,16 +10,17 @@ from .tiles import (
     TILE_DOOR_CLOSED, TILE_DOOR_OPEN, TILE_STAIRS_DOWN,
     TILE_ITEM_SCROLL_TELEPORT 
 )
+from .tile_grid import TileGrid
 from . import config as game_config
 import logging 
 logger = logging.getLogger(__name__) 
 
 class Room:
-    def __init__(self, x: int, y: int, width: int, height: int):
+    def __init__(self, x: int, y: int, width: int, height: int, rng: Optional[random.Random] = None, room_id: Optional[str] = None):
         self.x1 = x; self.y1 = y
         self.x2 = x + width - 1; self.y2 = y + height - 1
         self.width = width; self.height = height
-        self.id = str(random.randint(1000,9999)) 
+        self.id = room_id if room_id is not None else str((rng or random).randint(1000,9999)) 
         self.doors_made: int = 0
     def center(self) -> Tuple[int, int]: return (self.x1 + self.x2) // 2, (self.y1 + self.y2) // 2
     def intersects(self, other_room: 'Room', padding: int = 0) -> bool:
@@ -26,18 +28,44 @@ class Room:
                 self.y1 - padding <= other_room.y2 and self.y2 + padding >= other_room.y1)
     def is_inside(self, x: int, y: int) -> bool: return self.x1 <= x <= self.x2 and self.y1 <= y <= self.y2
 
+class RoomLookup:
+    """Room index for every tile in the rooms' bounding box, so point-in-room queries are O(1)."""
+    __slots__ = ("width", "height", "_cells")
+
+    def __init__(self, rooms: List[Room]):
+        self.width = max((room.x2 for room in rooms), default=-1) + 1
+        self.height = max((room.y2 for room in rooms), default=-1) + 1
+        self._cells = array("i", [-1]) * (self.width * self.height)
+        # Fill in reverse so that where rooms overlap the earliest room wins, matching a linear scan.
+        for room_idx in range(len(rooms) - 1, -1, -1):
+            room = rooms[room_idx]
+            x1 = max(room.x1, 0); x2 = room.x2
+            if x2 < x1: continue
+            row_fill = array("i", [room_idx]) * (x2 - x1 + 1)
+            for y in range(max(room.y1, 0), room.y2 + 1):
+                self._cells[y * self.width + x1:y * self.width + x2 + 1] = row_fill
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + self._cells.__sizeof__()
+
+    def room_index_at(self, x: int, y: int) -> Optional[int]:
+        if not (0 <= x < self.width and 0 <= y < self.height): return None
+        room_idx = self._cells[y * self.width + x]
+        return room_idx if room_idx >= 0 else None
+
 class DungeonGenerator:
     def __init__(self, map_width: int, map_height: int, seed: Optional[int] = None):
         self.map_width = map_width; self.map_height = map_height
         self.seed = seed
-        self.map_data: List[List[int]] = [] 
+        self.map_data: TileGrid = TileGrid(0, 0) 
         self.rooms: List[Room] = []
         self.player_start_pos: Optional[Tuple[int, int]] = None
-        if self.seed is not None: random.seed(self.seed)
+        # Owned by this generator, so concurrent generations can't disturb each other's seeded sequence.
+        self.rng = random.Random(self.seed)
         self._initialize_map() 
 
     def _initialize_map(self): 
-        self.map_data = [[TILE_EMPTY for _ in range(self.map_width)] for _ in range(self.map_height)]
+        self.map_data = TileGrid(self.map_width, self.map_height, TILE_EMPTY)
 
     def _create_room_and_walls(self, room: Room):
         for y_coord in range(room.y1 - 1, room.y2 + 2): 
@@ -60,7 +88,7 @@ class DungeonGenerator:
     def _get_random_floor_tile_in_room(self, room: Room) -> Optional[Tuple[int, int]]:
         floor_tiles = [(r_x,r_y) for r_y in range(room.y1,room.y2+1) for r_x in range(room.x1,room.x2+1)
                        if 0<=r_y<self.map_height and 0<=r_x<self.map_width and self.map_data[r_y][r_x]==TILE_FLOOR]
-        if floor_tiles: return random.choice(floor_tiles)
+        if floor_tiles: return self.rng.choice(floor_tiles)
         logger.warning(f"Room {room.id} has no floor tiles. Center: ({room.center()}). Forcing floor at center.")
         cx,cy = room.center()
         if 0<=cy<self.map_height and 0<=cx<self.map_width: self.map_data[cy][cx]=TILE_FLOOR; return cx,cy
@@ -80,7 +108,7 @@ class DungeonGenerator:
                         room_floor_tiles.append((x_coord_room, y_coord_room))
         
         if not room_floor_tiles: logger.warning("No available floor tiles for entities after excluding player start."); return
-        random.shuffle(room_floor_tiles) 
+        self.rng.shuffle(room_floor_tiles) 
         
         item_count = 0
         item_placement_candidates = list(room_floor_tiles) # Work with a copy for item placement
@@ -88,14 +116,14 @@ class DungeonGenerator:
 
         for _ in range(num_items_total):
             if not item_placement_candidates: break
-            x, y = item_placement_candidates.pop(random.randrange(len(item_placement_candidates)))
-            self.map_data[y][x] = random.choice(placeable_item_tiles)
+            x, y = item_placement_candidates.pop(self.rng.randrange(len(item_placement_candidates)))
+            self.map_data[y][x] = self.rng.choice(placeable_item_tiles)
             item_count += 1
         # if item_count < num_items_total: logger.debug(f"Placed {item_count}/{num_items_total} items.")
 
         monster_count = 0
         available_for_monsters = [ (x_m,y_m) for x_m,y_m in room_floor_tiles if self.map_data[y_m][x_m] == TILE_FLOOR ] # Re-filter after items
-        random.shuffle(available_for_monsters)
+        self.rng.shuffle(available_for_monsters)
 
         monster_types_to_place = [] 
         dist = game_config.DG_MONSTER_TYPE_DISTRIBUTION
@@ -111,7 +139,7 @@ class DungeonGenerator:
         monster_types_to_place.extend([TILE_MONSTER_GOBLIN] * num_g)
         monster_types_to_place.extend([TILE_MONSTER_ORC] * num_o)
         monster_types_to_place.extend([TILE_MONSTER_SKELETON] * num_s)
-        random.shuffle(monster_types_to_place) 
+        self.rng.shuffle(monster_types_to_place) 
 
         for i in range(min(len(monster_types_to_place), len(available_for_monsters))):
             x, y = available_for_monsters[i] 
@@ -124,7 +152,7 @@ class DungeonGenerator:
         path:List[Tuple[int,int]]=[];cx,cy=x1,y1
         if 0<=y1<self.map_height and 0<=x1<self.map_width:self.map_data[y1][x1]=TILE_FLOOR
         if 0<=y2<self.map_height and 0<=x2<self.map_width:self.map_data[y2][x2]=TILE_FLOOR
-        turn_x,turn_y=(x2,y1) if random.randint(0,1)==0 else (x1,y2)
+        turn_x,turn_y=(x2,y1) if self.rng.randint(0,1)==0 else (x1,y2)
         while cx!=turn_x or cy!=turn_y:
             path.append((cx,cy))
             if 0<=cy<self.map_height and 0<=cx<self.map_width and self.map_data[cy][cx]==TILE_EMPTY:self.map_data[cy][cx]=TILE_FLOOR
@@ -145,15 +173,12 @@ class DungeonGenerator:
         return list(dict.fromkeys(path))
 
     def _rebuild_all_walls(self):
-        for y in range(self.map_height):
-            for x in range(self.map_width):
-                if self.map_data[y][x]==TILE_EMPTY:
-                    is_adj=any(0<=y+dy<self.map_height and 0<=x+dx<self.map_width and self.map_data[y+dy][x+dx] in [TILE_FLOOR,TILE_DOOR_CLOSED,TILE_DOOR_OPEN] for dx,dy in [(0,1),(0,-1),(1,0),(-1,0)])
-                    self.map_data[y][x]=TILE_WALL
+        # Every remaining empty tile becomes wall; done as a single pass over the tile buffer.
+        self.map_data.replace(TILE_EMPTY, TILE_WALL)
 
     def _ensure_all_rooms_connected(self):
         if len(self.rooms) <= 1: return
-        shuffled_rooms = list(self.rooms); random.shuffle(shuffled_rooms)
+        shuffled_rooms = list(self.rooms); self.rng.shuffle(shuffled_rooms)
         for i in range(len(shuffled_rooms) - 1):
             room1, room2 = shuffled_rooms[i], shuffled_rooms[i+1]
             p1, p2 = self._get_random_floor_tile_in_room(room1), self._get_random_floor_tile_in_room(room2)
@@ -175,15 +200,15 @@ class DungeonGenerator:
     def generate_dungeon(self, max_rooms: int = game_config.DEFAULT_MAX_ROOMS, 
                          room_min_size: int = game_config.DEFAULT_ROOM_MIN_SIZE, 
                          room_max_size: int = game_config.DEFAULT_ROOM_MAX_SIZE
-                        ) -> Tuple[List[List[int]], Optional[Tuple[int, int]]]:
+                        ) -> Tuple[TileGrid, Optional[Tuple[int, int]]]:
         self._initialize_map() 
         self.rooms = []        
         self.player_start_pos = None
         
         if not self.rooms:
-            w = random.randint(room_min_size, room_max_size); h = random.randint(room_min_size, room_max_size)
-            x = random.randint(1, self.map_width-w-2); y = random.randint(1, self.map_height-h-2)
-            first_room = Room(x,y,w,h)
+            w = self.rng.randint(room_min_size, room_max_size); h = self.rng.randint(room_min_size, room_max_size)
+            x = self.rng.randint(1, self.map_width-w-2); y = self.rng.randint(1, self.map_height-h-2)
+            first_room = Room(x,y,w,h,self.rng)
             self.rooms.append(first_room); self._create_room_and_walls(first_room) 
             if not self.player_start_pos : self.player_start_pos = first_room.center()
 
@@ -191,17 +216,17 @@ class DungeonGenerator:
             if not self.rooms: break 
             candidate_rooms = [r for r in self.rooms if r.doors_made < game_config.DG_MAX_DOORS_FOR_BUDDING_CANDIDATE] 
             if not candidate_rooms: candidate_rooms = self.rooms
-            base_room = random.choice(candidate_rooms); placed_new = False
+            base_room = self.rng.choice(candidate_rooms); placed_new = False
             for _attempt in range(game_config.DG_ROOM_BUDDING_ATTEMPTS): 
-                w=random.randint(room_min_size,room_max_size); h=random.randint(room_min_size,room_max_size)
-                side=random.randint(0,3); door_x,door_y,new_room_x,new_room_y = -1,-1,-1,-1
-                if side==0:door_x=random.randint(base_room.x1,base_room.x2);door_y=base_room.y1-1;new_room_x=door_x-random.randint(0,w-1);new_room_y=door_y-h
-                elif side==1:door_y=random.randint(base_room.y1,base_room.y2);door_x=base_room.x2+1;new_room_x=door_x+1;new_room_y=door_y-random.randint(0,h-1)
-                elif side==2:door_x=random.randint(base_room.x1,base_room.x2);door_y=base_room.y2+1;new_room_x=door_x-random.randint(0,w-1);new_room_y=door_y+1
-                else:door_y=random.randint(base_room.y1,base_room.y2);door_x=base_room.x1-1;new_room_x=door_x-w;new_room_y=door_y-random.randint(0,h-1)
+                w=self.rng.randint(room_min_size,room_max_size); h=self.rng.randint(room_min_size,room_max_size)
+                side=self.rng.randint(0,3); door_x,door_y,new_room_x,new_room_y = -1,-1,-1,-1
+                if side==0:door_x=self.rng.randint(base_room.x1,base_room.x2);door_y=base_room.y1-1;new_room_x=door_x-self.rng.randint(0,w-1);new_room_y=door_y-h
+                elif side==1:door_y=self.rng.randint(base_room.y1,base_room.y2);door_x=base_room.x2+1;new_room_x=door_x+1;new_room_y=door_y-self.rng.randint(0,h-1)
+                elif side==2:door_x=self.rng.randint(base_room.x1,base_room.x2);door_y=base_room.y2+1;new_room_x=door_x-self.rng.randint(0,w-1);new_room_y=door_y+1
+                else:door_y=self.rng.randint(base_room.y1,base_room.y2);door_x=base_room.x1-1;new_room_x=door_x-w;new_room_y=door_y-self.rng.randint(0,h-1)
                 if not(0<door_y<self.map_height-1 and 0<door_x<self.map_width-1):continue
                 if not(new_room_x>=1 and new_room_x+w<self.map_width-1 and new_room_y>=1 and new_room_y+h<self.map_height-1 ):continue
-                new_room = Room(new_room_x,new_room_y,w,h)
+                new_room = Room(new_room_x,new_room_y,w,h,self.rng)
                 if any(new_room.intersects(r_obj,padding=0) for r_obj in self.rooms):continue
                 can_bud = True
                 if self.map_data[door_y][door_x] not in [TILE_EMPTY,TILE_WALL]:can_bud=False
@@ -247,13 +272,13 @@ class DungeonGenerator:
         items_min = max(game_config.DG_ITEMS_MIN_ABS_COUNT, num_r // game_config.DG_ITEMS_ROOM_DIVISOR_FOR_MIN if game_config.DG_ITEMS_ROOM_DIVISOR_FOR_MIN > 0 else num_r)
         items_max_calc_base = (num_r // game_config.DG_ITEMS_ROOM_DIVISOR_FOR_MAX if game_config.DG_ITEMS_ROOM_DIVISOR_FOR_MAX > 0 else num_r) + game_config.DG_ITEMS_MAX_ADDEND
         items_max = max(items_min + 1, items_max_calc_base) 
-        final_num_items = random.randint(items_min, items_max) if items_min <= items_max else items_min
+        final_num_items = self.rng.randint(items_min, items_max) if items_min <= items_max else items_min
 
         monsters_min_calc_base = (num_r // game_config.DG_MONSTERS_ROOM_DIVISOR_FOR_MIN if game_config.DG_MONSTERS_ROOM_DIVISOR_FOR_MIN > 0 else num_r) + game_config.DG_MONSTERS_MIN_ADDEND
         monsters_min = max(game_config.DG_MONSTERS_MIN_ABS_COUNT, monsters_min_calc_base)
         monsters_max_calc_base = (num_r // game_config.DG_MONSTERS_ROOM_DIVISOR_FOR_MAX if game_config.DG_MONSTERS_ROOM_DIVISOR_FOR_MAX > 0 else num_r) + game_config.DG_MONSTERS_MAX_ADDEND
         monsters_max = max(monsters_min, monsters_max_calc_base) 
-        final_num_monsters = random.randint(monsters_min, monsters_max) if monsters_min <= monsters_max else monsters_min
+        final_num_monsters = self.rng.randint(monsters_min, monsters_max) if monsters_min <= monsters_max else monsters_min
         
         self._place_entities(num_items_total=final_num_items, num_monsters=final_num_monsters)
         # Stairs are handled by GameState for this version of the generator
@@ -274,11 +299,12 @@ class DungeonGenerator:
         reachable_room_indices: Set[int] = set() 
         if start_room_idx < len(self.rooms) and self.rooms[start_room_idx].is_inside(q_bfs[0][0], q_bfs[0][1]):
              reachable_room_indices.add(start_room_idx)
+        room_lookup = RoomLookup(self.rooms)
         head_bfs = 0
         while head_bfs < len(q_bfs): 
             cx, cy = q_bfs[head_bfs]; head_bfs += 1
-            for r_idx, r_obj in enumerate(self.rooms):
-                if r_obj.is_inside(cx, cy): reachable_room_indices.add(r_idx)
+            r_idx = room_lookup.room_index_at(cx, cy)
+            if r_idx is not None: reachable_room_indices.add(r_idx)
             for dx, dy in [(0,1), (0,-1), (1,0), (-1,0)]: 
                 nx, ny = cx + dx, cy + dy
                 if 0 <= ny < self.map_height and 0 <= nx < self.map_width and \
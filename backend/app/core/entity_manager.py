@@ -1,6 +1,6 @@
 # backend/app/core/entity_manager.py
 import uuid
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 # No TILE_FLOOR needed here if GameState handles map modification after population
 # from .tiles import TILE_FLOOR 
@@ -9,36 +9,88 @@ if TYPE_CHECKING:
     pass 
 
 class EntityManager:
+    """
+    Owns the monsters on the current level. Monsters are kept in insertion (turn) order keyed by id,
+    plus an occupancy index keyed by (x, y) so position lookups don't scan the whole list.
+    Monster positions must be changed through move_monster to keep the index in sync.
+    Also caches each monster's last computed path so it can be replayed while still valid.
+    """
     def __init__(self, logger_parent_name: str = "EntityManager"):
-        self.monsters_on_map: List[Dict[str, Any]] = []
+        self._monsters_by_id: Dict[str, Dict[str, Any]] = {}
+        self._monsters_by_pos: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        # monster id -> (target (x, y), terrain version, path starting at the monster's last position)
+        self._path_cache: Dict[str, Tuple[Tuple[int, int], int, List[Dict[str, int]]]] = {}
+        self.path_cache_hits: int = 0
+        self.path_cache_misses: int = 0
         self.logger_ref = logger_parent_name 
 
+    @property
+    def monsters_on_map(self) -> List[Dict[str, Any]]:
+        return list(self._monsters_by_id.values())
+
     def initialize_entities(self):
-        self.monsters_on_map = []
+        self._monsters_by_id = {}
+        self._monsters_by_pos = {}
+        self._path_cache = {}
 
     def add_monster(self, monster_data: Dict[str, Any]):
-        self.monsters_on_map.append(monster_data)
+        self._monsters_by_id[monster_data["id"]] = monster_data
+        self._monsters_by_pos.setdefault((monster_data["x"], monster_data["y"]), monster_data)
 
     def remove_monster(self, monster_instance: Dict[str, Any]) -> bool:
-        try:
-            self.monsters_on_map.remove(monster_instance)
-            return True
-        except ValueError:
+        if self._monsters_by_id.get(monster_instance.get("id")) is not monster_instance:
             return False
+        del self._monsters_by_id[monster_instance["id"]]
+        self._path_cache.pop(monster_instance["id"], None)
+        pos_key = (monster_instance["x"], monster_instance["y"])
+        if self._monsters_by_pos.get(pos_key) is monster_instance:
+            del self._monsters_by_pos[pos_key]
+        return True
+
+    def move_monster(self, monster: Dict[str, Any], new_x: int, new_y: int):
+        """Updates the monster's position and the occupancy index together."""
+        old_key = (monster["x"], monster["y"])
+        if self._monsters_by_pos.get(old_key) is monster:
+            del self._monsters_by_pos[old_key]
+        monster["x"], monster["y"] = new_x, new_y
+        if self._monsters_by_id.get(monster.get("id")) is monster:
+            self._monsters_by_pos.setdefault((new_x, new_y), monster)
+
+    def get_cached_path(self, monster_id: str, start_pos: Dict[str, int], target_pos: Dict[str, int], terrain_version: int,
+                        step_is_walkable: Callable[[int, int], bool]) -> Optional[List[Dict[str, int]]]:
+        """
+        Returns the rest of the monster's cached path if it was computed for the same target and terrain,
+        the monster is still on it (where it was, or one step further), and the next step is walkable.
+        Counts a hit or a miss either way.
+        """
+        cached = self._path_cache.get(monster_id)
+        remaining: Optional[List[Dict[str, int]]] = None
+        if cached is not None and cached[0] == (target_pos["x"], target_pos["y"]) and cached[1] == terrain_version:
+            path = cached[2]
+            for offset in (0, 1):
+                if offset < len(path) and path[offset]["x"] == start_pos["x"] and path[offset]["y"] == start_pos["y"]:
+                    remaining = [start_pos] + path[offset + 1:]
+                    break
+        if remaining is not None and len(remaining) > 1 and not step_is_walkable(remaining[1]["x"], remaining[1]["y"]):
+            remaining = None
+        if remaining is None:
+            self._path_cache.pop(monster_id, None)
+            self.path_cache_misses += 1
+            return None
+        self._path_cache[monster_id] = (cached[0], terrain_version, remaining)
+        self.path_cache_hits += 1
+        return remaining
+
+    def store_path(self, monster_id: str, target_pos: Dict[str, int], terrain_version: int, path: List[Dict[str, int]]):
+        self._path_cache[monster_id] = ((target_pos["x"], target_pos["y"]), terrain_version, path)
 
     def get_monster_at(self, x: int, y: int) -> Optional[Dict[str, Any]]:
-        for monster in self.monsters_on_map:
-            if monster["x"] == x and monster["y"] == y:
-                return monster
-        return None
+        return self._monsters_by_pos.get((x, y))
 
     def get_all_monsters(self) -> List[Dict[str, Any]]:
-        return list(self.monsters_on_map)
+        return list(self._monsters_by_id.values())
 
     def get_monster_by_id(self, monster_id: str) -> Optional[Dict[str, Any]]:
-        for monster in self.monsters_on_map:
-            if monster["id"] == monster_id:
-                return monster
-        return None
+        return self._monsters_by_id.get(monster_id)
     
-    # populate_monsters_from_map_tiles is removed, GameState will handle this loop for now.
\ No newline at end of file
+    # populate_monsters_from_map_tiles is removed, GameState will handle this loop for now.
@@ -0,0 +1,152 @@
+# backend/app/core/events.py
+"""
+Lightweight events produced by a turn. GameState, combat, monster AI, items and the map manager build these
+instead of the Pydantic response models in schemas.py: they are plain slotted dataclasses with no validation.
+protocol.py turns them into wire dicts or bytes at the edge; to_wire() returns exactly the JSON form the
+matching *ServerResponse model in schemas.py describes.
+"""
+import abc
+from dataclasses import dataclass
+from typing import Any, ClassVar, Dict, List, Optional, Union
+
+from .. import schemas
+
+
+class Event(abc.ABC):
+    """Base class of turn events; type is the wire "type" of the message."""
+    __slots__ = ()
+    type: ClassVar[str]
+
+    @abc.abstractmethod
+    def to_wire(self) -> Dict[str, Any]:
+        pass
+
+
+@dataclass(slots=True)
+class PlayerMoved(Event):
+    type: ClassVar[str] = "player_moved"
+    x: int; y: int
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"type": "player_moved", "player_pos": {"x": self.x, "y": self.y}}
+
+
+@dataclass(slots=True)
+class InvalidMove(Event):
+    type: ClassVar[str] = "invalid_move"
+    reason: str; x: int; y: int
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"type": "invalid_move", "reason": self.reason, "player_pos": {"x": self.x, "y": self.y}}
+
+
+@dataclass(slots=True)
+class TileChange(Event):
+    type: ClassVar[str] = "tile_change"
+    x: int; y: int; new_tile_type: int
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"type": "tile_change", "pos": {"x": self.x, "y": self.y}, "new_tile_type": self.new_tile_type}
+
+
+@dataclass(slots=True)
+class TileChanges(Event):
+    """All tile changes of a turn, delta-encoded (see schemas.TileChangesServerResponse)."""
+    type: ClassVar[str] = "tile_changes"
+    width: int; cells: List[int]; tiles: List[int]
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"type": "tile_changes", "width": self.width, "cells": self.cells, "tiles": self.tiles}
+
+
+@dataclass(slots=True)
+class GameMessage(Event):
+    type: ClassVar[str] = "game_message"
+    text: str
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"type": "game_message", "text": self.text}
+
+
+@dataclass(slots=True)
+class PlayerStatsUpdate(Event):
+    type: ClassVar[str] = "player_stats_update"
+    stats: schemas.PlayerStatsResponse
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"type": "player_stats_update", "stats": self.stats.model_dump(mode="json")}
+
+
+@dataclass(slots=True)
+class PlayerStatsDelta(Event):
+    type: ClassVar[str] = "player_stats_delta"
+    changes: Dict[str, Any]
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"type": "player_stats_delta", "changes": self.changes}
+
+
+@dataclass(slots=True)
+class CombatEvent(Event):
+    type: ClassVar[str] = "combat_event"
+    damage_done: int; defender_hp_current: int; defender_hp_max: int; message: str
+    attacker_faction: Optional[str] = None; attacker_id: Optional[str] = None; attacker_type: Optional[str] = None
+    defender_faction: Optional[str] = None; defender_id: Optional[str] = None; defender_type: Optional[str] = None
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"type": "combat_event", "attacker_faction": self.attacker_faction, "attacker_id": self.attacker_id,
+                "attacker_type": self.attacker_type, "defender_faction": self.defender_faction,
+                "defender_id": self.defender_id, "defender_type": self.defender_type, "damage_done": self.damage_done,
+                "defender_hp_current": self.defender_hp_current, "defender_hp_max": self.defender_hp_max,
+                "message": self.message}
+
+
+@dataclass(slots=True)
+class EntityDied(Event):
+    type: ClassVar[str] = "entity_died"
+    entity_id: str; entity_type: str; x: int; y: int; message: str
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"type": "entity_died", "entity_id": self.entity_id, "entity_type": self.entity_type,
+                "pos": {"x": self.x, "y": self.y}, "message": self.message}
+
+
+@dataclass(slots=True)
+class PlayerDied(Event):
+    type: ClassVar[str] = "player_died"
+    message: str
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"type": "player_died", "message": self.message}
+
+
+@dataclass(slots=True)
+class MonsterMoved(Event):
+    type: ClassVar[str] = "monster_moved"
+    monster_id: str; x: int; y: int
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"type": "monster_moved", "monster_id": self.monster_id, "new_pos": {"x": self.x, "y": self.y}}
+
+
+@dataclass(slots=True)
+class PlayerLeveledUp(Event):
+    type: ClassVar[str] = "player_leveled_up"
+    new_level: int; message: str
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"type": "player_leveled_up", "new_level": self.new_level, "message": self.message}
+
+
+@dataclass(slots=True)
+class MonsterAppeared(Event):
+    type: ClassVar[str] = "monster_appeared"
+    monster_id: str; x: int; y: int; monster_type: str; tile_id: int
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"type": "monster_appeared", "monster_info": {"id": self.monster_id, "x": self.x, "y": self.y,
+                                                             "type": self.monster_type, "tile_id": self.tile_id}}
+
+
+# What a turn produces: events, plus the rare responses still built as schema models (dungeon_data, error).
+TurnResponse = Union[Event, schemas.ServerResponse]
@@ -1,9 +1,10 @@
 # backend/app/core/game_state.py
 from typing import Any, Dict, List, Optional, Union, cast, Tuple, Set
-import uuid
 import random
 import logging
+import sys
 import math
+import functools
 from collections import deque
 
 from .tiles import (
@@ -20,13 +21,25 @@ from .combat import apply_attack, resolve_player_attack_on_monster, resolve_mons
 from . import config as game_config # CORRECTED IMPORT
 
 from .. import schemas
-from .dungeon_generator import DungeonGenerator, Room 
+from . import events
+from ..protocol import batch_tile_changes, coalesce_state_snapshots, stats_updates_as_deltas
+from .level_pool import LevelPool, LevelSpec, build_level
+from .snapshot import restore_game_state, snapshot_game_state
+from .metrics import timed
 from .map_manager import MapManager
 from .entity_manager import EntityManager
 from .player import Player
 
 
 logger = logging.getLogger(__name__)
+_POSITION_DICT_SIZE = sys.getsizeof({"x": 0, "y": 0}) # each step of a cached monster path
+
+def _turn_handler(handler):
+    """Passes the responses of a handle_* method through GameState._finalize_turn_responses."""
+    @functools.wraps(handler)
+    def wrapper(self: 'GameState', *args, **kwargs) -> List[events.TurnResponse]:
+        return self._finalize_turn_responses(handler(self, *args, **kwargs))
+    return wrapper
 
 class GameState:
     def __init__(self, client_id: str):
@@ -46,7 +59,23 @@ class GameState:
         self.game_over: bool = False
         self.current_dungeon_level: int = 1
         self.seed: Optional[int] = None
+        # Session-owned RNG for monster AI and item effects; replaced by each level generator's RNG, so a seeded
+        # game replays the same way however many other sessions share the process.
+        self.rng: random.Random = random.Random()
         self.revealed_monster_ids: Set[str] = set() 
+        # Shared LevelPool (set in main.py) that builds the next level while this one is played; None builds inline.
+        self.level_pool: Optional[LevelPool] = None
+        self._next_level_spec: Optional[LevelSpec] = None
+        self._next_level_prefetched: bool = False
+        # Distance field toward the player shared by all chasing monsters, keyed by (player x, y, terrain version).
+        self._player_distance_field: Optional[List[int]] = None
+        self._player_distance_field_key: Optional[Tuple[int, int, int]] = None
+        # Per-connection protocol options (negotiated in main.py, defaults from config).
+        self.coalesce_state_snapshots: bool = game_config.COALESCE_STATE_SNAPSHOTS
+        self.batch_tile_changes: bool = game_config.BATCH_TILE_CHANGES
+        self.player_stats_delta: bool = game_config.PLAYER_STATS_DELTA
+        # Stats dict the client last received in a player_stats_update; None after dungeon_data resent them in full.
+        self._last_sent_player_stats: Optional[Dict[str, Any]] = None
         self.logger.info(f"GameState Initialized.") 
 
     def _get_effective_player_stats(self) -> Dict[str, Any]:
@@ -59,13 +88,36 @@ class GameState:
         return self.map_manager.has_line_of_sight(start_pos, end_pos)
 
     def _find_path_bfs(self, start_pos: Dict[str,int], end_pos: Dict[str,int], entity_type: str = "monster") -> Optional[List[Dict[str,int]]]:
-        return self.map_manager.find_path_bfs(start_pos, end_pos, entity_type, self.entity_manager, self.player.pos)
+        if entity_type == "monster" and game_config.MONSTER_CHASE_USE_DISTANCE_FIELD and self.player.pos and \
+           end_pos["x"] == self.player.pos["x"] and end_pos["y"] == self.player.pos["y"]:
+            path = self.map_manager.path_down_distance_field(
+                self._get_player_distance_field(), start_pos, entity_type, self.entity_manager, self.player.pos)
+            if path is not None: return path
+        monster = self.entity_manager.get_monster_at(start_pos["x"], start_pos["y"]) \
+                  if entity_type == "monster" and game_config.MONSTER_PATH_CACHE_ENABLED else None
+        if monster is not None:
+            cached_path = self.entity_manager.get_cached_path(
+                monster["id"], start_pos, end_pos, self.map_manager.terrain_version,
+                lambda x, y: self._is_walkable_for_entity(x, y, "monster"))
+            if cached_path is not None: return cached_path
+        path = self.map_manager.find_path(start_pos, end_pos, entity_type, self.entity_manager, self.player.pos)
+        if monster is not None and path:
+            self.entity_manager.store_path(monster["id"], end_pos, self.map_manager.terrain_version, path)
+        return path
+
+    def _get_player_distance_field(self) -> List[int]:
+        """Builds the monster distance field toward the player at most once per player position and terrain state."""
+        key = (self.player.pos["x"], self.player.pos["y"], self.map_manager.terrain_version)
+        if self._player_distance_field is None or self._player_distance_field_key != key:
+            self._player_distance_field = self.map_manager.build_distance_field(self.player.pos, "monster")
+            self._player_distance_field_key = key
+        return self._player_distance_field
 
     def _is_walkable_for_entity(self, x: int, y: int, entity_type: str) -> bool:
         return self.map_manager.is_walkable_for_entity(x, y, entity_type, self.entity_manager, self.player.pos)
 
-    def _check_and_reveal_newly_visible_monsters(self) -> List[schemas.MonsterAppearedServerResponse]:
-        newly_visible_monster_responses: List[schemas.MonsterAppearedServerResponse] = []
+    def _check_and_reveal_newly_visible_monsters(self) -> List[events.MonsterAppeared]:
+        newly_visible_monster_responses: List[events.MonsterAppeared] = []
         if not self.map_manager.dungeon_map_for_client: return newly_visible_monster_responses
         for monster_data in self.entity_manager.get_all_monsters():
             monster_id = monster_data["id"]; mx, my = monster_data["x"], monster_data["y"]
@@ -75,10 +127,10 @@ class GameState:
                 self.map_manager.dungeon_map_for_client[my][mx] != TILE_FOG )
             if is_on_client_map_and_not_fog and monster_id not in self.revealed_monster_ids:
                 self.revealed_monster_ids.add(monster_id)
-                monster_info = schemas.MonsterInfoResponse(id=monster_id, x=mx, y=my, type=monster_data["type_name"], tile_id=monster_data["tile_id"])
-                newly_visible_monster_responses.append(schemas.MonsterAppearedServerResponse(monster_info=monster_info))
+                newly_visible_monster_responses.append(events.MonsterAppeared(monster_id, mx, my, monster_data["type_name"], monster_data["tile_id"]))
         return newly_visible_monster_responses
 
+    @timed
     def generate_new_dungeon(self, seed: Optional[int], 
                              width: int = game_config.DEFAULT_MAP_WIDTH, 
                              height: int = game_config.DEFAULT_MAP_HEIGHT, 
@@ -87,6 +139,7 @@ class GameState:
                              room_max: int = game_config.DEFAULT_ROOM_MAX_SIZE, 
                              is_new_level: bool = False):
         self.seed = seed
+        self._last_sent_player_stats = None
         
         current_inventory = list(self.player.inventory) if is_new_level else []
         current_equipment = dict(self.player.equipment) if is_new_level else {"weapon": None, "armor": None}
@@ -105,76 +158,30 @@ class GameState:
 
         self.entity_manager.initialize_entities()
         try:
-            generator = DungeonGenerator(width, height, seed=self.seed)
-            actual_map_data_from_gen, start_pos_tuple = generator.generate_dungeon(max_rooms, room_min, room_max)
-            
-            if actual_map_data_from_gen is None or start_pos_tuple is None:
+            spec = LevelSpec(self.seed, self.current_dungeon_level, width, height, max_rooms, room_min, room_max)
+            if is_new_level and self._next_level_prefetched and spec == self._next_level_spec:
+                self._next_level_prefetched = False
+                level = self.level_pool.take(spec)
+            else: level = build_level(spec)
+            if level is None:
                 self.logger.error("Dungeon generator returned None for map or start position.")
                 return schemas.ErrorServerResponse(message="Dungeon generation failed critically.")
 
-            self.map_manager.initialize_maps(actual_map_data_from_gen, width, height)
-            self.map_manager.set_generated_rooms(generator.rooms) 
-            
-            player_start_pos_dict = {"x": start_pos_tuple[0], "y": start_pos_tuple[1]}
-
+            self.map_manager.initialize_maps(level.map, width, height)
+            self.map_manager.set_generated_rooms(level.rooms) 
+            player_start_pos_dict = {"x": level.start[0], "y": level.start[1]}
             if not is_new_level: 
                 self.player.reset_for_new_game(player_start_pos_dict) 
             else: 
                 self.player.pos = player_start_pos_dict 
+            for monster_instance_data in level.monsters: self.entity_manager.add_monster(monster_instance_data)
+            self.rng = level.rng # the level's sequence carries on into its monster turns and item effects
+            self._prefetch_next_level(spec)
             
-            if self.map_manager.actual_dungeon_map and \
-               self.map_manager.actual_dungeon_map[self.player.pos["y"]][self.player.pos["x"]] != TILE_FLOOR:
-                self.map_manager.actual_dungeon_map[self.player.pos["y"]][self.player.pos["x"]] = TILE_FLOOR
-            
-            if self.map_manager.actual_dungeon_map:
-                for r_idx, row in enumerate(list(self.map_manager.actual_dungeon_map)):
-                    for c_idx, tile_val in enumerate(list(row)):
-                        if tile_val in MONSTER_TEMPLATES: 
-                            if c_idx == self.player.pos["x"] and r_idx == self.player.pos["y"]:
-                                if self.map_manager.actual_dungeon_map[r_idx][c_idx] != TILE_FLOOR:
-                                     self.map_manager.actual_dungeon_map[r_idx][c_idx] = TILE_FLOOR 
-                                continue
-                            template = MONSTER_TEMPLATES[tile_val]
-                            monster_id = str(uuid.uuid4())
-                            monster_instance_data = {**template, "id": monster_id, "x": c_idx, "y": r_idx, 
-                                                     "hp": template["max_hp"], "last_known_player_pos": None}
-                            self.entity_manager.add_monster(monster_instance_data)
-                            self.map_manager.actual_dungeon_map[r_idx][c_idx] = TILE_FLOOR
-            
-            if self.map_manager.actual_dungeon_map and self.map_manager.generated_rooms and self.player.pos:
-                last_room_idx = -1
-                player_s_room_info = self.map_manager.get_room_at_pos(self.player.pos["x"], self.player.pos["y"])
-                player_s_room_idx = player_s_room_info[0] if player_s_room_info else None
-                if len(self.map_manager.generated_rooms) > 1 and player_s_room_idx is not None:
-                    poss_indices = [i for i, _ in enumerate(self.map_manager.generated_rooms) if i != player_s_room_idx]
-                    if poss_indices: last_room_idx = random.choice(poss_indices)
-                elif self.map_manager.generated_rooms: last_room_idx = len(self.map_manager.generated_rooms) - 1
-                if last_room_idx != -1 and last_room_idx < len(self.map_manager.generated_rooms):
-                    last_room = self.map_manager.generated_rooms[last_room_idx]
-                    potential_stairs = []
-                    for r_y_s in range(last_room.y1, last_room.y2 + 1):
-                        for r_x_s in range(last_room.x1, last_room.x2 + 1):
-                            if self.map_manager.actual_dungeon_map[r_y_s][r_x_s] == TILE_FLOOR and \
-                            not (r_x_s == self.player.pos["x"] and r_y_s == self.player.pos["y"]):
-                                potential_stairs.append((r_x_s, r_y_s))
-                    if potential_stairs:
-                        sx, sy = random.choice(potential_stairs)
-                        self.map_manager.actual_dungeon_map[sy][sx] = TILE_STAIRS_DOWN
-                    elif self.map_manager.actual_dungeon_map[last_room.center()[1]][last_room.center()[0]] == TILE_FLOOR and \
-                         not (last_room.center()[0] == self.player.pos["x"] and last_room.center()[1] == self.player.pos["y"]):
-                        self.map_manager.actual_dungeon_map[last_room.center()[1]][last_room.center()[0]] = TILE_STAIRS_DOWN
-            
-            initial_monsters_for_client = []
             if self.player.pos:
                 initial_room_info = self.map_manager.get_room_at_pos(self.player.pos["x"], self.player.pos["y"])
                 if initial_room_info: self.map_manager.reveal_room_and_connected_corridors(initial_room_info[0], self)
                 self.map_manager.update_fov(self.player.pos) 
-                for m_data in self.entity_manager.get_all_monsters():
-                    mx,my=m_data["x"],m_data["y"]
-                    if self.map_manager.dungeon_map_for_client and 0<=my<len(self.map_manager.dungeon_map_for_client) and \
-                       0<=mx<len(self.map_manager.dungeon_map_for_client[0]) and self.map_manager.dungeon_map_for_client[my][mx]!=TILE_FOG:
-                        self.revealed_monster_ids.add(m_data["id"])
-                        initial_monsters_for_client.append(schemas.MonsterInfoResponse(id=m_data["id"],x=mx,y=my,type=m_data["type_name"],tile_id=m_data["tile_id"]))
             else: self.logger.error("Player position None before initial FoV setup!")
 
         except Exception as e:
@@ -182,16 +189,74 @@ class GameState:
             if self.map_manager: self.map_manager.initialize_maps([[]],0,0) 
             return schemas.ErrorServerResponse(message=f"Dungeon generation failed: {str(e)[:100]}")
 
+        return self.dungeon_data_response()
+
+    def dungeon_data_response(self) -> Union[schemas.DungeonDataServerResponse, schemas.ErrorServerResponse]:
+        """The full client view of the current level: what a new level sends, and what a resumed session gets."""
         if not self.map_manager.dungeon_map_for_client or not self.player.pos:
              return schemas.ErrorServerResponse(message="Internal error preparing map for client.")
-        
+        client_map = self.map_manager.dungeon_map_for_client
+        monsters_for_client = []
+        # The client replaces its monster list with this one, so monsters left out must be announced again.
+        self.revealed_monster_ids.clear()
+        for m_data in self.entity_manager.get_all_monsters():
+            mx,my=m_data["x"],m_data["y"]
+            if 0<=my<len(client_map) and 0<=mx<len(client_map[0]) and client_map[my][mx]!=TILE_FOG:
+                self.revealed_monster_ids.add(m_data["id"])
+                monsters_for_client.append(schemas.MonsterInfoResponse(id=m_data["id"],x=mx,y=my,type=m_data["type_name"],tile_id=m_data["tile_id"]))
         return schemas.DungeonDataServerResponse(
-            map=self.map_manager.dungeon_map_for_client, player_start_pos=schemas.Position(**self.player.pos),
+            map=client_map.to_list(), player_start_pos=schemas.Position(**self.player.pos),
             tile_types=schemas.TileTypesResponse(**self.base_tile_types), player_stats=self.player.create_player_stats_response(),
-            monsters=initial_monsters_for_client, seed_used=self.seed, current_dungeon_level=self.current_dungeon_level)
-
-    def process_monster_turns(self) -> List[schemas.ServerResponse]:
-        all_responses: List[schemas.ServerResponse] = []
+            monsters=monsters_for_client, seed_used=self.seed, current_dungeon_level=self.current_dungeon_level)
+
+    def attach_level_pool(self, level_pool: Optional[LevelPool]):
+        """Builds later levels on level_pool; a restored session prefetches the level it is due to descend into."""
+        self.level_pool = level_pool
+        if level_pool is not None and self._next_level_spec is not None and not self._next_level_prefetched:
+            level_pool.prefetch(self._next_level_spec); self._next_level_prefetched = True
+
+    def snapshot(self) -> bytes:
+        """The game as a compact versioned binary snapshot (format in core/snapshot.py)."""
+        return snapshot_game_state(self)
+
+    @classmethod
+    def restore(cls, data: bytes) -> 'GameState':
+        """Rebuilds a game from snapshot(); raises snapshot.SnapshotError if data is not a valid snapshot."""
+        return restore_game_state(data)
+
+    def memory_usage(self) -> int:
+        """
+        Approximate bytes held by this game alone: the level's grids, tile sets and caches, rooms, entities and
+        items. Templates, the RNG and the level pool are not counted. Cheap enough to run over every session.
+        """
+        mm, em = self.map_manager, self.entity_manager
+        size = sys.getsizeof(self.__dict__) + sys.getsizeof(mm.__dict__) + sys.getsizeof(em.__dict__)
+        size += sum(sys.getsizeof(part) for part in (mm.actual_dungeon_map, mm.dungeon_map_for_client, mm._room_lookup,
+                    mm.ever_revealed_tiles, mm.visible_tiles, mm._pending_revealed_tiles) if part is not None)
+        size += sum(sys.getsizeof(room) + sys.getsizeof(room.__dict__) for room in mm.generated_rooms)
+        if self._player_distance_field is not None: size += sys.getsizeof(self._player_distance_field)
+        monsters = em.get_all_monsters()
+        size += sys.getsizeof(em._monsters_by_id) + sys.getsizeof(em._monsters_by_pos) + sys.getsizeof(self.revealed_monster_ids)
+        size += sum(sys.getsizeof(monster) + sys.getsizeof(monster["id"]) for monster in monsters)
+        size += sum(sys.getsizeof(path) + len(path) * _POSITION_DICT_SIZE for _, _, path in em._path_cache.values())
+        size += sum(sys.getsizeof(item) for item in self.player.inventory)
+        return size
+
+    def _prefetch_next_level(self, spec: LevelSpec):
+        """Fixes the next level's seed as this level starts and, with a level pool, starts building it."""
+        self.discard_prefetched_level()
+        next_seed = (spec.seed + spec.depth) if spec.seed is not None else self.rng.randint(0, 1_000_000)
+        self._next_level_spec = LevelSpec(next_seed, spec.depth + 1)
+        if self.level_pool is not None:
+            self.level_pool.prefetch(self._next_level_spec); self._next_level_prefetched = True
+
+    def discard_prefetched_level(self):
+        if self._next_level_prefetched and self.level_pool is not None: self.level_pool.discard(self._next_level_spec)
+        self._next_level_prefetched = False
+
+    @timed
+    def process_monster_turns(self) -> List[events.TurnResponse]:
+        all_responses: List[events.TurnResponse] = []
         if self.game_over or not self.player.pos or \
            not self.map_manager.actual_dungeon_map or \
            not self.map_manager.dungeon_map_for_client:
@@ -220,7 +285,7 @@ class GameState:
             if self.game_over: break 
         return all_responses
 
-    def _handle_player_attack_interaction(self, monster_at_target: Dict[str, Any]) -> List[schemas.ServerResponse]:
+    def _handle_player_attack_interaction(self, monster_at_target: Dict[str, Any]) -> List[events.TurnResponse]:
         player_effective_stats = self.player.get_effective_stats()
         monster_stats_mut = cast(Dict[str, Any], monster_at_target)
         damage_to_monster, hp_after_attack, died, p_attack_msg = apply_attack(
@@ -238,15 +303,16 @@ class GameState:
             responses.extend(resolve_monster_attack_on_player(self, monster_stats_mut, retaliation_damage, full_retaliation_message))
             monster_stats_mut["_has_acted_this_player_turn"] = True
         if self.player.pos: 
-            responses.append(schemas.PlayerMovedServerResponse(player_pos=schemas.Position(**self.player.pos)))
+            responses.append(events.PlayerMoved(self.player.pos["x"], self.player.pos["y"]))
         return responses
 
-    def _handle_open_door_interaction(self, new_x: int, new_y: int, prev_player_pos: Dict[str, Any]) -> List[schemas.ServerResponse]:
-        responses: List[schemas.ServerResponse] = []
+    def _handle_open_door_interaction(self, new_x: int, new_y: int, prev_player_pos: Dict[str, Any]) -> List[events.TurnResponse]:
+        responses: List[events.TurnResponse] = []
         if self.map_manager.actual_dungeon_map: self.map_manager.actual_dungeon_map[new_y][new_x] = TILE_DOOR_OPEN
         if self.map_manager.dungeon_map_for_client: self.map_manager.dungeon_map_for_client[new_y][new_x] = TILE_DOOR_OPEN
-        responses.append(schemas.TileChangeServerResponse(pos=schemas.Position(x=new_x,y=new_y),new_tile_type=TILE_DOOR_OPEN))
-        responses.append(schemas.GameMessageServerResponse(text="You open the door."))
+        self.map_manager.mark_terrain_changed()
+        responses.append(events.TileChange(new_x, new_y, TILE_DOOR_OPEN))
+        responses.append(events.GameMessage(text="You open the door."))
         room_check_x,room_check_y = new_x,new_y 
         if new_x==prev_player_pos["x"]: room_check_y=new_y+(new_y-prev_player_pos["y"]) 
         elif new_y==prev_player_pos["y"]: room_check_x=new_x+(new_x-prev_player_pos["x"])
@@ -255,21 +321,21 @@ class GameState:
             responses.extend(self.map_manager.reveal_room_and_connected_corridors(room_info[0], self))
         if self.player.pos: 
             responses.extend(self.map_manager.update_fov(prev_player_pos)) 
-            responses.append(schemas.PlayerMovedServerResponse(player_pos=schemas.Position(**prev_player_pos))) 
+            responses.append(events.PlayerMoved(prev_player_pos["x"], prev_player_pos["y"])) 
         return responses
 
-    def _handle_descend_stairs_interaction(self, new_x: int, new_y: int) -> Tuple[List[schemas.ServerResponse], bool]:
-        responses: List[schemas.ServerResponse] = []
+    def _handle_descend_stairs_interaction(self, new_x: int, new_y: int) -> Tuple[List[events.TurnResponse], bool]:
+        responses: List[events.TurnResponse] = []
         self.player.pos={"x":new_x,"y":new_y} 
-        responses.append(schemas.PlayerMovedServerResponse(player_pos=schemas.Position(**self.player.pos)))
-        seed_val=(self.seed+self.current_dungeon_level) if self.seed is not None else random.randint(0,1_000_000)
-        responses.append(schemas.GameMessageServerResponse(text=f"You descend to dungeon level {self.current_dungeon_level + 1}..."))
+        responses.append(events.PlayerMoved(self.player.pos["x"], self.player.pos["y"]))
+        seed_val=self._next_level_spec.seed if self._next_level_spec else self.rng.randint(0,1_000_000)
+        responses.append(events.GameMessage(text=f"You descend to dungeon level {self.current_dungeon_level + 1}..."))
         dungeon_resp=self.generate_new_dungeon(seed=seed_val,width=game_config.DEFAULT_MAP_WIDTH,height=game_config.DEFAULT_MAP_HEIGHT,max_rooms=game_config.DEFAULT_MAX_ROOMS,room_min=game_config.DEFAULT_ROOM_MIN_SIZE,room_max=game_config.DEFAULT_ROOM_MAX_SIZE,is_new_level=True) 
         if isinstance(dungeon_resp,schemas.DungeonDataServerResponse): responses.append(dungeon_resp); return responses,True 
         else: responses.append(dungeon_resp);self.game_over=True;return responses,False
 
-    def _handle_walk_on_tile_interaction(self, new_x: int, new_y: int, target_tile_actual: int) -> Tuple[List[schemas.ServerResponse], bool]:
-        responses: List[schemas.ServerResponse] = []; player_moved_successfully=False
+    def _handle_walk_on_tile_interaction(self, new_x: int, new_y: int, target_tile_actual: int) -> Tuple[List[events.TurnResponse], bool]:
+        responses: List[events.TurnResponse] = []; player_moved_successfully=False
         if self._is_walkable_for_entity(new_x,new_y,"player"):
             self.player.pos={"x":new_x,"y":new_y}; player_moved_successfully=True
             item_key=MAP_TILE_TO_ITEM_TYPE.get(target_tile_actual)
@@ -278,20 +344,32 @@ class GameState:
                 if picked_item and self.map_manager.actual_dungeon_map:
                     self.map_manager.actual_dungeon_map[new_y][new_x]=TILE_FLOOR 
                     if self.map_manager.dungeon_map_for_client: self.map_manager.dungeon_map_for_client[new_y][new_x]=TILE_FLOOR
-                    responses.append(schemas.TileChangeServerResponse(pos=schemas.Position(x=new_x,y=new_y),new_tile_type=TILE_FLOOR))
-                    responses.append(schemas.GameMessageServerResponse(text=f"Picked up {picked_item['type_name']}."))
-                    responses.append(schemas.PlayerStatsUpdateServerResponse(stats=self.player.create_player_stats_response()))
-            responses.append(schemas.PlayerMovedServerResponse(player_pos=schemas.Position(**self.player.pos)))
+                    responses.append(events.TileChange(new_x, new_y, TILE_FLOOR))
+                    responses.append(events.GameMessage(text=f"Picked up {picked_item['type_name']}."))
+                    responses.append(events.PlayerStatsUpdate(stats=self.player.create_player_stats_response()))
+            responses.append(events.PlayerMoved(self.player.pos["x"], self.player.pos["y"]))
         else: 
-            if self.player.pos: responses.append(schemas.InvalidMoveServerResponse(reason="Path blocked (walk_on_tile).",player_pos=schemas.Position(**self.player.pos)))
+            if self.player.pos: responses.append(events.InvalidMove("Path blocked (walk_on_tile).", self.player.pos["x"], self.player.pos["y"]))
         return responses,player_moved_successfully
 
-    def handle_player_move(self, new_x: int, new_y: int) -> List[schemas.ServerResponse]:
-        responses: List[schemas.ServerResponse] = []; action_taken_this_turn=False; descended_stairs_successfully=False
+    def _finalize_turn_responses(self, responses: List[events.TurnResponse]) -> List[events.TurnResponse]:
+        """Last stage of every handle_* turn: reshapes the turn's responses for this connection."""
+        if self.coalesce_state_snapshots:
+            responses = coalesce_state_snapshots(responses)
+        if self.batch_tile_changes and self.map_manager.actual_dungeon_map:
+            responses = batch_tile_changes(responses, len(self.map_manager.actual_dungeon_map[0]))
+        if self.player_stats_delta:
+            responses, self._last_sent_player_stats = stats_updates_as_deltas(responses, self._last_sent_player_stats)
+        return responses
+
+    @timed
+    @_turn_handler
+    def handle_player_move(self, new_x: int, new_y: int) -> List[events.TurnResponse]:
+        responses: List[events.TurnResponse] = []; action_taken_this_turn=False; descended_stairs_successfully=False
         
         if self.game_over:
-            responses.append(schemas.GameMessageServerResponse(text="Game Over."))
-            if self.player.pos: responses.append(schemas.PlayerMovedServerResponse(player_pos=schemas.Position(**self.player.pos)))
+            responses.append(events.GameMessage(text="Game Over."))
+            if self.player.pos: responses.append(events.PlayerMoved(self.player.pos["x"], self.player.pos["y"]))
             return responses
         if not self.map_manager.actual_dungeon_map or not self.player.pos or not self.map_manager.dungeon_map_for_client:
             responses.append(schemas.ErrorServerResponse(message="Game not initialized for move."))
@@ -301,8 +379,8 @@ class GameState:
 
         if not (0 <= new_y < len(self.map_manager.actual_dungeon_map) and \
                 0 <= new_x < len(self.map_manager.actual_dungeon_map[0])):
-            responses.append(schemas.InvalidMoveServerResponse(reason="Target out of map bounds.", player_pos=schemas.Position(**prev_player_pos)))
-            responses.append(schemas.PlayerMovedServerResponse(player_pos=schemas.Position(**prev_player_pos)))
+            responses.append(events.InvalidMove("Target out of map bounds.", prev_player_pos["x"], prev_player_pos["y"]))
+            responses.append(events.PlayerMoved(prev_player_pos["x"], prev_player_pos["y"]))
             return responses
 
         target_tile_actual=self.map_manager.actual_dungeon_map[new_y][new_x]
@@ -322,8 +400,8 @@ class GameState:
             responses.extend(walk_responses)
             if player_moved:action_taken_this_turn=True
         else: 
-            responses.append(schemas.InvalidMoveServerResponse(reason="Path blocked.",player_pos=schemas.Position(**prev_player_pos)))
-            responses.append(schemas.PlayerMovedServerResponse(player_pos=schemas.Position(**prev_player_pos)))
+            responses.append(events.InvalidMove("Path blocked.", prev_player_pos["x"], prev_player_pos["y"]))
+            responses.append(events.PlayerMoved(prev_player_pos["x"], prev_player_pos["y"]))
         
         if action_taken_this_turn and not self.game_over: 
             current_fov_center = self.player.pos 
@@ -337,29 +415,30 @@ class GameState:
                 responses.extend(self.process_monster_turns())
         return responses
 
-    def handle_use_item(self, item_id: str) -> List[schemas.ServerResponse]:
-        responses: List[schemas.ServerResponse] = []
-        if self.game_over: responses.append(schemas.GameMessageServerResponse(text="Game Over.")); return responses
+    @_turn_handler
+    def handle_use_item(self, item_id: str) -> List[events.TurnResponse]:
+        responses: List[events.TurnResponse] = []
+        if self.game_over: responses.append(events.GameMessage(text="Game Over.")); return responses
         item_instance = self.player.find_item_in_inventory(item_id)
         if not item_instance: 
-            responses.append(schemas.GameMessageServerResponse(text="Item not found."))
+            responses.append(events.GameMessage(text="Item not found."))
             # Even if item not found, send stats to ensure client UI (e.g. selection) is consistent
-            responses.append(schemas.PlayerStatsUpdateServerResponse(stats=self.player.create_player_stats_response()))
+            responses.append(events.PlayerStatsUpdate(stats=self.player.create_player_stats_response()))
             return responses
 
         action_taken = False; item_name = item_instance.get("type_name", "item")
         
         if item_instance.get("equippable", False): 
-            responses.append(schemas.GameMessageServerResponse(text=f"To equip {item_name}, use equip action."))
+            responses.append(events.GameMessage(text=f"To equip {item_name}, use equip action."))
         elif item_instance.get("consumable", False):
             effect_id = item_instance.get("effect_id"); handler = ITEM_EFFECT_HANDLERS.get(effect_id) if effect_id else None
             if handler:
                 effect_responses = handler(self, item_instance); responses.extend(effect_responses)
                 if self.player.remove_item_from_inventory(item_id): action_taken = True
-            else: responses.append(schemas.GameMessageServerResponse(text=f"{item_name} has no effect."))
-        else: responses.append(schemas.GameMessageServerResponse(text=f"Cannot use {item_name} this way."))
+            else: responses.append(events.GameMessage(text=f"{item_name} has no effect."))
+        else: responses.append(events.GameMessage(text=f"Cannot use {item_name} this way."))
         
-        responses.append(schemas.PlayerStatsUpdateServerResponse(stats=self.player.create_player_stats_response()))
+        responses.append(events.PlayerStatsUpdate(stats=self.player.create_player_stats_response()))
         
         if action_taken and not self.game_over and self.player.pos:
             if item_instance.get("effect_id") != "teleport_random": 
@@ -368,16 +447,17 @@ class GameState:
             responses.extend(self.process_monster_turns())
         return responses
 
-    def handle_equip_item(self, item_id: str) -> List[schemas.ServerResponse]:
-        responses: List[schemas.ServerResponse] = []
-        if self.game_over: responses.append(schemas.GameMessageServerResponse(text="Game Over.")); return responses
+    @_turn_handler
+    def handle_equip_item(self, item_id: str) -> List[events.TurnResponse]:
+        responses: List[events.TurnResponse] = []
+        if self.game_over: responses.append(events.GameMessage(text="Game Over.")); return responses
         
         equip_msg_responses, success = self.player.equip_item(item_id)
         responses.extend(equip_msg_responses)
         
         # Always send stats update regardless of success, as Player.equip_item might send messages
         # and client needs to reflect the current state (e.g. inventory if unequipped other item)
-        responses.append(schemas.PlayerStatsUpdateServerResponse(stats=self.player.create_player_stats_response())) 
+        responses.append(events.PlayerStatsUpdate(stats=self.player.create_player_stats_response())) 
 
         if success and not self.game_over and self.player.pos:
             responses.extend(self.map_manager.update_fov(self.player.pos))
@@ -385,19 +465,20 @@ class GameState:
             responses.extend(self.process_monster_turns())
         return responses
 
-    def handle_unequip_item(self, slot: str) -> List[schemas.ServerResponse]:
-        responses: List[schemas.ServerResponse] = []
-        if self.game_over: responses.append(schemas.GameMessageServerResponse(text="Game Over.")); return responses
+    @_turn_handler
+    def handle_unequip_item(self, slot: str) -> List[events.TurnResponse]:
+        responses: List[events.TurnResponse] = []
+        if self.game_over: responses.append(events.GameMessage(text="Game Over.")); return responses
         
         if slot not in self.player.equipment: 
-            responses.append(schemas.GameMessageServerResponse(text=f"Invalid slot: {slot}"))
-            responses.append(schemas.PlayerStatsUpdateServerResponse(stats=self.player.create_player_stats_response()))
+            responses.append(events.GameMessage(text=f"Invalid slot: {slot}"))
+            responses.append(events.PlayerStatsUpdate(stats=self.player.create_player_stats_response()))
             return responses
             
         unequip_msg_responses, success = self.player.unequip_item(slot)
         responses.extend(unequip_msg_responses)
         
-        responses.append(schemas.PlayerStatsUpdateServerResponse(stats=self.player.create_player_stats_response()))
+        responses.append(events.PlayerStatsUpdate(stats=self.player.create_player_stats_response()))
 
         if success and not self.game_over and self.player.pos:
             responses.extend(self.map_manager.update_fov(self.player.pos))
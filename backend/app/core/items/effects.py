@@ -1,21 +1,19 @@
 # backend/app/core/items/effects.py
 from typing import Dict, Any, List, TYPE_CHECKING, Tuple
-import random
 
 if TYPE_CHECKING:
     from ..game_state import GameState # GameState still passed for broader context
-    from ...schemas import ServerResponse # Schemas used directly
     from ..player import Player # For type hinting player modifications
 
 from ..tiles import TILE_FLOOR, TILE_FOG # TILE_DOOR_OPEN also walkable for player
-from ... import schemas # For response types like GameMessageServerResponse
+from .. import events # Turn events sent to the client
 
 
 def apply_heal_effect(
     gs: 'GameState', # GameState provides access to gs.player
     item_data: Dict[str, Any] 
-) -> List['ServerResponse']:
-    responses: List['ServerResponse'] = []
+) -> List['events.TurnResponse']:
+    responses: List['events.TurnResponse'] = []
     player_instance = gs.player # Get player instance from GameState
 
     heal_amount = item_data.get("effect_value", 10)
@@ -26,21 +24,21 @@ def apply_heal_effect(
     healed_for = player_instance.hp - old_hp
 
     if healed_for > 0:
-        responses.append(schemas.GameMessageServerResponse(text=f"You use the {item_data.get('type_name', 'item')} and heal for {healed_for} HP."))
+        responses.append(events.GameMessage(text=f"You use the {item_data.get('type_name', 'item')} and heal for {healed_for} HP."))
     else:
-        responses.append(schemas.GameMessageServerResponse(text=f"You use the {item_data.get('type_name', 'item')}, but your health is already full."))
+        responses.append(events.GameMessage(text=f"You use the {item_data.get('type_name', 'item')}, but your health is already full."))
         
     return responses
 
 def apply_teleport_random_effect(
     gs: 'GameState', # GameState provides access to gs.player, gs.map_manager, gs.entity_manager
     item_data: Dict[str, Any] 
-) -> List['ServerResponse']:
-    responses: List['ServerResponse'] = []
+) -> List['events.TurnResponse']:
+    responses: List['events.TurnResponse'] = []
     player_instance = gs.player
 
     if not gs.map_manager.actual_dungeon_map or not player_instance.pos:
-        responses.append(schemas.GameMessageServerResponse(text="Cannot teleport: map or player position invalid."))
+        responses.append(events.GameMessage(text="Cannot teleport: map or player position invalid."))
         return responses
 
     possible_locations: List[Tuple[int, int]] = []
@@ -58,15 +56,15 @@ def apply_teleport_random_effect(
                 possible_locations.append((x,y))
     
     if not possible_locations:
-        responses.append(schemas.GameMessageServerResponse(text="The scroll fizzles. No safe place to teleport!"))
+        responses.append(events.GameMessage(text="The scroll fizzles. No safe place to teleport!"))
         return responses
 
-    new_x, new_y = random.choice(possible_locations)
+    new_x, new_y = gs.rng.choice(possible_locations)
     old_player_pos = player_instance.pos.copy() # Store old position for LKP logic for monsters
     player_instance.pos = {"x": new_x, "y": new_y} 
 
-    responses.append(schemas.GameMessageServerResponse(text=f"You read the {item_data.get('type_name', 'scroll')} and vanish, reappearing elsewhere!"))
-    responses.append(schemas.PlayerMovedServerResponse(player_pos=schemas.Position(**player_instance.pos)))
+    responses.append(events.GameMessage(text=f"You read the {item_data.get('type_name', 'scroll')} and vanish, reappearing elsewhere!"))
+    responses.append(events.PlayerMoved(player_instance.pos["x"], player_instance.pos["y"]))
 
     # If player teleports into a new, unvisited room, reveal it
     room_info = gs.map_manager.get_room_at_pos(player_instance.pos["x"], player_instance.pos["y"])
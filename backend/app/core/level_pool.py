@@ -0,0 +1,138 @@
+# backend/app/core/level_pool.py
+"""
+Level construction as a pure function of a LevelSpec, and a pool that builds upcoming levels ahead of time in
+worker processes. GameState prefetches the next level when a level starts, so descending the stairs is a
+dictionary pop instead of a full generation on the event loop. Specs include the seed, so seeded runs get the
+same levels whether they were prefetched or built inline.
+"""
+import random
+import threading
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .tiles import TILE_FLOOR, TILE_STAIRS_DOWN
+from .tile_grid import TileGrid
+from .monsters.definitions import MONSTER_TEMPLATES
+from .dungeon_generator import DungeonGenerator, Room, RoomLookup
+from . import config as game_config
+
+
+@dataclass(frozen=True)
+class LevelSpec:
+    seed: Optional[int]
+    depth: int
+    width: int = game_config.DEFAULT_MAP_WIDTH
+    height: int = game_config.DEFAULT_MAP_HEIGHT
+    max_rooms: int = game_config.DEFAULT_MAX_ROOMS
+    room_min: int = game_config.DEFAULT_ROOM_MIN_SIZE
+    room_max: int = game_config.DEFAULT_ROOM_MAX_SIZE
+
+
+@dataclass
+class GeneratedLevel:
+    """A finished level: stairs placed, monsters lifted off the map into entity dicts."""
+    spec: LevelSpec
+    map: TileGrid
+    start: Tuple[int, int]
+    rooms: List[Room]
+    monsters: List[Dict[str, Any]]
+    rng: random.Random # the generator's RNG, positioned where the level's turns continue from
+
+
+def build_level(spec: LevelSpec) -> Optional[GeneratedLevel]:
+    """Generates the level for spec; returns None if the generator produced no map or start position."""
+    generator = DungeonGenerator(spec.width, spec.height, seed=spec.seed)
+    level_map, start = generator.generate_dungeon(spec.max_rooms, spec.room_min, spec.room_max)
+    if level_map is None or start is None: return None
+    start_x, start_y = start
+    if level_map[start_y][start_x] != TILE_FLOOR: level_map[start_y][start_x] = TILE_FLOOR
+
+    monsters: List[Dict[str, Any]] = []
+    for r_idx, row in enumerate(list(level_map)):
+        for c_idx, tile_val in enumerate(list(row)):
+            if tile_val not in MONSTER_TEMPLATES: continue
+            level_map[r_idx][c_idx] = TILE_FLOOR
+            if c_idx == start_x and r_idx == start_y: continue
+            template = MONSTER_TEMPLATES[tile_val]
+            monsters.append({**template, "id": str(uuid.uuid4()), "x": c_idx, "y": r_idx,
+                             "hp": template["max_hp"], "last_known_player_pos": None})
+
+    _place_stairs(generator, level_map, start_x, start_y)
+    return GeneratedLevel(spec=spec, map=level_map, start=start, rooms=generator.rooms, monsters=monsters, rng=generator.rng)
+
+
+def _place_stairs(generator: DungeonGenerator, level_map: TileGrid, start_x: int, start_y: int):
+    """Puts the stairs on a random floor tile of a random room other than the start room."""
+    rooms = generator.rooms
+    if not rooms: return
+    last_room_idx = -1
+    start_room_idx = RoomLookup(rooms).room_index_at(start_x, start_y)
+    if len(rooms) > 1 and start_room_idx is not None:
+        poss_indices = [i for i in range(len(rooms)) if i != start_room_idx]
+        if poss_indices: last_room_idx = generator.rng.choice(poss_indices)
+    else: last_room_idx = len(rooms) - 1
+    if last_room_idx == -1: return
+    last_room = rooms[last_room_idx]
+    potential_stairs = [(x, y) for y in range(last_room.y1, last_room.y2 + 1) for x in range(last_room.x1, last_room.x2 + 1)
+                        if level_map[y][x] == TILE_FLOOR and not (x == start_x and y == start_y)]
+    if potential_stairs:
+        sx, sy = generator.rng.choice(potential_stairs)
+        level_map[sy][sx] = TILE_STAIRS_DOWN
+    else:
+        cx, cy = last_room.center()
+        if level_map[cy][cx] == TILE_FLOOR and not (cx == start_x and cy == start_y): level_map[cy][cx] = TILE_STAIRS_DOWN
+
+
+class LevelPool:
+    """
+    Levels being built ahead of time on an executor (normally a ProcessPoolExecutor), keyed by LevelSpec.
+    Each prefetch is handed out once, so sessions sharing a seed never share a level's mutable map. At most
+    max_pending builds are kept; the oldest is dropped past that (a session that left without descending).
+    Safe to share between turn-runner threads.
+    """
+    def __init__(self, executor: Executor, max_pending: int = game_config.LEVEL_POOL_MAX_PENDING):
+        self.executor = executor
+        self.max_pending = max_pending
+        self._pending: 'OrderedDict[LevelSpec, Deque[Future]]' = OrderedDict()
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int: return self._count
+
+    def prefetch(self, spec: LevelSpec):
+        future = self.executor.submit(build_level, spec)
+        with self._lock:
+            self._pending.setdefault(spec, deque()).append(future)
+            self._pending.move_to_end(spec)
+            self._count += 1
+            while self._count > self.max_pending:
+                self._pop_future(next(iter(self._pending))).cancel()
+
+    def discard(self, spec: LevelSpec):
+        """Drops one prefetch of spec (its session will not descend into it)."""
+        with self._lock:
+            if spec in self._pending: self._pop_future(spec).cancel()
+
+    def take(self, spec: LevelSpec) -> Optional[GeneratedLevel]:
+        """The prefetched level for spec, waiting for it if still in flight; built inline if none was prefetched."""
+        with self._lock:
+            future = self._pop_future(spec) if spec in self._pending else None
+        if future is None or future.cancelled(): return build_level(spec)
+        return future.result()
+
+    def _pop_future(self, spec: LevelSpec) -> Future:
+        futures = self._pending[spec]
+        future = futures.popleft()
+        if not futures: del self._pending[spec]
+        self._count -= 1
+        return future
+
+    def shutdown(self):
+        with self._lock:
+            for futures in self._pending.values():
+                for future in futures: future.cancel()
+            self._pending.clear(); self._count = 0
+        self.executor.shutdown(wait=True, cancel_futures=True)
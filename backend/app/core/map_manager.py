@@ -1,14 +1,17 @@
 # backend/app/core/map_manager.py
-from typing import Any, Dict, List, Optional, Tuple, Set, TYPE_CHECKING
-import math
+from typing import Any, Dict, List, Optional, Tuple, Set, Union, TYPE_CHECKING
 from collections import deque
+import heapq
 
 from .tiles import (
     TILE_FLOOR, TILE_WALL, TILE_EMPTY, TILE_DOOR_CLOSED, TILE_DOOR_OPEN,
     TILE_FOG, TILE_ITEM_POTION, TILE_ITEM_SCROLL_TELEPORT, TILE_STAIRS_DOWN
 )
+from .tile_grid import TileGrid, TileBitset
+from .dungeon_generator import RoomLookup
 from . import config as game_config
-from .. import schemas
+from . import events
+from .metrics import PATH_SEARCH_NODES, timed
 
 if TYPE_CHECKING:
     from .game_state import GameState 
@@ -18,30 +21,75 @@ if TYPE_CHECKING:
 
 class MapManager:
     def __init__(self, logger_parent_name: str = "MapManager"):
-        self.actual_dungeon_map: Optional[List[List[int]]] = None
-        self.dungeon_map_for_client: Optional[List[List[int]]] = None
+        self.actual_dungeon_map: Optional[TileGrid] = None
+        self.dungeon_map_for_client: Optional[TileGrid] = None
         self.generated_rooms: List['Room'] = []
+        self._room_lookup: Optional[RoomLookup] = None
+        self._room_lookup_rooms: Optional[List['Room']] = None # List (and length) the lookup was built from
+        self._room_lookup_size: int = 0
         self.visited_room_indices: Set[int] = set() 
-        self.ever_revealed_tiles: Set[Tuple[int, int]] = set()
+        # One bit per cell of the current map (see _reset_tile_sets); it only ever grows.
+        self.ever_revealed_tiles: TileBitset = TileBitset()
+        # Incremental FoV bookkeeping: tiles visible after the last update_fov call, and tiles
+        # revealed since then by other means (e.g. room reveals) that the client has not seen yet.
+        # Both are bounded by the view radius or a room, so they stay sparse coordinate sets.
+        self.visible_tiles: Set[Tuple[int, int]] = set()
+        self._pending_revealed_tiles: Set[Tuple[int, int]] = set()
+        self._client_view_synced: bool = False
+        self.last_search_nodes_expanded: int = 0 # Nodes popped by the most recent path search
+        # Bumped whenever walkable terrain changes (new level, door opened) so cached paths/fields can be dropped.
+        self.terrain_version: int = 0
         # self.logger = logging.getLogger(logger_parent_name)
 
-    def initialize_maps(self, actual_map: List[List[int]], client_map_width: int, client_map_height: int):
-        self.actual_dungeon_map = actual_map
-        self.dungeon_map_for_client = [[TILE_FOG for _ in range(client_map_width)] for _ in range(client_map_height)]
+    def initialize_maps(self, actual_map: Union[TileGrid, List[List[int]]], client_map_width: int, client_map_height: int):
+        self.actual_dungeon_map = actual_map if isinstance(actual_map, TileGrid) else TileGrid.from_rows(actual_map)
+        self.dungeon_map_for_client = TileGrid(client_map_width, client_map_height, TILE_FOG)
+        self.terrain_version += 1
         self.visited_room_indices.clear()
-        self.ever_revealed_tiles.clear()
+        self._reset_tile_sets()
+        self._client_view_synced = False
+
+    def _reset_tile_sets(self, keep_revealed: bool = False):
+        map_h = len(self.actual_dungeon_map); map_w = len(self.actual_dungeon_map[0]) if map_h else 0
+        previously_revealed = self.ever_revealed_tiles
+        self.ever_revealed_tiles = TileBitset(map_w, map_h)
+        self.visible_tiles = set()
+        self._pending_revealed_tiles = set()
+        if keep_revealed:
+            self.ever_revealed_tiles.update(pos for pos in previously_revealed if pos[0] < map_w and pos[1] < map_h)
+
+    def _ensure_tile_sets(self):
+        """Resizes the tile bitsets if actual_dungeon_map was replaced without initialize_maps."""
+        map_h = len(self.actual_dungeon_map); map_w = len(self.actual_dungeon_map[0]) if map_h else 0
+        if self.ever_revealed_tiles.width != map_w or self.ever_revealed_tiles.height != map_h:
+            self._reset_tile_sets(keep_revealed=True)
+            self._client_view_synced = False
+
+    def _reveal_tile(self, x: int, y: int):
+        self._ensure_tile_sets()
+        if (x, y) not in self.ever_revealed_tiles:
+            self.ever_revealed_tiles.add((x, y))
+            self._pending_revealed_tiles.add((x, y))
 
     def set_generated_rooms(self, rooms: List['Room']):
         self.generated_rooms = rooms
+        self._rebuild_room_lookup()
+
+    def _rebuild_room_lookup(self):
+        self._room_lookup = RoomLookup(self.generated_rooms)
+        self._room_lookup_rooms = self.generated_rooms
+        self._room_lookup_size = len(self.generated_rooms)
 
     def get_room_at_pos(self, x: int, y: int) -> Optional[Tuple[int, 'Room']]:
-        for i, room in enumerate(self.generated_rooms):
-            if room.x1 <= x <= room.x2 and room.y1 <= y <= room.y2:
-                return i, room
-        return None
+        # Rebuild if generated_rooms was replaced or extended without going through set_generated_rooms.
+        if self._room_lookup is None or self._room_lookup_rooms is not self.generated_rooms or \
+           self._room_lookup_size != len(self.generated_rooms):
+            self._rebuild_room_lookup()
+        room_idx = self._room_lookup.room_index_at(x, y)
+        return (room_idx, self.generated_rooms[room_idx]) if room_idx is not None else None
 
-    def reveal_room_and_connected_corridors(self, room_index: int, gs: 'GameState') -> List[schemas.TileChangeServerResponse]:
-        responses: List[schemas.TileChangeServerResponse] = [] 
+    def reveal_room_and_connected_corridors(self, room_index: int, gs: 'GameState') -> List[events.TileChange]:
+        responses: List[events.TileChange] = [] 
         if not self.actual_dungeon_map or not self.dungeon_map_for_client or room_index >= len(self.generated_rooms):
             return responses
         if room_index in self.visited_room_indices:
@@ -53,7 +101,7 @@ class MapManager:
         for y_coord in range(room_to_reveal.y1, room_to_reveal.y2 + 1):
             for x_coord in range(room_to_reveal.x1, room_to_reveal.x2 + 1):
                 if 0 <= y_coord < len(self.actual_dungeon_map) and 0 <= x_coord < len(self.actual_dungeon_map[0]):
-                    self.ever_revealed_tiles.add((x_coord, y_coord))
+                    self._reveal_tile(x_coord, y_coord)
         
         q_corridor_reveal: deque[Tuple[int, int]] = deque()
         for y_r in range(room_to_reveal.y1 - 1, room_to_reveal.y2 + 2):
@@ -62,7 +110,7 @@ class MapManager:
                 if room_to_reveal.is_inside(x_r, y_r): continue
                 tile_at_boundary = self.actual_dungeon_map[y_r][x_r]
                 if tile_at_boundary == TILE_DOOR_CLOSED or tile_at_boundary == TILE_DOOR_OPEN:
-                    self.ever_revealed_tiles.add((x_r, y_r))
+                    self._reveal_tile(x_r, y_r)
                     for dx, dy in [(0,1),(0,-1),(1,0),(-1,0)]:
                         nx,ny = x_r+dx, y_r+dy
                         if 0 <= ny < len(self.actual_dungeon_map) and 0 <= nx < len(self.actual_dungeon_map[0]) and \
@@ -75,7 +123,7 @@ class MapManager:
             cx, cy = q_corridor_reveal.popleft()
             if (cx,cy) in visited_in_bfs: continue
             visited_in_bfs.add((cx,cy))
-            self.ever_revealed_tiles.add((cx,cy))
+            self._reveal_tile(cx, cy)
             actual_tile = self.actual_dungeon_map[cy][cx]
             if actual_tile == TILE_DOOR_CLOSED or actual_tile == TILE_DOOR_OPEN:
                 is_door_to_unvisited_room = False
@@ -94,37 +142,65 @@ class MapManager:
                     q_corridor_reveal.append((nx,ny))
         return [] 
 
-    def update_fov(self, center_pos: Dict[str, int]) -> List[schemas.TileChangeServerResponse]:
-        player_view_radius = game_config.PLAYER_VIEW_RADIUS
-        responses: List[schemas.TileChangeServerResponse] = []
+    def _compute_visible_tiles(self, center_pos: Dict[str, int]) -> Set[Tuple[int, int]]:
+        strategy = FOV_STRATEGIES.get(game_config.FOV_ALGORITHM, _visible_tiles_bresenham)
+        return strategy(self, center_pos, game_config.PLAYER_VIEW_RADIUS)
+
+    @timed
+    def update_fov(self, center_pos: Dict[str, int]) -> List[events.TileChange]:
         if not self.actual_dungeon_map or not self.dungeon_map_for_client or not center_pos:
-            return responses
-        
+            return []
+        self._ensure_tile_sets()
+        if game_config.FOV_INCREMENTAL_UPDATES and self._client_view_synced:
+            return self._update_fov_incremental(center_pos)
+        return self._update_fov_full(center_pos)
+
+    def _update_fov_full(self, center_pos: Dict[str, int]) -> List[events.TileChange]:
+        """Rebuilds the whole client view from ever_revealed_tiles and diffs every cell. O(map area)."""
+        responses: List[events.TileChange] = []
         map_h = len(self.actual_dungeon_map)
         map_w = len(self.actual_dungeon_map[0])
-        px_center, py_center = center_pos["x"], center_pos["y"]
-        new_client_map_view = [[TILE_FOG for _ in range(map_w)] for _ in range(map_h)]
+        new_client_map_view = TileGrid(map_w, map_h, TILE_FOG)
 
+        visible_now = self._compute_visible_tiles(center_pos)
+        self.ever_revealed_tiles.update(visible_now)
         for x_revealed, y_revealed in self.ever_revealed_tiles:
-            if 0 <= y_revealed < map_h and 0 <= x_revealed < map_w:
-                 new_client_map_view[y_revealed][x_revealed] = self.actual_dungeon_map[y_revealed][x_revealed]
-        
-        for r_y in range(py_center - player_view_radius, py_center + player_view_radius + 1):
-            for r_x in range(px_center - player_view_radius, px_center + player_view_radius + 1):
-                if not (0 <= r_y < map_h and 0 <= r_x < map_w): continue
-                if math.sqrt((r_x - px_center)**2 + (r_y - py_center)**2) > player_view_radius: continue
-                if self.has_line_of_sight(center_pos, {"x": r_x, "y": r_y}):
-                    actual_tile = self.actual_dungeon_map[r_y][r_x]
-                    new_client_map_view[r_y][r_x] = actual_tile 
-                    self.ever_revealed_tiles.add((r_x, r_y)) 
+            new_client_map_view[y_revealed][x_revealed] = self.actual_dungeon_map[y_revealed][x_revealed]
 
         for y_scan in range(map_h):
+            old_row, new_row = self.dungeon_map_for_client[y_scan], new_client_map_view[y_scan]
+            if old_row == new_row: continue
             for x_scan in range(map_w):
-                if self.dungeon_map_for_client[y_scan][x_scan] != new_client_map_view[y_scan][x_scan]:
-                    responses.append(schemas.TileChangeServerResponse(
-                        pos=schemas.Position(x=x_scan,y=y_scan),
-                        new_tile_type=new_client_map_view[y_scan][x_scan] ))
+                if old_row[x_scan] != new_row[x_scan]:
+                    responses.append(events.TileChange(x_scan, y_scan, new_row[x_scan]))
         self.dungeon_map_for_client = new_client_map_view 
+        self.visible_tiles = visible_now
+        self._pending_revealed_tiles.clear()
+        self._client_view_synced = True
+        return responses
+
+    def _update_fov_incremental(self, center_pos: Dict[str, int]) -> List[events.TileChange]:
+        """
+        Only re-checks tiles entering or leaving the visible set, plus tiles revealed since the
+        last call. Cost depends on the view radius, not on the map size.
+        """
+        responses: List[events.TileChange] = []
+        visible_now = self._compute_visible_tiles(center_pos)
+        self.ever_revealed_tiles.update(visible_now)
+
+        candidates = visible_now | self.visible_tiles | self._pending_revealed_tiles
+        # Row-major order keeps the emitted responses identical to a full rescan.
+        row_y = -1
+        for x_c, y_c in sorted(candidates, key=lambda pos: (pos[1], pos[0])):
+            if y_c != row_y: # row views are made on demand, so fetch each row once
+                row_y = y_c; actual_row = self.actual_dungeon_map[y_c]; client_row = self.dungeon_map_for_client[y_c]
+            revealed = (x_c, y_c) in visible_now or (x_c, y_c) in self.ever_revealed_tiles
+            new_tile = actual_row[x_c] if revealed else TILE_FOG
+            if client_row[x_c] != new_tile:
+                client_row[x_c] = new_tile
+                responses.append(events.TileChange(x_c, y_c, new_tile))
+        self.visible_tiles = visible_now
+        self._pending_revealed_tiles.clear()
         return responses
 
     def has_line_of_sight(self, start_pos: Dict[str, int], end_pos: Dict[str, int]) -> bool:
@@ -151,63 +227,169 @@ class MapManager:
             if e2 < dx: err += dx; current_y += sy
         return True
 
+    def _can_start_path(self, start_pos: Dict[str,int], entity_type: str, entity_manager: 'EntityManager', player_pos: Optional[Dict[str, int]]) -> bool:
+        if self.is_walkable_for_entity(start_pos["x"], start_pos["y"], entity_type, entity_manager, player_pos):
+            return True
+        tile = self.actual_dungeon_map[start_pos["y"]][start_pos["x"]]
+        # A searching monster occupies its own start tile, so only the terrain there matters.
+        if entity_type == "monster":
+            return self.is_tile_passable(start_pos["x"], start_pos["y"], entity_type)
+        # Allow player to pathfind "from" a closed door tile they are on to open it (target is door)
+        # but general pathfinding *from* an unwalkable tile should fail.
+        return entity_type == "player" and tile == TILE_DOOR_CLOSED
+
+    def find_path(self, start_pos: Dict[str,int], end_pos: Dict[str,int], entity_type: str, entity_manager: 'EntityManager', player_pos: Optional[Dict[str, int]]) -> Optional[List[Dict[str,int]]]:
+        """Finds a path with the search selected by config.PATHFINDING_ALGORITHM."""
+        search = PATHFINDING_STRATEGIES.get(game_config.PATHFINDING_ALGORITHM, MapManager.find_path_bfs)
+        return search(self, start_pos, end_pos, entity_type, entity_manager, player_pos)
+
+    @timed
     def find_path_bfs(self, start_pos: Dict[str,int], end_pos: Dict[str,int], entity_type: str, entity_manager: 'EntityManager', player_pos: Optional[Dict[str, int]]) -> Optional[List[Dict[str,int]]]:
         if not self.actual_dungeon_map : return None
 
         # If start and end are the same, path is just the start/end point
         if start_pos["x"] == end_pos["x"] and start_pos["y"] == end_pos["y"]:
             return [start_pos]
+        if not self._can_start_path(start_pos, entity_type, entity_manager, player_pos): return None
 
-        # Check if the starting position itself is walkable for the entity.
-        # If not, no path can begin from there unless it's also the end_pos (handled above).
-        if not self.is_walkable_for_entity(start_pos["x"], start_pos["y"], entity_type, entity_manager, player_pos):
-            # Allow player to pathfind "from" a closed door tile they are on to open it (target is door)
-            # but general pathfinding *from* an unwalkable tile should fail.
-            # However, for monsters, if they somehow start on an unwalkable tile, they shouldn't be able to path.
-            if entity_type != "player" or self.actual_dungeon_map[start_pos["y"]][start_pos["x"]] != TILE_DOOR_CLOSED:
-                 return None
+        map_h = len(self.actual_dungeon_map); map_w = len(self.actual_dungeon_map[0])
+        start_idx = start_pos["y"] * map_w + start_pos["x"]
+        end_idx = end_pos["y"] * map_w + end_pos["x"]
+        # A monster may always end its path on the player's tile even though it is "occupied".
+        end_is_player_for_monster = entity_type == "monster" and player_pos is not None and \
+                                    end_pos["x"] == player_pos["x"] and end_pos["y"] == player_pos["y"]
 
+        # Cells are flat indices (y * map_w + x); parents doubles as the visited set.
+        parents: Dict[int, int] = {start_idx: -1}
+        queue: deque[int] = deque([start_idx])
+        nodes_expanded = 0
+
+        while queue:
+            current_idx = queue.popleft()
+            nodes_expanded += 1
+            if current_idx == end_idx:
+                self.last_search_nodes_expanded = nodes_expanded; PATH_SEARCH_NODES.inc("bfs", amount=nodes_expanded)
+                return _rebuild_path(parents, end_idx, map_w, start_pos)
+
+            current_y, current_x = divmod(current_idx, map_w)
+            for dx, dy in _ORTHOGONAL_STEPS:
+                next_x, next_y = current_x + dx, current_y + dy
+                if not (0 <= next_x < map_w and 0 <= next_y < map_h): continue
+                next_idx = next_y * map_w + next_x
+                if next_idx in parents: continue
+                if (next_idx == end_idx and end_is_player_for_monster) or \
+                   self.is_walkable_for_entity(next_x, next_y, entity_type, entity_manager, player_pos):
+                    parents[next_idx] = current_idx
+                    queue.append(next_idx)
+        self.last_search_nodes_expanded = nodes_expanded; PATH_SEARCH_NODES.inc("bfs", amount=nodes_expanded)
+        return None
+
+    @timed
+    def find_path_astar(self, start_pos: Dict[str,int], end_pos: Dict[str,int], entity_type: str, entity_manager: 'EntityManager', player_pos: Optional[Dict[str, int]]) -> Optional[List[Dict[str,int]]]:
+        """
+        A* over 4-connected cells with a Manhattan heuristic scaled by config.PATHFINDING_HEURISTIC_WEIGHT.
+        Same walkability rules and return shape as find_path_bfs; with weight 1 paths are equally short.
+        """
+        if not self.actual_dungeon_map : return None
+        if start_pos["x"] == end_pos["x"] and start_pos["y"] == end_pos["y"]:
+            return [start_pos]
+        if not self._can_start_path(start_pos, entity_type, entity_manager, player_pos): return None
 
-        queue: deque[List[Dict[str,int]]] = deque([[start_pos]])
-        visited: Set[Tuple[int,int]] = { (start_pos["x"], start_pos["y"]) }
-        
         map_h = len(self.actual_dungeon_map); map_w = len(self.actual_dungeon_map[0])
+        end_x, end_y = end_pos["x"], end_pos["y"]
+        start_idx = start_pos["y"] * map_w + start_pos["x"]
+        end_idx = end_y * map_w + end_x
+        end_is_player_for_monster = entity_type == "monster" and player_pos is not None and \
+                                    end_x == player_pos["x"] and end_y == player_pos["y"]
+        weight = game_config.PATHFINDING_HEURISTIC_WEIGHT
 
-        while queue:
-            path = queue.popleft()
-            current_node = path[-1]
+        parents: Dict[int, int] = {start_idx: -1}
+        cost_so_far: Dict[int, int] = {start_idx: 0}
+        closed: Set[int] = set()
+        start_h = abs(start_pos["x"] - end_x) + abs(start_pos["y"] - end_y)
+        # Heap entries are (f, h, idx); ties on f go to the node nearer the goal.
+        frontier: List[Tuple[float, int, int]] = [(start_h * weight, start_h, start_idx)]
+        nodes_expanded = 0
 
-            # Check if current_node is the end_pos (already done before loop for start_pos == end_pos)
-            # This check is for subsequent nodes in the path.
-            if current_node["x"] == end_pos["x"] and current_node["y"] == end_pos["y"]:
-                return path
-            
-            for dx, dy in [(0,1), (0,-1), (1,0), (-1,0)]: # Orthogonal neighbors
-                next_x, next_y = current_node["x"] + dx, current_node["y"] + dy
-
-                if (next_x, next_y) not in visited:
-                    is_target_node = (next_x == end_pos["x"] and next_y == end_pos["y"])
-                    can_path_through = False
-
-                    if is_target_node:
-                        # If the destination is the player's current tile and entity is a monster, it's a valid target.
-                        if entity_type == "monster" and player_pos and next_x == player_pos["x"] and next_y == player_pos["y"]:
-                            can_path_through = True
-                        # If it's the target node, use is_walkable_for_entity to see if the entity can *end* on this tile.
-                        # This handles cases like player moving to a door or item.
-                        elif self.is_walkable_for_entity(next_x, next_y, entity_type, entity_manager, player_pos):
-                             can_path_through = True
-                    # For non-target nodes in the path
-                    elif self.is_walkable_for_entity(next_x, next_y, entity_type, entity_manager, player_pos):
-                        can_path_through = True
-                    
-                    if can_path_through:
-                        visited.add((next_x, next_y))
-                        new_path = list(path)
-                        new_path.append({"x": next_x, "y": next_y})
-                        queue.append(new_path)
+        while frontier:
+            _, _, current_idx = heapq.heappop(frontier)
+            if current_idx in closed: continue
+            closed.add(current_idx)
+            nodes_expanded += 1
+            if current_idx == end_idx:
+                self.last_search_nodes_expanded = nodes_expanded; PATH_SEARCH_NODES.inc("astar", amount=nodes_expanded)
+                return _rebuild_path(parents, end_idx, map_w, start_pos)
+
+            current_y, current_x = divmod(current_idx, map_w)
+            next_cost = cost_so_far[current_idx] + 1
+            for dx, dy in _ORTHOGONAL_STEPS:
+                next_x, next_y = current_x + dx, current_y + dy
+                if not (0 <= next_x < map_w and 0 <= next_y < map_h): continue
+                next_idx = next_y * map_w + next_x
+                if next_idx in closed or next_cost >= cost_so_far.get(next_idx, next_cost + 1): continue
+                if (next_idx == end_idx and end_is_player_for_monster) or \
+                   self.is_walkable_for_entity(next_x, next_y, entity_type, entity_manager, player_pos):
+                    cost_so_far[next_idx] = next_cost
+                    parents[next_idx] = current_idx
+                    h = abs(next_x - end_x) + abs(next_y - end_y)
+                    heapq.heappush(frontier, (next_cost + h * weight, h, next_idx))
+        self.last_search_nodes_expanded = nodes_expanded; PATH_SEARCH_NODES.inc("astar", amount=nodes_expanded)
         return None
 
+    def mark_terrain_changed(self):
+        self.terrain_version += 1
+
+    def build_distance_field(self, origin: Dict[str, int], entity_type: str = "monster") -> List[int]:
+        """
+        Walking distance from origin to every cell (flat y * width + x list, -1 if unreachable), over the
+        tiles is_walkable_for_entity lets entity_type enter (plus origin itself). Entities are ignored;
+        callers check occupancy per step.
+        """
+        map_h = len(self.actual_dungeon_map); map_w = len(self.actual_dungeon_map[0])
+        field = [-1] * (map_w * map_h)
+        origin_idx = origin["y"] * map_w + origin["x"]
+        field[origin_idx] = 0
+        walkable_tiles = _WALKABLE_TILES.get(entity_type, frozenset())
+        actual_map = self.actual_dungeon_map
+        cells = actual_map.cells if isinstance(actual_map, TileGrid) else [tile for row in actual_map for tile in row]
+        queue: deque[int] = deque([origin_idx])
+        while queue:
+            current_idx = queue.popleft()
+            current_y, current_x = divmod(current_idx, map_w)
+            next_distance = field[current_idx] + 1
+            for dx, dy in _ORTHOGONAL_STEPS:
+                next_x, next_y = current_x + dx, current_y + dy
+                if not (0 <= next_x < map_w and 0 <= next_y < map_h): continue
+                next_idx = next_y * map_w + next_x
+                if field[next_idx] == -1 and cells[next_idx] in walkable_tiles:
+                    field[next_idx] = next_distance
+                    queue.append(next_idx)
+        return field
+
+    def path_down_distance_field(self, field: List[int], start_pos: Dict[str,int], entity_type: str, entity_manager: 'EntityManager', player_pos: Optional[Dict[str, int]]) -> Optional[List[Dict[str,int]]]:
+        """
+        Follows the field's gradient from start_pos to its origin, returning a path shaped like find_path_bfs.
+        Only the first step is checked against blocking entities; returns None if the start is unreachable
+        or every downhill first step is occupied.
+        """
+        map_h = len(self.actual_dungeon_map); map_w = len(self.actual_dungeon_map[0])
+        current_x, current_y = start_pos["x"], start_pos["y"]
+        distance = field[current_y * map_w + current_x]
+        if distance < 0: return None
+        path: List[Dict[str, int]] = [start_pos]
+        while distance > 0:
+            for dx, dy in _ORTHOGONAL_STEPS:
+                next_x, next_y = current_x + dx, current_y + dy
+                if not (0 <= next_x < map_w and 0 <= next_y < map_h) or field[next_y * map_w + next_x] != distance - 1: continue
+                if len(path) == 1 and distance > 1 and \
+                   not self.is_walkable_for_entity(next_x, next_y, entity_type, entity_manager, player_pos): continue
+                break
+            else:
+                return None
+            current_x, current_y, distance = next_x, next_y, distance - 1
+            path.append({"x": current_x, "y": current_y})
+        return path
+
     def is_tile_passable(self, x: int, y: int, for_entity_type: str) -> bool:
         if not self.actual_dungeon_map: return False
         map_h = len(self.actual_dungeon_map); map_w = len(self.actual_dungeon_map[0])
@@ -261,21 +443,183 @@ class MapManager:
         
         # Specific check for player_teleport: must be floor/open door AND no monster
         if entity_type == "player_teleport": 
-            return tile in [TILE_FLOOR, TILE_DOOR_OPEN] and not other_monster_at_xy
+            return tile in _WALKABLE_TILES["player_teleport"] and not other_monster_at_xy
 
         # General walkability based on tile type for the entity, assuming no other entity blocks
         if entity_type == "monster":
             # Monsters can walk on floor and open doors.
             # They can also pathfind *to* the player's tile (which is likely TILE_FLOOR).
-            return tile in [TILE_FLOOR, TILE_DOOR_OPEN]
+            return tile in _WALKABLE_TILES["monster"]
         
         elif entity_type == "player":
             # Player can walk on floor, open doors, items, stairs.
             # Player can pathfind *to* a closed door to open it.
             # Monster check already done above.
-            return tile in [
-                TILE_FLOOR, TILE_DOOR_OPEN, TILE_ITEM_POTION, TILE_ITEM_SCROLL_TELEPORT,
-                TILE_STAIRS_DOWN, TILE_DOOR_CLOSED 
-            ]
+            return tile in _WALKABLE_TILES["player"]
             
-        return False # Default deny
\ No newline at end of file
+        return False # Default deny
+
+
+# --- Pathfinding ---
+
+# Tiles each entity type may step onto, before checking for blocking entities (see is_walkable_for_entity).
+_WALKABLE_TILES: Dict[str, frozenset] = {
+    "monster": frozenset((TILE_FLOOR, TILE_DOOR_OPEN)),
+    "player": frozenset((TILE_FLOOR, TILE_DOOR_OPEN, TILE_ITEM_POTION, TILE_ITEM_SCROLL_TELEPORT, TILE_STAIRS_DOWN, TILE_DOOR_CLOSED)),
+    "player_teleport": frozenset((TILE_FLOOR, TILE_DOOR_OPEN)),
+}
+
+_ORTHOGONAL_STEPS: Tuple[Tuple[int, int], ...] = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+def _rebuild_path(parents: Dict[int, int], end_idx: int, map_w: int, start_pos: Dict[str, int]) -> List[Dict[str, int]]:
+    """Walks parent pointers back from end_idx. The first element is the caller's start_pos dict."""
+    path: List[Dict[str, int]] = []
+    idx = end_idx
+    while parents[idx] != -1:
+        y, x = divmod(idx, map_w)
+        path.append({"x": x, "y": y})
+        idx = parents[idx]
+    path.append(start_pos)
+    path.reverse()
+    return path
+
+PATHFINDING_STRATEGIES = {
+    "bfs": MapManager.find_path_bfs,
+    "astar": MapManager.find_path_astar,
+}
+
+
+# --- Field of View strategies ---
+# Each strategy returns the set of (x, y) tiles visible from center_pos within radius.
+# Tiles are opaque if they are walls or closed doors; tiles outside the map are never visible.
+
+def _is_opaque(tile: int) -> bool:
+    return tile == TILE_WALL or tile == TILE_DOOR_CLOSED
+
+def _visible_tiles_bresenham(map_manager: MapManager, center_pos: Dict[str, int], radius: int) -> Set[Tuple[int, int]]:
+    """One Bresenham ray per tile in the view square. O(r^3) per call."""
+    current_map = map_manager.actual_dungeon_map
+    map_h = len(current_map); map_w = len(current_map[0])
+    px_center, py_center = center_pos["x"], center_pos["y"]
+    radius_sq = radius * radius
+    visible: Set[Tuple[int, int]] = set()
+    for r_y in range(py_center - radius, py_center + radius + 1):
+        for r_x in range(px_center - radius, px_center + radius + 1):
+            if not (0 <= r_y < map_h and 0 <= r_x < map_w): continue
+            if (r_x - px_center)**2 + (r_y - py_center)**2 > radius_sq: continue
+            if map_manager.has_line_of_sight(center_pos, {"x": r_x, "y": r_y}):
+                visible.add((r_x, r_y))
+    return visible
+
+# Per-radius cache of precomputed Bresenham rays: list of (dx, dy, intermediate_tiles_bitmask).
+# Bits index the (2r+1) x (2r+1) square around the viewer, row-major.
+_BRESENHAM_RAY_MASKS: Dict[int, List[Tuple[int, int, int]]] = {}
+
+def _bresenham_ray_masks(radius: int) -> List[Tuple[int, int, int]]:
+    rays = _BRESENHAM_RAY_MASKS.get(radius)
+    if rays is not None: return rays
+    side = 2 * radius + 1
+    rays = []
+    for dy_t in range(-radius, radius + 1):
+        for dx_t in range(-radius, radius + 1):
+            if dx_t * dx_t + dy_t * dy_t > radius * radius: continue
+            # Same stepping as MapManager.has_line_of_sight, from (0,0) to (dx_t,dy_t), endpoints excluded.
+            dx = abs(dx_t); dy = abs(dy_t)
+            sx = 1 if 0 < dx_t else -1; sy = 1 if 0 < dy_t else -1
+            err = dx - dy
+            cur_x, cur_y = 0, 0
+            mask = 0
+            while not (cur_x == dx_t and cur_y == dy_t):
+                if not (cur_x == 0 and cur_y == 0):
+                    mask |= 1 << ((cur_y + radius) * side + (cur_x + radius))
+                e2 = 2 * err
+                if e2 > -dy: err -= dy; cur_x += sx
+                if e2 < dx: err += dx; cur_y += sy
+            rays.append((dx_t, dy_t, mask))
+    _BRESENHAM_RAY_MASKS[radius] = rays
+    return rays
+
+def _visible_tiles_bresenham_cached(map_manager: MapManager, center_pos: Dict[str, int], radius: int) -> Set[Tuple[int, int]]:
+    """
+    Same visibility as _visible_tiles_bresenham, but the rays are precomputed once per radius as
+    bitmasks. Each call makes one pass over the view square to build an opacity mask, then tests
+    every ray with a single AND. O(r^2) per call.
+    """
+    current_map = map_manager.actual_dungeon_map
+    map_h = len(current_map); map_w = len(current_map[0])
+    cx, cy = center_pos["x"], center_pos["y"]
+    side = 2 * radius + 1
+    opaque_mask = 0
+    bit = 1
+    for y in range(cy - radius, cy + radius + 1):
+        row = current_map[y] if 0 <= y < map_h else None
+        for x in range(cx - radius, cx + radius + 1):
+            if row is None or not (0 <= x < map_w) or _is_opaque(row[x]):
+                opaque_mask |= bit
+            bit <<= 1
+    visible: Set[Tuple[int, int]] = set()
+    for dx, dy, ray_mask in _bresenham_ray_masks(radius):
+        if ray_mask & opaque_mask: continue
+        x, y = cx + dx, cy + dy
+        if 0 <= y < map_h and 0 <= x < map_w:
+            visible.add((x, y))
+    return visible
+
+# Octant transforms (xx, xy, yx, yy) for recursive shadowcasting.
+_SHADOWCAST_OCTANTS = [
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+]
+
+def _visible_tiles_shadowcast(map_manager: MapManager, center_pos: Dict[str, int], radius: int) -> Set[Tuple[int, int]]:
+    """
+    Recursive shadowcasting: each octant is scanned row by row once, carrying the lit slope
+    interval forward instead of re-walking a ray per tile. O(r^2) per call. More permissive than
+    the Bresenham strategies around wall corners, so it can reveal a few extra wall tiles.
+    """
+    current_map = map_manager.actual_dungeon_map
+    map_h = len(current_map); map_w = len(current_map[0])
+    cx, cy = center_pos["x"], center_pos["y"]
+    radius_sq = radius * radius
+    visible: Set[Tuple[int, int]] = set()
+    if 0 <= cy < map_h and 0 <= cx < map_w:
+        visible.add((cx, cy))
+
+    def cast_light(row: int, start_slope: float, end_slope: float, xx: int, xy: int, yx: int, yy: int):
+        if start_slope < end_slope: return
+        next_start_slope = start_slope
+        for distance in range(row, radius + 1):
+            blocked = False
+            dy = -distance
+            for dx in range(-distance, 1):
+                left_slope = (dx - 0.5) / (dy + 0.5)
+                right_slope = (dx + 0.5) / (dy - 0.5)
+                if start_slope < right_slope: continue
+                if end_slope > left_slope: break
+                map_x = cx + dx * xx + dy * xy
+                map_y = cy + dx * yx + dy * yy
+                in_bounds = 0 <= map_y < map_h and 0 <= map_x < map_w
+                if in_bounds and dx * dx + dy * dy <= radius_sq:
+                    visible.add((map_x, map_y))
+                opaque = not in_bounds or _is_opaque(current_map[map_y][map_x])
+                if blocked:
+                    if opaque:
+                        next_start_slope = right_slope
+                        continue
+                    blocked = False
+                    start_slope = next_start_slope
+                elif opaque and distance < radius:
+                    blocked = True
+                    cast_light(distance + 1, start_slope, left_slope, xx, xy, yx, yy)
+                    next_start_slope = right_slope
+            if blocked: break
+
+    for xx, xy, yx, yy in _SHADOWCAST_OCTANTS:
+        cast_light(1, 1.0, 0.0, xx, xy, yx, yy)
+    return visible
+
+FOV_STRATEGIES = {
+    "bresenham": _visible_tiles_bresenham,
+    "bresenham_cached": _visible_tiles_bresenham_cached,
+    "shadowcast": _visible_tiles_shadowcast,
+}
@@ -0,0 +1,135 @@
+# backend/app/core/metrics.py
+"""
+Process-local metrics in the Prometheus text exposition format (version 0.0.4), served by GET /metrics in
+main.py. No client library and no push gateway: a metric is a few numbers behind a lock, updated inline and
+rendered when scraped, so it is cheap enough to leave on. Values are per worker process.
+
+Functions decorated with @timed report to dungeon_function_duration_seconds, labelled by function name.
+"""
+import bisect
+import functools
+import threading
+import time
+from typing import Callable, Dict, List, Sequence, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+DURATION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra: pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"): return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock: self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock: values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}" for labels, value in values]
+
+
+class Gauge(Metric):
+    """A value read when scraped, from read()."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, read: Callable[[], float]):
+        super().__init__(name, help_text)
+        self.read = read
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name} {_format_value(self.read())}"]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = DURATION_BUCKETS, label_names: Sequence[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last one is +Inf), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str):
+        bucket = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            values = self._values.get(label_values)
+            if values is None: values = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            values[0][bucket] += 1; values[1] += value; values[2] += 1
+
+    def count(self, *label_values: str) -> int:
+        values = self._values.get(label_values)
+        return values[2] if values else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock: series = sorted((labels, (list(v[0]), v[1], v[2])) for labels, v in self._values.items())
+        lines: List[str] = []
+        for labels, (bucket_counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+REGISTRY: List[Metric] = []
+
+def render() -> str:
+    """Every registered metric in the text exposition format."""
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+FUNCTION_DURATION = Histogram("dungeon_function_duration_seconds", "Time spent in instrumented game functions.",
+                              label_names=("function",))
+PATH_SEARCH_NODES = Counter("dungeon_path_search_nodes_expanded_total", "Nodes expanded by path searches.",
+                            label_names=("algorithm",))
+
+def timed(function: F) -> F:
+    """Records each call's duration in FUNCTION_DURATION under the function's name."""
+    name = function.__name__
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try: return function(*args, **kwargs)
+        finally: FUNCTION_DURATION.observe(time.perf_counter() - start, name)
+    return wrapper  # type: ignore[return-value]
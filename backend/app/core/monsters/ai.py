@@ -1,10 +1,9 @@
 # backend/app/core/monsters/ai.py
 from typing import Dict, Any, List, Optional, TYPE_CHECKING, cast
-import random
 import abc
 
 from ..tiles import TILE_FLOOR, TILE_FOG, TILE_DOOR_CLOSED, TILE_DOOR_OPEN 
-from ... import schemas 
+from .. import events
 from ..combat import apply_attack, resolve_monster_attack_on_player
 from .. import config as game_config 
 
@@ -13,15 +12,15 @@ if TYPE_CHECKING:
 
 def _handle_monster_move_on_map_and_responses(
     gs: 'GameState', monster: Dict[str, Any], old_x: int, old_y: int, new_x: int, new_y: int
-) -> List['schemas.ServerResponse']:
-    responses: List['schemas.ServerResponse'] = []
+) -> List['events.TurnResponse']:
+    responses: List['events.TurnResponse'] = []
     
     if gs.map_manager.actual_dungeon_map:
         if 0 <= old_y < len(gs.map_manager.actual_dungeon_map) and 0 <= old_x < len(gs.map_manager.actual_dungeon_map[0]):
             pass # Actual map tile at old_x, old_y does not change when monster moves off
     
-    monster["x"], monster["y"] = new_x, new_y 
-    responses.append(schemas.MonsterMovedServerResponse(monster_id=monster["id"], new_pos=schemas.Position(x=new_x, y=new_y)))
+    gs.entity_manager.move_monster(monster, new_x, new_y)
+    responses.append(events.MonsterMoved(monster["id"], new_x, new_y))
 
     if gs.map_manager.dungeon_map_for_client and \
        0 <= old_y < len(gs.map_manager.dungeon_map_for_client) and \
@@ -33,20 +32,17 @@ def _handle_monster_move_on_map_and_responses(
             underlying_tile_at_old_pos = gs.map_manager.actual_dungeon_map[old_y][old_x]
         
         gs.map_manager.dungeon_map_for_client[old_y][old_x] = underlying_tile_at_old_pos
-        responses.append(schemas.TileChangeServerResponse(
-            pos=schemas.Position(x=old_x, y=old_y), 
-            new_tile_type=underlying_tile_at_old_pos 
-        ))
+        responses.append(events.TileChange(old_x, old_y, underlying_tile_at_old_pos))
     return responses
 
 class MonsterAIBase(abc.ABC):
     @abc.abstractmethod
-    def execute_turn(self, monster: Dict[str, Any], gs: 'GameState') -> List['schemas.ServerResponse']:
+    def execute_turn(self, monster: Dict[str, Any], gs: 'GameState') -> List['events.TurnResponse']:
         pass
 
 class ChaserAI(MonsterAIBase):
-    def execute_turn(self, monster: Dict[str, Any], gs: 'GameState') -> List['schemas.ServerResponse']:
-        responses: List['schemas.ServerResponse'] = []
+    def execute_turn(self, monster: Dict[str, Any], gs: 'GameState') -> List['events.TurnResponse']:
+        responses: List['events.TurnResponse'] = []
         if not gs.player.pos or not gs.map_manager.actual_dungeon_map: return responses
         monster_pos = {"x": monster["x"], "y": monster["y"]}; player_current_pos = gs.player.pos 
         distance_to_player = abs(monster_pos["x"]-player_current_pos["x"]) + abs(monster_pos["y"]-player_current_pos["y"])
@@ -107,14 +103,14 @@ class ChaserAI(MonsterAIBase):
                     monster["last_known_player_pos"]=None; monster["ai_state"]="idle"
             
             elif monster["ai_state"]!="idle": 
-                if random.random() < game_config.AI_RANDOM_MOVE_CHANCE_NO_PATH: 
+                if gs.rng.random() < game_config.AI_RANDOM_MOVE_CHANCE_NO_PATH: 
                     possible_moves=[(monster["x"]+dx,monster["y"]+dy) for dx,dy in [(0,1),(0,-1),(1,0),(-1,0)] if gs._is_walkable_for_entity(monster["x"]+dx,monster["y"]+dy,"monster")]
-                    if possible_moves: next_x,next_y=random.choice(possible_moves)
+                    if possible_moves: next_x,next_y=gs.rng.choice(possible_moves)
         
         if monster["ai_state"]=="idle" and not did_attack_this_turn:
-            if random.random() < monster.get("move_chance", game_config.AI_DEFAULT_IDLE_MOVE_CHANCE):
+            if gs.rng.random() < monster.get("move_chance", game_config.AI_DEFAULT_IDLE_MOVE_CHANCE):
                 possible_moves=[(monster["x"]+dx,monster["y"]+dy) for dx,dy in [(0,1),(0,-1),(1,0),(-1,0)] if gs._is_walkable_for_entity(monster["x"]+dx,monster["y"]+dy,"monster")]
-                if possible_moves: next_x,next_y=random.choice(possible_moves)
+                if possible_moves: next_x,next_y=gs.rng.choice(possible_moves)
 
         if not did_attack_this_turn and (next_x!=monster["x"] or next_y!=monster["y"]):
             if gs._is_walkable_for_entity(next_x,next_y,"monster"):
@@ -122,8 +118,8 @@ class ChaserAI(MonsterAIBase):
         return responses
 
 class RangedAI(MonsterAIBase): 
-    def execute_turn(self, monster: Dict[str, Any], gs: 'GameState') -> List['schemas.ServerResponse']:
-        responses: List['schemas.ServerResponse'] = []
+    def execute_turn(self, monster: Dict[str, Any], gs: 'GameState') -> List['events.TurnResponse']:
+        responses: List['events.TurnResponse'] = []
         if not gs.player.pos or not gs.map_manager.actual_dungeon_map: return responses
         
         monster_pos={"x":monster["x"],"y":monster["y"]}
@@ -209,16 +205,16 @@ class RangedAI(MonsterAIBase):
                     monster["last_known_player_pos"] = None 
                     monster["ai_state"] = "idle"
             elif monster["ai_state"] != "idle": 
-                if random.random() < game_config.AI_RANDOM_MOVE_CHANCE_NO_PATH: 
+                if gs.rng.random() < game_config.AI_RANDOM_MOVE_CHANCE_NO_PATH: 
                     possible_moves=[(monster["x"]+dx,monster["y"]+dy) for dx,dy in [(0,1),(0,-1),(1,0),(-1,0)] if gs._is_walkable_for_entity(monster["x"]+dx,monster["y"]+dy,"monster")]
                     if possible_moves:
-                        next_x,next_y=random.choice(possible_moves)
+                        next_x,next_y=gs.rng.choice(possible_moves)
 
         if monster["ai_state"]=="idle" and not did_attack_this_turn and not action_taken_instead_of_pathing and (next_x == monster_pos["x"] and next_y == monster_pos["y"]):
-            if random.random() < monster.get("move_chance", game_config.AI_DEFAULT_IDLE_MOVE_CHANCE):
+            if gs.rng.random() < monster.get("move_chance", game_config.AI_DEFAULT_IDLE_MOVE_CHANCE):
                 possible_moves=[(monster["x"]+dx,monster["y"]+dy) for dx,dy in [(0,1),(0,-1),(1,0),(-1,0)] if gs._is_walkable_for_entity(monster["x"]+dx,monster["y"]+dy,"monster")]
                 if possible_moves:
-                    next_x,next_y=random.choice(possible_moves)
+                    next_x,next_y=gs.rng.choice(possible_moves)
         
         if not did_attack_this_turn and (next_x != monster_pos["x"] or next_y != monster_pos["y"]):
             if gs._is_walkable_for_entity(next_x, next_y, "monster"): 
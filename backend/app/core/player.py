@@ -3,6 +3,7 @@ import uuid
 from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 from .. import schemas 
+from . import events
 from .items.definitions import ITEM_TEMPLATES, ITEM_TYPE_POTION_HEAL, ITEM_TYPE_WEAPON_DAGGER
 from . import config as game_config
 
@@ -26,6 +27,13 @@ class Player:
             "armor": None,
         }
         self.logger = logger_ref 
+        # create_player_stats_response cache: the last response and the stats/items it was built from.
+        # stats_version counts rebuilds, so it changes exactly when the client-visible stats change.
+        self.stats_version: int = 0
+        self._stats_response: Optional[schemas.PlayerStatsResponse] = None
+        self._stats_response_key: Optional[Tuple[Any, ...]] = None
+        self._item_details: Tuple[List[schemas.InventoryItemDetail], Dict[str, Optional[schemas.InventoryItemDetail]]] = ([], {})
+        self._item_details_key: Optional[Tuple[Any, ...]] = None
 
     def reset_for_new_game(self, start_pos: Dict[str, int]):
         self.pos = start_pos
@@ -95,21 +103,43 @@ class Player:
             slot=item_instance.get("slot"), attack_bonus=item_instance.get("attack_bonus"),
             defense_bonus=item_instance.get("defense_bonus"), effect_value=item_instance.get("effect_value") )
 
+    def _items_key(self) -> Tuple[Any, ...]:
+        """
+        The carried items and their quantities (item instances are only ever mutated through their quantity).
+        The key holds the item dicts themselves, so a cached key can never match a different, later item.
+        """
+        return (tuple((item, item.get("quantity", 1)) for item in self.inventory),
+                tuple(self.equipment.items()))
+
     def create_player_stats_response(self) -> schemas.PlayerStatsResponse:
+        """
+        Returns the stats as sent to the client. The previous response object is returned as long as neither the
+        stats nor the items changed, and the inventory/equipment details are only rebuilt when the items did, so
+        a turn with several monster hits converts the inventory once.
+        """
         effective_stats = self.get_effective_stats()
-        inventory_details = [self._convert_item_to_detail(item) for item in self.inventory]
-        equipment_details = {
-            slot: self._convert_item_to_detail(item) if item else None
-            for slot, item in self.equipment.items()
-        }
-        return schemas.PlayerStatsResponse(
+        items_key = self._items_key()
+        key = (tuple(effective_stats.values()), items_key)
+        if self._stats_response is not None and key == self._stats_response_key:
+            return self._stats_response
+        if items_key != self._item_details_key:
+            self._item_details = (
+                [self._convert_item_to_detail(item) for item in self.inventory],
+                {slot: self._convert_item_to_detail(item) if item else None for slot, item in self.equipment.items()})
+            self._item_details_key = items_key
+        inventory_details, equipment_details = self._item_details
+        # Built from server-side ints and already validated item details, so validation is skipped.
+        self._stats_response = schemas.PlayerStatsResponse.model_construct(
             hp=effective_stats["hp"], max_hp=effective_stats["max_hp"], attack=effective_stats["attack"],
             defense=effective_stats["defense"], level=effective_stats["level"], xp=effective_stats["xp"],
             xp_to_next_level=effective_stats["xp_to_next_level"], inventory=inventory_details,
             equipment=equipment_details )
+        self._stats_response_key = key
+        self.stats_version += 1
+        return self._stats_response
 
-    def grant_xp(self, amount: int) -> Tuple[List[schemas.ServerResponse], bool]:
-        responses: List[schemas.ServerResponse] = []
+    def grant_xp(self, amount: int) -> Tuple[List[events.TurnResponse], bool]:
+        responses: List[events.TurnResponse] = []
         if amount <= 0: return responses, False
         self.xp += amount
         leveled_up_in_this_call = False
@@ -118,8 +148,8 @@ class Player:
         if leveled_up_flag: leveled_up_in_this_call = True
         return responses, leveled_up_in_this_call
 
-    def _check_for_level_up(self) -> Tuple[List[schemas.ServerResponse], bool]:
-        responses: List[schemas.ServerResponse] = []
+    def _check_for_level_up(self) -> Tuple[List[events.TurnResponse], bool]:
+        responses: List[events.TurnResponse] = []
         leveled_up_this_check = False
         while self.xp >= self.xp_to_next_level:
             leveled_up_this_check = True
@@ -132,8 +162,8 @@ class Player:
             level_up_message = (
                 f"LEVEL UP! You reached level {self.level}! Max HP +{game_config.HP_GAIN_PER_LEVEL}, "
                 f"Attack +{game_config.ATK_GAIN_PER_LEVEL}, Defense +{game_config.DEF_GAIN_PER_LEVEL}. You are fully healed." )
-            responses.append(schemas.PlayerLeveledUpServerResponse(new_level=self.level, message=level_up_message))
-            responses.append(schemas.GameMessageServerResponse(text=level_up_message))
+            responses.append(events.PlayerLeveledUp(new_level=self.level, message=level_up_message))
+            responses.append(events.GameMessage(text=level_up_message))
         return responses, leveled_up_this_check
 
     def add_item_to_inventory(self, item_type_key: str) -> Optional[Dict[str, Any]]:
@@ -176,30 +206,30 @@ class Player:
         self.equipment[slot] = item_to_equip
         return True
 
-    def equip_item(self, item_id: str) -> Tuple[List[schemas.ServerResponse], bool]: 
-        responses: List[schemas.ServerResponse] = []
+    def equip_item(self, item_id: str) -> Tuple[List[events.TurnResponse], bool]: 
+        responses: List[events.TurnResponse] = []
         item_to_equip = self.find_item_in_inventory(item_id)
         if not item_to_equip:
-            responses.append(schemas.GameMessageServerResponse(text="Cannot equip: Item not found in inventory."))
+            responses.append(events.GameMessage(text="Cannot equip: Item not found in inventory."))
             return responses, False
         if not item_to_equip.get("equippable", False):
-            responses.append(schemas.GameMessageServerResponse(text=f"You cannot equip the {item_to_equip['type_name']}."))
+            responses.append(events.GameMessage(text=f"You cannot equip the {item_to_equip['type_name']}."))
             return responses, False
         slot = item_to_equip.get("slot")
         if not slot:
-            responses.append(schemas.GameMessageServerResponse(text=f"Cannot equip {item_to_equip['type_name']}: No designated slot."))
+            responses.append(events.GameMessage(text=f"Cannot equip {item_to_equip['type_name']}: No designated slot."))
             return responses, False
         
         currently_equipped_item_in_slot = self.equipment.get(slot)
         if currently_equipped_item_in_slot: 
             self.equipment[slot] = None # Unequip current
             self.inventory.append(currently_equipped_item_in_slot) # Add old item back to inventory
-            responses.append(schemas.GameMessageServerResponse(text=f"You unequip {currently_equipped_item_in_slot['type_name']}."))
+            responses.append(events.GameMessage(text=f"You unequip {currently_equipped_item_in_slot['type_name']}."))
 
         # Now, remove the item_to_equip from inventory before placing in equipment
         if not self.remove_item_from_inventory(item_id): 
             self.logger.error(f"Player: Item {item_id} found but failed to remove for equipping. This should not happen.")
-            responses.append(schemas.GameMessageServerResponse(text=f"Error equipping {item_to_equip['type_name']}: Inventory inconsistency."))
+            responses.append(events.GameMessage(text=f"Error equipping {item_to_equip['type_name']}: Inventory inconsistency."))
             # Revert the unequip of the old item if we failed to remove the new one
             if currently_equipped_item_in_slot:
                  self.inventory.remove(currently_equipped_item_in_slot) # It was optimistically added
@@ -207,19 +237,19 @@ class Player:
             return responses, False
             
         self.equipment[slot] = item_to_equip
-        responses.append(schemas.GameMessageServerResponse(text=f"You equip the {item_to_equip['type_name']}."))
+        responses.append(events.GameMessage(text=f"You equip the {item_to_equip['type_name']}."))
         return responses, True
 
-    def unequip_item(self, slot: str) -> Tuple[List[schemas.ServerResponse], bool]: 
-        responses: List[schemas.ServerResponse] = []
+    def unequip_item(self, slot: str) -> Tuple[List[events.TurnResponse], bool]: 
+        responses: List[events.TurnResponse] = []
         item_to_unequip = self.equipment.get(slot)
         if not item_to_unequip:
-            responses.append(schemas.GameMessageServerResponse(text=f"Nothing to unequip from {slot} slot."))
+            responses.append(events.GameMessage(text=f"Nothing to unequip from {slot} slot."))
             return responses, False
         
         self.equipment[slot] = None
         self.inventory.append(item_to_unequip) # Add the unequipped item to inventory
-        responses.append(schemas.GameMessageServerResponse(text=f"You unequip the {item_to_unequip['type_name']}."))
+        responses.append(events.GameMessage(text=f"You unequip the {item_to_unequip['type_name']}."))
         return responses, True
 
     def take_damage(self, amount: int) -> bool: 
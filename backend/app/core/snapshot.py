@@ -0,0 +1,292 @@
+# backend/app/core/snapshot.py
+"""
+Versioned binary snapshot of a GameState (GameState.snapshot() / GameState.restore()).
+
+    b"DGSS" <B version, then a zlib-compressed body of fixed-layout sections (little-endian):
+      state     flags, seed, next level seed and depth, dungeon level, client id; when either seed does not fit
+                in 64 bits both follow as MessagePack decimal strings
+      map       <HH width, height; actual and client tile grids as raw bytes; ever-revealed, visible and
+                pending-reveal tiles as bitsets
+      rooms     <HHHHHB rows (x1, y1, width, height, id, doors made), then visited room indices
+      items     <B16sH rows (template, uuid, quantity); inventory and equipment refer to rows by index
+      player    position and stats
+      monsters  <B16sHHhBBhhH rows (template tile, uuid, x, y, hp, ai state, flags, last known player
+                position, turns since seen)
+      rng       the Mersenne Twister state, so a restored game plays on exactly as the original would
+
+Items and monsters that differ from what their template plus row would rebuild (renamed ids, extra keys)
+are stored whole as MessagePack instead, so restore is always exact. Caches and per-connection options are
+not stored: they are rebuilt, or set by the connection that restores the game.
+"""
+import random
+import struct
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
+
+import msgpack
+
+from .tile_grid import TileBitset, TileGrid
+from .dungeon_generator import Room
+from .monsters.definitions import MONSTER_TEMPLATES
+from .items.definitions import ITEM_TEMPLATES
+from .level_pool import LevelSpec
+from . import config as game_config
+
+if TYPE_CHECKING:
+    from .game_state import GameState
+
+SNAPSHOT_MAGIC = b"DGSS"
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct("<4sB")
+_STATE = struct.Struct("<BqqiiH")
+_DIMENSIONS = struct.Struct("<HH")
+_COUNT = struct.Struct("<H")
+_INDEX = struct.Struct("<h")
+_BLOB_LENGTH = struct.Struct("<I")
+_ROOM = struct.Struct("<HHHHHB")
+_ITEM = struct.Struct("<B16sH")
+_PLAYER = struct.Struct("<hhiiiiiii")
+_MONSTER = struct.Struct("<B16sHHhBBhhH")
+_RNG = struct.Struct("<625IBd")
+
+_STATE_GAME_OVER, _STATE_HAS_SEED, _STATE_HAS_NEXT_LEVEL, _STATE_CLIENT_VIEW_SYNCED, _STATE_HAS_MAP = 1, 2, 4, 8, 16
+_STATE_WIDE_SEEDS = 32
+_INT64_MIN, _INT64_MAX = -2**63, 2**63 - 1
+_MONSTER_REVEALED, _MONSTER_HAS_LKP, _MONSTER_HAS_TURNS_SINCE_SEEN = 1, 2, 4
+_AI_STATES = (None, "idle", "chasing", "searching_lkp", "engaging")
+_AI_STATE_CODES = {state: code for code, state in enumerate(_AI_STATES)}
+_ITEM_TYPES = tuple(sorted(ITEM_TEMPLATES))
+_ITEM_TYPE_CODES = {type_key: code for code, type_key in enumerate(_ITEM_TYPES)}
+_WHOLE_RECORD = 255 # template code marking a row stored whole as MessagePack
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+class _Writer:
+    __slots__ = ("parts",)
+
+    def __init__(self): self.parts: List[bytes] = []
+    def pack(self, fmt: struct.Struct, *values): self.parts.append(fmt.pack(*values))
+    def raw(self, data: bytes): self.parts.append(data)
+    def blob(self, value: Any):
+        data = msgpack.packb(value)
+        self.parts.append(_BLOB_LENGTH.pack(len(data))); self.parts.append(data)
+
+
+class _Reader:
+    __slots__ = ("data", "offset")
+
+    def __init__(self, data: bytes): self.data = data; self.offset = 0
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.data, self.offset); self.offset += fmt.size
+        return values
+    def raw(self, size: int) -> bytes:
+        chunk = self.data[self.offset:self.offset + size]; self.offset += size
+        return chunk
+    def blob(self) -> Any:
+        (size,) = self.unpack(_BLOB_LENGTH)
+        return msgpack.unpackb(self.raw(size), strict_map_key=False)
+
+
+def _uuid_bytes(value: Any) -> Optional[bytes]:
+    """The 16 bytes of a canonical (lowercase, hyphenated) uuid string, or None when value is not one."""
+    if type(value) is not str or len(value) != 36: return None
+    try: id_bytes = bytes.fromhex(value.replace("-", ""))
+    except ValueError: return None
+    return id_bytes if len(id_bytes) == 16 and _uuid_str(id_bytes) == value else None
+
+def _uuid_str(id_bytes: bytes) -> str:
+    # Same text as str(uuid.UUID(bytes=id_bytes)), without building the UUID.
+    h = id_bytes.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+# --- Items ---
+
+def _item_row(item: Dict[str, Any]) -> Optional[Tuple[int, bytes, int]]:
+    type_code = _ITEM_TYPE_CODES.get(item.get("type_key")); id_bytes = _uuid_bytes(item.get("id"))
+    if type_code is None or id_bytes is None or not 0 <= item.get("quantity", -1) <= 0xFFFF: return None
+    row = (type_code, id_bytes, item["quantity"])
+    return row if _item_from_row(*row, item_id=item["id"]) == item else None
+
+def _item_from_row(type_code: int, id_bytes: bytes, quantity: int, item_id: Optional[str] = None) -> Dict[str, Any]:
+    type_key = _ITEM_TYPES[type_code]
+    return {**ITEM_TEMPLATES[type_key], "id": item_id or _uuid_str(id_bytes), "type_key": type_key, "quantity": quantity}
+
+def _write_items(out: _Writer, gs: 'GameState'):
+    items: List[Dict[str, Any]] = []; index_of: Dict[int, int] = {}
+    def index(item: Optional[Dict[str, Any]]) -> int:
+        if item is None: return -1
+        if id(item) not in index_of: index_of[id(item)] = len(items); items.append(item)
+        return index_of[id(item)]
+    inventory = [index(item) for item in gs.player.inventory]
+    equipment = [(slot.encode(), index(item)) for slot, item in gs.player.equipment.items()]
+    out.pack(_COUNT, len(items))
+    for item in items:
+        row = _item_row(item)
+        if row is not None: out.pack(_ITEM, *row)
+        else: out.pack(_ITEM, _WHOLE_RECORD, bytes(16), 0); out.blob(item)
+    out.pack(_COUNT, len(inventory))
+    for idx in inventory: out.pack(_INDEX, idx)
+    out.pack(_COUNT, len(equipment))
+    for slot, idx in equipment: out.pack(_COUNT, len(slot)); out.raw(slot); out.pack(_INDEX, idx)
+
+def _read_items(src: _Reader, gs: 'GameState'):
+    items = []
+    for _ in range(src.unpack(_COUNT)[0]):
+        row = src.unpack(_ITEM)
+        items.append(src.blob() if row[0] == _WHOLE_RECORD else _item_from_row(*row))
+    gs.player.inventory = [items[src.unpack(_INDEX)[0]] for _ in range(src.unpack(_COUNT)[0])]
+    equipment = {}
+    for _ in range(src.unpack(_COUNT)[0]):
+        slot = src.raw(src.unpack(_COUNT)[0]).decode()
+        idx = src.unpack(_INDEX)[0]
+        equipment[slot] = items[idx] if idx >= 0 else None
+    gs.player.equipment = equipment
+
+
+# --- Monsters ---
+
+def _monster_row(monster: Dict[str, Any], revealed: bool) -> Optional[tuple]:
+    if monster.get("tile_id") not in MONSTER_TEMPLATES or monster.get("ai_state") not in _AI_STATE_CODES: return None
+    id_bytes = _uuid_bytes(monster.get("id"))
+    if id_bytes is None: return None
+    lkp = monster.get("last_known_player_pos")
+    flags = (_MONSTER_REVEALED if revealed else 0) | (_MONSTER_HAS_LKP if lkp else 0) | \
+            (_MONSTER_HAS_TURNS_SINCE_SEEN if "turns_since_player_seen" in monster else 0)
+    try:
+        row = (monster["tile_id"], id_bytes, monster["x"], monster["y"], monster["hp"], _AI_STATE_CODES[monster.get("ai_state")],
+               flags, lkp["x"] if lkp else 0, lkp["y"] if lkp else 0, monster.get("turns_since_player_seen", 0))
+        _MONSTER.pack(*row)
+    except (KeyError, TypeError, struct.error): return None
+    return row if _monster_from_row(*row, monster_id=monster["id"]) == monster else None
+
+def _monster_from_row(tile_id: int, id_bytes: bytes, x: int, y: int, hp: int, ai_state_code: int, flags: int,
+                      lkp_x: int, lkp_y: int, turns_since_seen: int, monster_id: Optional[str] = None) -> Dict[str, Any]:
+    # monster_id: the id id_bytes was taken from, when already known (saves formatting it again)
+    monster = {**MONSTER_TEMPLATES[tile_id], "id": monster_id or _uuid_str(id_bytes), "x": x, "y": y, "hp": hp,
+               "last_known_player_pos": {"x": lkp_x, "y": lkp_y} if flags & _MONSTER_HAS_LKP else None}
+    if ai_state_code: monster["ai_state"] = _AI_STATES[ai_state_code]
+    if flags & _MONSTER_HAS_TURNS_SINCE_SEEN: monster["turns_since_player_seen"] = turns_since_seen
+    return monster
+
+def _write_monsters(out: _Writer, gs: 'GameState'):
+    monsters = gs.entity_manager.get_all_monsters()
+    out.pack(_COUNT, len(monsters))
+    for monster in monsters:
+        revealed = monster.get("id") in gs.revealed_monster_ids
+        row = _monster_row(monster, revealed)
+        if row is not None: out.pack(_MONSTER, *row)
+        else: out.pack(_MONSTER, _WHOLE_RECORD, bytes(16), 0, 0, 0, 0, _MONSTER_REVEALED if revealed else 0, 0, 0, 0); out.blob(monster)
+
+def _read_monsters(src: _Reader, gs: 'GameState'):
+    for _ in range(src.unpack(_COUNT)[0]):
+        row = src.unpack(_MONSTER)
+        monster = src.blob() if row[0] == _WHOLE_RECORD else _monster_from_row(*row)
+        gs.entity_manager.add_monster(monster)
+        if row[6] & _MONSTER_REVEALED: gs.revealed_monster_ids.add(monster["id"])
+
+
+# --- Map ---
+
+def _bitset_bytes(tiles: Union[TileBitset, Set[Tuple[int, int]]], width: int, height: int) -> bytes:
+    """Tile sets are stored as bitsets whatever they are held as in memory."""
+    if not isinstance(tiles, TileBitset) or tiles.width != width or tiles.height != height:
+        tiles = TileBitset(width, height, (pos for pos in tiles if pos[0] < width and pos[1] < height))
+    return bytes(tiles._bits)
+
+def _read_bitset(src: _Reader, width: int, height: int) -> TileBitset:
+    bitset = TileBitset(width, height)
+    bitset._bits[:] = src.raw(len(bitset._bits))
+    return bitset
+
+def _write_map(out: _Writer, gs: 'GameState'):
+    mm = gs.map_manager
+    width, height = mm.actual_dungeon_map.width, mm.actual_dungeon_map.height
+    out.pack(_DIMENSIONS, width, height)
+    out.raw(mm.actual_dungeon_map.cells); out.raw(mm.dungeon_map_for_client.cells)
+    for bitset in (mm.ever_revealed_tiles, mm.visible_tiles, mm._pending_revealed_tiles):
+        out.raw(_bitset_bytes(bitset, width, height))
+    out.pack(_COUNT, len(mm.generated_rooms))
+    for room in mm.generated_rooms: out.pack(_ROOM, room.x1, room.y1, room.width, room.height, int(room.id), room.doors_made)
+    out.pack(_COUNT, len(mm.visited_room_indices))
+    for room_idx in sorted(mm.visited_room_indices): out.pack(_COUNT, room_idx)
+
+def _read_map(src: _Reader, gs: 'GameState'):
+    mm = gs.map_manager
+    width, height = src.unpack(_DIMENSIONS)
+    mm.initialize_maps(TileGrid.from_bytes(width, height, src.raw(width * height)), width, height)
+    mm.dungeon_map_for_client.cells[:] = src.raw(width * height)
+    mm.ever_revealed_tiles = _read_bitset(src, width, height)
+    mm.visible_tiles = set(_read_bitset(src, width, height))
+    mm._pending_revealed_tiles = set(_read_bitset(src, width, height))
+    rooms = []
+    for _ in range(src.unpack(_COUNT)[0]):
+        x1, y1, room_width, room_height, room_id, doors_made = src.unpack(_ROOM)
+        room = Room(x1, y1, room_width, room_height, room_id=str(room_id)); room.doors_made = doors_made
+        rooms.append(room)
+    mm.generated_rooms = rooms # the room lookup is a cache; get_room_at_pos rebuilds it on first use
+    mm.visited_room_indices.update(src.unpack(_COUNT)[0] for _ in range(src.unpack(_COUNT)[0]))
+
+
+# --- GameState ---
+
+def snapshot_game_state(gs: 'GameState') -> bytes:
+    mm = gs.map_manager
+    has_map = mm.actual_dungeon_map is not None and mm.dungeon_map_for_client is not None
+    next_spec = gs._next_level_spec
+    seed, next_seed = gs.seed or 0, next_spec.seed if next_spec else 0
+    # Seeds are any int (the client picks them); ones too wide for the fixed layout are written after the client id.
+    wide_seeds = not (_INT64_MIN <= seed <= _INT64_MAX and _INT64_MIN <= next_seed <= _INT64_MAX)
+    flags = (_STATE_GAME_OVER if gs.game_over else 0) | (_STATE_HAS_SEED if gs.seed is not None else 0) | \
+            (_STATE_HAS_NEXT_LEVEL if next_spec is not None else 0) | \
+            (_STATE_CLIENT_VIEW_SYNCED if mm._client_view_synced else 0) | (_STATE_HAS_MAP if has_map else 0) | \
+            (_STATE_WIDE_SEEDS if wide_seeds else 0)
+    client_id = gs.client_id.encode()
+    out = _Writer()
+    out.pack(_STATE, flags, 0 if wide_seeds else seed, 0 if wide_seeds else next_seed, gs.current_dungeon_level,
+             next_spec.depth if next_spec else 0, len(client_id))
+    out.raw(client_id)
+    if wide_seeds: out.blob([str(seed), str(next_seed)]) # MessagePack ints stop at 64 bits too
+    if has_map: _write_map(out, gs)
+    _write_items(out, gs)
+    player = gs.player; pos = player.pos or {"x": -1, "y": -1}
+    out.pack(_PLAYER, pos["x"], pos["y"], player.hp, player.max_hp, player.attack, player.defense, player.level,
+             player.xp, player.xp_to_next_level)
+    _write_monsters(out, gs)
+    _, mt_state, gauss_next = gs.rng.getstate()
+    out.pack(_RNG, *mt_state, gauss_next is not None, gauss_next or 0.0)
+    return _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION) + zlib.compress(b"".join(out.parts), game_config.SNAPSHOT_COMPRESSION_LEVEL)
+
+def restore_game_state(data: bytes) -> 'GameState':
+    from .game_state import GameState
+    if len(data) < _HEADER.size: raise SnapshotError("Snapshot is truncated.")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC: raise SnapshotError("Not a GameState snapshot.")
+    if version != SNAPSHOT_VERSION: raise SnapshotError(f"Unsupported snapshot version {version} (expected {SNAPSHOT_VERSION}).")
+    try:
+        src = _Reader(zlib.decompress(data[_HEADER.size:]))
+        flags, seed, next_seed, level, next_depth, client_id_size = src.unpack(_STATE)
+        gs = GameState(client_id=src.raw(client_id_size).decode())
+        if flags & _STATE_WIDE_SEEDS: seed, next_seed = (int(value) for value in src.blob())
+        gs.game_over = bool(flags & _STATE_GAME_OVER)
+        gs.seed = seed if flags & _STATE_HAS_SEED else None
+        gs.current_dungeon_level = level
+        gs._next_level_spec = LevelSpec(next_seed, next_depth) if flags & _STATE_HAS_NEXT_LEVEL else None
+        if flags & _STATE_HAS_MAP:
+            _read_map(src, gs)
+            gs.map_manager._client_view_synced = bool(flags & _STATE_CLIENT_VIEW_SYNCED)
+        _read_items(src, gs)
+        x, y, *stats = src.unpack(_PLAYER)
+        player = gs.player
+        player.pos = {"x": x, "y": y} if x >= 0 else None
+        player.hp, player.max_hp, player.attack, player.defense, player.level, player.xp, player.xp_to_next_level = stats
+        _read_monsters(src, gs)
+        *mt_state, has_gauss, gauss_next = src.unpack(_RNG)
+        gs.rng = random.Random(); gs.rng.setstate((3, tuple(mt_state), gauss_next if has_gauss else None))
+    except (zlib.error, struct.error, msgpack.UnpackException, IndexError, KeyError, TypeError, ValueError) as e:
+        raise SnapshotError(f"Corrupt snapshot: {e}") from e
+    return gs
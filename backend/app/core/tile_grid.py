@@ -0,0 +1,217 @@
+# backend/app/core/tile_grid.py
+import re
+import sys
+from typing import Iterable, Iterator, List, Sequence, Tuple, Union
+
+from .tiles import TILE_EMPTY
+
+
+class TileGrid:
+    """
+    Row-major grid of tile ids stored in a single bytearray (one byte per tile).
+
+    Indexing stays compatible with the old List[List[int]] maps: grid[y] returns a writable
+    row view and grid[y][x] reads or writes a tile. grid[x, y] is also accepted. Row views are
+    sliced on demand from one view of the buffer, so a grid costs little more than its tiles.
+    """
+    __slots__ = ("width", "height", "_cells", "_view")
+
+    def __init__(self, width: int, height: int, fill: int = TILE_EMPTY):
+        self.width = width
+        self.height = height
+        self._cells = bytearray([fill]) * (width * height)
+        self._view = memoryview(self._cells)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]]) -> 'TileGrid':
+        height = len(rows)
+        width = len(rows[0]) if height else 0
+        grid = cls(width, height)
+        for y, row in enumerate(rows):
+            grid._cells[y * width:(y + 1) * width] = bytes(row)
+        return grid
+
+    @classmethod
+    def from_bytes(cls, width: int, height: int, data: bytes) -> 'TileGrid':
+        if len(data) != width * height:
+            raise ValueError(f"Expected {width * height} bytes for a {width}x{height} grid, got {len(data)}.")
+        grid = cls(width, height)
+        grid._cells[:] = data
+        return grid
+
+    def __reduce__(self):
+        return (TileGrid.from_bytes, (self.width, self.height, bytes(self._cells)))
+
+    def __sizeof__(self) -> int:
+        # Counts the tile buffer and its view along with the object, so sys.getsizeof() is the real footprint.
+        return object.__sizeof__(self) + sys.getsizeof(self._cells) + sys.getsizeof(self._view)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __iter__(self) -> Iterator[memoryview]:
+        view, width = self._view, self.width
+        return (view[start:start + width] for start in range(0, width * self.height, width))
+
+    def __getitem__(self, key: Union[int, Tuple[int, int]]):
+        if isinstance(key, tuple):
+            x, y = key
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise IndexError(f"Tile ({x}, {y}) is outside the {self.width}x{self.height} grid.")
+            return self._cells[y * self.width + x]
+        if key < 0: key += self.height
+        if not 0 <= key < self.height:
+            raise IndexError(f"Row {key} is outside the {self.width}x{self.height} grid.")
+        start = key * self.width
+        return self._view[start:start + self.width]
+
+    def __setitem__(self, key: Tuple[int, int], tile: int):
+        if not isinstance(key, tuple):
+            raise TypeError("Assign tiles with grid[y][x] = tile or grid[x, y] = tile.")
+        x, y = key
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"Tile ({x}, {y}) is outside the {self.width}x{self.height} grid.")
+        self._cells[y * self.width + x] = tile
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TileGrid):
+            return self.width == other.width and self.height == other.height and self._cells == other._cells
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TileGrid({self.width}x{self.height})"
+
+    @property
+    def cells(self) -> bytearray:
+        """The raw row-major buffer; index with y * width + x."""
+        return self._cells
+
+    def copy(self) -> 'TileGrid':
+        return TileGrid.from_bytes(self.width, self.height, self._cells)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._cells)
+
+    def to_list(self) -> List[List[int]]:
+        return [row.tolist() for row in self]
+
+    def count(self, tile: int) -> int:
+        return self._cells.count(tile)
+
+    def replace(self, old_tile: int, new_tile: int):
+        """Replaces every occurrence of old_tile in one pass over the buffer."""
+        self._cells[:] = self._cells.replace(bytes([old_tile]), bytes([new_tile]))
+
+
+# Bit offsets set in each byte value, used to walk a bitset without testing every bit.
+_BYTE_BIT_OFFSETS: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+_NONZERO_BYTE = re.compile(rb"[^\x00]")
+
+
+class TileBitset:
+    """
+    Set of (x, y) tile positions packed one bit per cell (row-major, little-endian) in a bytearray.
+
+    Holds MapManager.ever_revealed_tiles. Supports add/discard/in/len/iteration (row-major order),
+    plus |, & and - between bitsets of the same size, which run as whole-integer bit operations.
+    """
+    __slots__ = ("width", "height", "_bits")
+
+    def __init__(self, width: int = 0, height: int = 0, positions: Iterable[Tuple[int, int]] = ()):
+        self.width = width
+        self.height = height
+        self._bits = bytearray((width * height + 7) // 8)
+        self.update(positions)
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self._bits)
+
+    @classmethod
+    def _from_int(cls, width: int, height: int, value: int) -> 'TileBitset':
+        bitset = cls(width, height)
+        bitset._bits[:] = value.to_bytes(len(bitset._bits), "little")
+        return bitset
+
+    def __reduce__(self):
+        return (TileBitset._from_int, (self.width, self.height, self.as_int()))
+
+    def _index(self, pos: Tuple[int, int]) -> int:
+        x, y = pos
+        if not (0 <= x < self.width and 0 <= y < self.height): return -1
+        return y * self.width + x
+
+    def as_int(self) -> int:
+        return int.from_bytes(self._bits, "little")
+
+    def add(self, pos: Tuple[int, int]):
+        idx = self._index(pos)
+        if idx < 0:
+            raise IndexError(f"Tile {pos} is outside the {self.width}x{self.height} bitset.")
+        self._bits[idx >> 3] |= 1 << (idx & 7)
+
+    def discard(self, pos: Tuple[int, int]):
+        idx = self._index(pos)
+        if idx >= 0:
+            self._bits[idx >> 3] &= ~(1 << (idx & 7)) & 0xFF
+
+    def update(self, positions: Union['TileBitset', Iterable[Tuple[int, int]]]):
+        if isinstance(positions, TileBitset):
+            self._bits[:] = (self._checked_int(positions) | self.as_int()).to_bytes(len(self._bits), "little")
+            return
+        width, height, bits = self.width, self.height, self._bits
+        for x, y in positions: # add() inlined; this runs for every visible tile each turn
+            if not (0 <= x < width and 0 <= y < height):
+                raise IndexError(f"Tile {(x, y)} is outside the {width}x{height} bitset.")
+            idx = y * width + x
+            bits[idx >> 3] |= 1 << (idx & 7)
+
+    def clear(self):
+        self._bits[:] = bytes(len(self._bits))
+
+    def copy(self) -> 'TileBitset':
+        return TileBitset._from_int(self.width, self.height, self.as_int())
+
+    def __contains__(self, pos) -> bool:
+        idx = self._index(pos)
+        return idx >= 0 and bool(self._bits[idx >> 3] >> (idx & 7) & 1)
+
+    def __len__(self) -> int:
+        return self.as_int().bit_count()
+
+    def __bool__(self) -> bool:
+        return any(self._bits)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        width = self.width
+        bits = bytes(self._bits)
+        for match in _NONZERO_BYTE.finditer(bits): # Skips empty bytes at C speed
+            byte_idx = match.start()
+            base = byte_idx << 3
+            for offset in _BYTE_BIT_OFFSETS[bits[byte_idx]]:
+                y, x = divmod(base + offset, width)
+                yield x, y
+
+    def _checked_int(self, other: 'TileBitset') -> int:
+        if other.width != self.width or other.height != self.height:
+            raise ValueError(f"Bitset sizes differ: {self.width}x{self.height} vs {other.width}x{other.height}.")
+        return other.as_int()
+
+    def __or__(self, other: 'TileBitset') -> 'TileBitset':
+        return TileBitset._from_int(self.width, self.height, self.as_int() | self._checked_int(other))
+
+    def __and__(self, other: 'TileBitset') -> 'TileBitset':
+        return TileBitset._from_int(self.width, self.height, self.as_int() & self._checked_int(other))
+
+    def __sub__(self, other: 'TileBitset') -> 'TileBitset':
+        return TileBitset._from_int(self.width, self.height, self.as_int() & ~self._checked_int(other))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TileBitset):
+            return self.width == other.width and self.height == other.height and self._bits == other._bits
+        if isinstance(other, (set, frozenset)):
+            return len(self) == len(other) and all(pos in self for pos in other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TileBitset({self.width}x{self.height}, {len(self)} set)"
@@ -1,11 +1,24 @@
 # backend/app/main.py
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+import asyncio
 import json
 import logging
-from typing import Any, Dict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Union
 
+from app.core import config as game_config
+from app.core import metrics
 from app.core.game_state import GameState
+from app.core.level_pool import LevelPool
+from app.turn_runner import TURN_RUNNERS, TurnRunner
+from app.session_store import (
+    SESSION_STORES, InMemorySessionStore, SessionStore, SessionTakenOver, SQLiteSessionStore, new_session_token
+)
+from app.session_memory import CLOSE_RESUMED_ELSEWHERE, ActiveGames, SessionReaper, close_connection
+from app.protocol import ConnectionOptions, encode_session_frame, encode_turn_frames
 from app.schemas import (
     ServerResponse, # Import the Union type
     ErrorServerResponse, PlayerMoveClientPayload, GenerateDungeonClientPayload,
@@ -16,7 +29,42 @@ from app.schemas import (
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(name)s - %(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-app = FastAPI(debug=True)
+# Shared per uvicorn worker; replaced by the configured ones for the app's lifetime.
+level_pool: Optional[LevelPool] = None
+turn_runner: TurnRunner = TurnRunner()
+session_store: SessionStore = SESSION_STORES["memory"]()
+active_games = ActiveGames(turn_runner=turn_runner) # games of this worker's open connections
+session_reaper = SessionReaper(active_games, session_store, turn_runner)
+
+RESPONSES_SENT = metrics.Counter("dungeon_responses_sent_total", "Server messages sent, by type.", ("type",))
+BYTES_SENT = metrics.Counter("dungeon_bytes_sent_total", "Bytes of WebSocket frames sent, by frame kind.", ("frame",))
+CONNECTION_BYTES_SENT = metrics.Histogram("dungeon_connection_bytes_sent", "Bytes sent over each /ws/dungeon connection, "
+                                          "observed when it closes.", metrics.BYTES_BUCKETS)
+CONNECTIONS_OPENED = metrics.Counter("dungeon_connections_opened_total", "/ws/dungeon connections accepted.")
+metrics.Gauge("dungeon_active_sessions", "Open /ws/dungeon connections and their games.", lambda: len(active_games))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global level_pool, turn_runner, session_store, session_reaper
+    if game_config.LEVEL_POOL_ENABLED:
+        level_pool = LevelPool(ProcessPoolExecutor(max_workers=game_config.LEVEL_POOL_WORKERS))
+    turn_runner = TURN_RUNNERS[game_config.TURN_EXECUTION]()
+    session_store = SESSION_STORES[game_config.SESSION_STORE]()
+    spill_store = SQLiteSessionStore(game_config.SESSION_SPILL_PATH, lazy=True) if game_config.SESSION_EVICTION == "disk" else None
+    if isinstance(session_store, InMemorySessionStore): session_store.spill = spill_store
+    active_games.spill = spill_store; active_games.turn_runner = turn_runner
+    session_reaper = SessionReaper(active_games, session_store, turn_runner)
+    reaper_task = asyncio.create_task(session_reaper.run())
+    yield
+    reaper_task.cancel()
+    turn_runner.shutdown(); turn_runner = TurnRunner()
+    session_store.close(); session_store = SESSION_STORES["memory"]()
+    active_games.spill = None; active_games.turn_runner = turn_runner
+    if spill_store is not None: spill_store.close()
+    session_reaper = SessionReaper(active_games, session_store, turn_runner)
+    if level_pool is not None: level_pool.shutdown(); level_pool = None
+
+app = FastAPI(debug=True, lifespan=lifespan)
 origins = ["http://localhost:5173", "http://127.0.0.1:5173"]
 app.add_middleware(CORSMiddleware,allow_origins=origins,allow_credentials=True,allow_methods=["*"],allow_headers=["*"])
 
@@ -26,19 +74,160 @@ class ConnectionManager:
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections: self.active_connections.remove(websocket)
 manager = ConnectionManager()
-active_games: dict[WebSocket, GameState] = {}
 
-async def send_responses(websocket: WebSocket, responses: list[ServerResponse]): # Type hint uses imported ServerResponse
-    for response_model in responses:
-        if response_model:
-            await websocket.send_json(response_model.model_dump(mode="json"))
+def attach_connection(gs: GameState, options: ConnectionOptions):
+    """Sets up a game, new, resumed or restored after eviction, for the connection about to play it."""
+    gs.batch_tile_changes = options.batch_tile_changes
+    gs.player_stats_delta = options.stats_delta
+    gs.attach_level_pool(level_pool)
+
+def count_responses(responses: list[ServerResponse]):
+    for response in responses:
+        if response: RESPONSES_SENT.inc(response.type)
+
+async def send_frames(websocket: WebSocket, frames: list[Union[str, bytes]]) -> int:
+    """Sends frames in order; returns the bytes sent."""
+    sent = 0
+    for frame in frames:
+        if isinstance(frame, bytes):
+            await websocket.send_bytes(frame); BYTES_SENT.inc("binary", amount=len(frame)); sent += len(frame)
+        else:
+            await websocket.send_text(frame)
+            # Frames are ASCII JSON except for echoed client text; isascii() is a flag check, not a scan.
+            size = len(frame) if frame.isascii() else len(frame.encode())
+            BYTES_SENT.inc("text", amount=size); sent += size
+    return sent
+
+async def send_responses(websocket: WebSocket, responses: list[ServerResponse], options: Optional[ConnectionOptions] = None) -> int: # Type hint uses imported ServerResponse
+    count_responses(responses)
+    return await send_frames(websocket, encode_turn_frames(responses, options or ConnectionOptions()))
+
+def handle_client_action(gs: GameState, message_dict: Dict[str, Any]) -> list[ServerResponse]:
+    """Validates one client message and applies it to gs; returns the responses of the action."""
+    action = message_dict.get("action")
+    responses_to_send: list[ServerResponse] = [] # Type hint uses imported ServerResponse
+    if action == "generate_dungeon":
+        try:
+            payload = GenerateDungeonClientPayload(**message_dict)
+            seed_to_use = payload.seed
+        except Exception as e_parse:
+            logger.warning(f"Invalid generate_dungeon payload: {message_dict}, error: {e_parse}")
+            responses_to_send.append(ErrorServerResponse(message="Invalid payload for generating dungeon."))
+        else:
+            logger.info(f"Action 'generate_dungeon' for {gs.client_id} with seed: {seed_to_use}")
+            dungeon_response_model = gs.generate_new_dungeon(
+                seed=seed_to_use, width=50, height=30,
+                max_rooms=10, room_min=5, room_max=10
+            )
+            # generate_new_dungeon can return ErrorServerResponse or DungeonDataServerResponse
+            # both are part of the ServerResponse Union
+            if dungeon_response_model: # Ensure it's not None
+                responses_to_send.append(dungeon_response_model)
+    
+    elif action == "player_move":
+        try:
+            payload = PlayerMoveClientPayload(**message_dict)
+            new_pos = payload.new_pos
+        except Exception as e_parse:
+            logger.warning(f"Invalid player_move payload: {message_dict}, error: {e_parse}")
+            responses_to_send.append(ErrorServerResponse(message="Invalid payload for player move."))
+        else:
+            move_responses_list = gs.handle_player_move(new_pos.x, new_pos.y)
+            responses_to_send.extend(move_responses_list)
+    
+    elif action == "use_item":
+        try:
+            payload = UseItemClientPayload(**message_dict)
+        except Exception as e_parse:
+            logger.warning(f"Invalid use_item payload: {message_dict}, error: {e_parse}")
+            responses_to_send.append(ErrorServerResponse(message="Invalid payload for use item."))
+        else:
+            logger.info(f"Action 'use_item' for {gs.client_id}, item_id: {payload.item_id}")
+            item_responses_list = gs.handle_use_item(payload.item_id)
+            responses_to_send.extend(item_responses_list)
+
+    elif action == "equip_item":
+        try:
+            payload = EquipItemClientPayload(**message_dict)
+        except Exception as e_parse:
+            logger.warning(f"Invalid equip_item payload: {message_dict}, error: {e_parse}")
+            responses_to_send.append(ErrorServerResponse(message="Invalid payload for equip item."))
+        else:
+            logger.info(f"Action 'equip_item' for {gs.client_id}, item_id: {payload.item_id}")
+            equip_responses_list = gs.handle_equip_item(payload.item_id)
+            responses_to_send.extend(equip_responses_list)
+    
+    elif action == "unequip_item":
+        try:
+            payload = UnequipItemClientPayload(**message_dict)
+        except Exception as e_parse:
+            logger.warning(f"Invalid unequip_item payload: {message_dict}, error: {e_parse}")
+            responses_to_send.append(ErrorServerResponse(message="Invalid payload for unequip item."))
+        else:
+            logger.info(f"Action 'unequip_item' for {gs.client_id}, slot: {payload.slot}")
+            unequip_responses_list = gs.handle_unequip_item(payload.slot)
+            responses_to_send.extend(unequip_responses_list)
+
+    else:
+        logger.warning(f"Unknown action '{action}' from {gs.client_id}")
+        responses_to_send.append(ErrorServerResponse(message=f"Unknown action: {action}"))
+    return responses_to_send
+
+def play_turn(gs: GameState, message_dict: Dict[str, Any], options: ConnectionOptions,
+              session_token: Optional[str] = None) -> list[Union[str, bytes]]:
+    """One whole turn as the turn runner executes it: the action, encoding its frames and saving the session."""
+    responses = handle_client_action(gs, message_dict)
+    count_responses(responses)
+    frames = encode_turn_frames(responses, options)
+    if session_token is not None: session_store.save(session_token, gs)
+    return frames
+
+async def open_session(requested: Optional[str]) -> tuple[Optional[GameState], Optional[str]]:
+    """
+    Resolves the ?session= parameter: no parameter means no session; "new" or an unknown token starts a new
+    one; a stored token returns its game, unless it expired. Returns (stored game or None, token or None).
+
+    A token another connection still plays (e.g. from a half-open socket) takes the game over from it: that
+    connection is detached first, so it neither plays on nor saves over the game, and then closed.
+    """
+    if requested is None: return None, None
+    if requested != "new":
+        holder = active_games.holder(requested)
+        if holder is not None:
+            held_gs = await active_games.pop(holder.connection)
+            logger.info(f"Session of {holder.client_id} resumed on another connection; closing the old one.")
+            await close_connection(holder, CLOSE_RESUMED_ELSEWHERE, "Session resumed elsewhere")
+            if held_gs is not None: return held_gs, requested
+        stored_gs = await turn_runner.offload(session_store.load, requested)
+        if stored_gs is not None: return stored_gs, requested
+    await turn_runner.offload(session_store.expire) # sessions are only ever added here, so this keeps the store bounded by the TTL
+    return None, new_session_token()
+
+def session_frame(gs: GameState, session_token: str, resumed: bool, options: ConnectionOptions) -> Union[str, bytes]:
+    """The first frame of a session connection. Runs on the turn runner, after any turn of gs still in flight."""
+    resumed_state = None
+    if resumed and gs.map_manager.dungeon_map_for_client:
+        gs._last_sent_player_stats = None # the client starts over from the full state
+        resumed_state = gs.dungeon_data_response()
+    RESPONSES_SENT.inc("session")
+    return encode_session_frame(session_token, resumed, resumed_state, options)
 
 
 @app.websocket("/ws/dungeon")
 async def websocket_dungeon_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
-    game_state_instance = GameState(client_id=f"{websocket.client.host}:{websocket.client.port}")
-    active_games[websocket] = game_state_instance
+    resumed_gs, session_token = await open_session(websocket.query_params.get("session"))
+    game_state_instance = resumed_gs or GameState(client_id=f"{websocket.client.host}:{websocket.client.port}")
+    # Protocol options are opt-in via query parameters so existing clients keep the original message shapes.
+    connection_options = ConnectionOptions.from_query_params(websocket.query_params)
+    attach_connection(game_state_instance, connection_options)
+    active_games.add(websocket, game_state_instance, session_token)
+    CONNECTIONS_OPENED.inc()
+    bytes_sent = 0
+    if session_token is not None:
+        frame = await turn_runner.run(game_state_instance, session_frame, game_state_instance, session_token,
+                                      resumed_gs is not None, connection_options)
+        bytes_sent += await send_frames(websocket, [frame])
 
     try:
         while True:
@@ -47,102 +236,55 @@ async def websocket_dungeon_endpoint(websocket: WebSocket):
                 message_dict: Dict[str, Any] = json.loads(data)
             except json.JSONDecodeError:
                 logger.error(f"Invalid JSON from {game_state_instance.client_id}: {data}")
-                await websocket.send_json(ErrorServerResponse(message="Invalid JSON format.").model_dump(mode="json"))
+                bytes_sent += await send_responses(websocket, [ErrorServerResponse(message="Invalid JSON format.")], connection_options)
                 continue
 
-            action = message_dict.get("action")
-            responses_to_send: list[ServerResponse] = [] # Type hint uses imported ServerResponse
-            current_gs = active_games.get(websocket)
+            current_gs = await active_games.get(websocket)
+            if websocket not in active_games: # its session was resumed on another connection
+                break
 
             if not current_gs:
                 logger.error(f"CRITICAL: No GameState for WS {websocket.client}. Closing.")
                 await websocket.close(code=1011, reason="Internal server error: game state lost")
                 break
+            if current_gs is not game_state_instance: # restored after the session reaper evicted it
+                game_state_instance = current_gs; attach_connection(current_gs, connection_options)
 
-            if action == "generate_dungeon":
-                try:
-                    payload = GenerateDungeonClientPayload(**message_dict)
-                    seed_to_use = payload.seed
-                except Exception as e_parse:
-                    logger.warning(f"Invalid generate_dungeon payload: {message_dict}, error: {e_parse}")
-                    responses_to_send.append(ErrorServerResponse(message="Invalid payload for generating dungeon."))
-                else:
-                    logger.info(f"Action 'generate_dungeon' for {current_gs.client_id} with seed: {seed_to_use}")
-                    dungeon_response_model = current_gs.generate_new_dungeon(
-                        seed=seed_to_use, width=50, height=30,
-                        max_rooms=10, room_min=5, room_max=10
-                    )
-                    # generate_new_dungeon can return ErrorServerResponse or DungeonDataServerResponse
-                    # both are part of the ServerResponse Union
-                    if dungeon_response_model: # Ensure it's not None
-                        responses_to_send.append(dungeon_response_model)
-            
-            elif action == "player_move":
-                try:
-                    payload = PlayerMoveClientPayload(**message_dict)
-                    new_pos = payload.new_pos
-                except Exception as e_parse:
-                    logger.warning(f"Invalid player_move payload: {message_dict}, error: {e_parse}")
-                    responses_to_send.append(ErrorServerResponse(message="Invalid payload for player move."))
-                else:
-                    move_responses_list = current_gs.handle_player_move(new_pos.x, new_pos.y)
-                    responses_to_send.extend(move_responses_list)
-            
-            elif action == "use_item":
-                try:
-                    payload = UseItemClientPayload(**message_dict)
-                except Exception as e_parse:
-                    logger.warning(f"Invalid use_item payload: {message_dict}, error: {e_parse}")
-                    responses_to_send.append(ErrorServerResponse(message="Invalid payload for use item."))
-                else:
-                    logger.info(f"Action 'use_item' for {current_gs.client_id}, item_id: {payload.item_id}")
-                    item_responses_list = current_gs.handle_use_item(payload.item_id)
-                    responses_to_send.extend(item_responses_list)
-
-            elif action == "equip_item":
-                try:
-                    payload = EquipItemClientPayload(**message_dict)
-                except Exception as e_parse:
-                    logger.warning(f"Invalid equip_item payload: {message_dict}, error: {e_parse}")
-                    responses_to_send.append(ErrorServerResponse(message="Invalid payload for equip item."))
-                else:
-                    logger.info(f"Action 'equip_item' for {current_gs.client_id}, item_id: {payload.item_id}")
-                    equip_responses_list = current_gs.handle_equip_item(payload.item_id)
-                    responses_to_send.extend(equip_responses_list)
-            
-            elif action == "unequip_item":
-                try:
-                    payload = UnequipItemClientPayload(**message_dict)
-                except Exception as e_parse:
-                    logger.warning(f"Invalid unequip_item payload: {message_dict}, error: {e_parse}")
-                    responses_to_send.append(ErrorServerResponse(message="Invalid payload for unequip item."))
-                else:
-                    logger.info(f"Action 'unequip_item' for {current_gs.client_id}, slot: {payload.slot}")
-                    unequip_responses_list = current_gs.handle_unequip_item(payload.slot)
-                    responses_to_send.extend(unequip_responses_list)
-
-            else:
-                logger.warning(f"Unknown action '{action}' from {current_gs.client_id}")
-                responses_to_send.append(ErrorServerResponse(message=f"Unknown action: {action}"))
-
-            await send_responses(websocket, responses_to_send)
+            frames = await turn_runner.run(current_gs, play_turn, current_gs, message_dict, connection_options, session_token)
+            if websocket not in active_games: break # resumed elsewhere during the turn; the new connection has it
+            bytes_sent += await send_frames(websocket, frames)
 
     except WebSocketDisconnect:
-        client_id_log = active_games.get(websocket).client_id if websocket in active_games else str(websocket.client)
-        logger.info(f"Client {client_id_log} disconnected.")
+        logger.info(f"Client {game_state_instance.client_id} disconnected.")
+    except SessionTakenOver: # another worker resumed the session; its game is newer than this one
+        logger.info(f"Session of {game_state_instance.client_id} resumed on another worker; closing this connection.")
+        await active_games.pop(websocket, restore=False)
+        try: await websocket.close(code=CLOSE_RESUMED_ELSEWHERE, reason="Session resumed elsewhere")
+        except Exception: pass
     except json.JSONDecodeError:
         logger.error(f"Outer JSONDecodeError (should be rare): {data if 'data' in locals() else 'Unknown'}") # type: ignore
     except Exception as e:
-        client_id_log = active_games.get(websocket).client_id if websocket in active_games else str(websocket.client)
-        logger.error(f"Outer unhandled error for {client_id_log}: {e}", exc_info=True)
-        try: await websocket.send_json(ErrorServerResponse(message="Critical server error.").model_dump(mode="json"))
+        logger.error(f"Outer unhandled error for {game_state_instance.client_id}: {e}", exc_info=True)
+        try: await send_responses(websocket, [ErrorServerResponse(message="Critical server error.")], connection_options)
         except Exception: pass 
     finally:
         if websocket in active_games:
-            client_id_log = active_games[websocket].client_id
-            del active_games[websocket]
-            logger.info(f"Cleaned up GameState for {client_id_log}.")
+            final_gs = await active_games.pop(websocket, restore=session_token is not None)
+            if final_gs is not None:
+                final_gs.discard_prefetched_level() # attach_level_pool prefetches again on resume
+                # Resumable for SESSION_TTL_SECONDS from now.
+                if session_token is not None:
+                    try: await turn_runner.run(final_gs, session_store.save, session_token, final_gs)
+                    except SessionTakenOver: logger.info(f"Session of {game_state_instance.client_id} was resumed on another worker; not saved.")
+            logger.info(f"Cleaned up GameState for {game_state_instance.client_id}.")
+        CONNECTION_BYTES_SENT.observe(bytes_sent)
         manager.disconnect(websocket)
 
 @app.get("/")
-async def read_root(): return {"message": "Roguelike Backend is running."}
\ No newline at end of file
+async def read_root(): return {"message": "Roguelike Backend is running."}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def read_metrics(): return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/sessions/memory")
+async def sessions_memory(): return session_reaper.memory_report()
\ No newline at end of file
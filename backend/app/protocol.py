@@ -0,0 +1,217 @@
+# backend/app/protocol.py
+"""
+Wire-level helpers for the /ws/dungeon protocol. GameState builds a turn as lightweight events
+(core/events.py, plus a few schema models); the functions here reshape a turn's responses for the options
+a connection negotiated and turn them into wire dicts, text or bytes.
+"""
+import base64
+import json
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+import msgpack
+
+from . import schemas
+from .core import config as game_config
+from .core import events
+from .core.events import TurnResponse
+
+# --- Binary wire format (?format=binary) ---
+# Every binary frame starts with a one-byte kind. Integers are little-endian.
+#   FRAME_DUNGEON_DATA: <HH width, height, then width*height map bytes (row-major), then the rest of the
+#                       dungeon_data message (everything but "map") as MessagePack.
+#   FRAME_TILE_CHANGES: a run of <HHB (x, y, tile) records; carries both tile_change and tile_changes.
+#   FRAME_EVENT:        any other response as MessagePack, same keys as its JSON form.
+#   FRAME_TURN:         the turn_result envelope: a run of <I length-prefixed frames of the kinds above.
+# A resumed session's "state" (see encode_session_frame) is a zlib-compressed FRAME_DUNGEON_DATA frame, sent as
+# MessagePack bin inside the FRAME_EVENT session message (in JSON mode: compressed dungeon_data JSON, base64).
+FRAME_DUNGEON_DATA = 1
+FRAME_TILE_CHANGES = 2
+FRAME_EVENT = 3
+FRAME_TURN = 4
+_FRAME_KIND = struct.Struct("<B")
+_MAP_HEADER = struct.Struct("<BHH")
+_TILE_RECORD = struct.Struct("<HHB")
+_FRAME_LENGTH = struct.Struct("<I")
+
+WIRE_FORMATS = ("json", "binary")
+_COMPACT_JSON = (",", ":")
+
+
+@dataclass
+class ConnectionOptions:
+    """Protocol options negotiated once per /ws/dungeon connection from its query parameters."""
+    batch_tile_changes: bool = field(default_factory=lambda: game_config.BATCH_TILE_CHANGES)
+    turn_envelope: bool = field(default_factory=lambda: game_config.TURN_RESULT_ENVELOPE)
+    wire_format: str = field(default_factory=lambda: game_config.WIRE_FORMAT)
+    stats_delta: bool = field(default_factory=lambda: game_config.PLAYER_STATS_DELTA)
+
+    @classmethod
+    def from_query_params(cls, params: Mapping[str, str]) -> 'ConnectionOptions':
+        options = cls()
+        if "tile_changes" in params: options.batch_tile_changes = params["tile_changes"] == "batched"
+        if "envelope" in params: options.turn_envelope = params["envelope"] == "turn_result"
+        if params.get("format") in WIRE_FORMATS: options.wire_format = params["format"]
+        if "stats" in params: options.stats_delta = params["stats"] == "delta"
+        return options
+
+
+def to_wire(response: TurnResponse) -> Dict[str, Any]:
+    """The JSON-mode dict of one response, whether it is an event or a schema model."""
+    if isinstance(response, events.Event): return response.to_wire()
+    return response.model_dump(mode="json")
+
+
+def encode_json(response: TurnResponse) -> str:
+    """One response as compact JSON text; schema models (dungeon_data, error) use Pydantic's own encoder."""
+    if isinstance(response, events.Event): return json.dumps(response.to_wire(), separators=_COMPACT_JSON)
+    return response.model_dump_json()
+
+
+def encode_turn_frames(responses: List[TurnResponse], options: ConnectionOptions) -> List[Union[str, bytes]]:
+    """
+    Serializes one action's responses into the frames to send: a single turn_result frame when the
+    envelope was negotiated, otherwise one frame per response (the original protocol). JSON mode yields
+    text frames, binary mode yields bytes frames.
+    """
+    responses = [response for response in responses if response]
+    if options.wire_format == "binary":
+        frames = [encode_binary_frame(response) for response in responses]
+        if options.turn_envelope:
+            return [_FRAME_KIND.pack(FRAME_TURN) + b"".join(_FRAME_LENGTH.pack(len(frame)) + frame for frame in frames)]
+        return frames
+    messages = [encode_json(response) for response in responses]
+    if options.turn_envelope:
+        return ['{"type":"turn_result","responses":[' + ",".join(messages) + "]}"]
+    return messages
+
+
+def encode_binary_frame(response: TurnResponse) -> bytes:
+    """Encodes one response as a binary frame (see the FRAME_* layout above)."""
+    if isinstance(response, schemas.DungeonDataServerResponse):
+        rows = response.map
+        width, height = (len(rows[0]) if rows else 0), len(rows)
+        rest = response.model_dump(mode="json", exclude={"map"})
+        return _MAP_HEADER.pack(FRAME_DUNGEON_DATA, width, height) + b"".join(map(bytes, rows)) + msgpack.packb(rest)
+    if isinstance(response, events.TileChange):
+        return _FRAME_KIND.pack(FRAME_TILE_CHANGES) + _TILE_RECORD.pack(response.x, response.y, response.new_tile_type)
+    if isinstance(response, events.TileChanges):
+        records = bytearray(_FRAME_KIND.pack(FRAME_TILE_CHANGES))
+        for x, y, tile in decode_tile_changes(response.to_wire()):
+            records += _TILE_RECORD.pack(x, y, tile)
+        return bytes(records)
+    return _FRAME_KIND.pack(FRAME_EVENT) + msgpack.packb(to_wire(response))
+
+
+def encode_session_frame(token: str, resumed: bool, resumed_state: Optional[schemas.DungeonDataServerResponse],
+                         options: ConnectionOptions) -> Union[str, bytes]:
+    """
+    The one frame that opens a session connection: the session message, never enveloped. A resumed game that has
+    a level also sends resumed_state as "state": its full dungeon_data, encoded in the connection's wire format
+    and zlib-compressed, so the client redraws the run from this frame alone.
+    """
+    message: Dict[str, Any] = {"type": "session", "token": token, "resumed": resumed}
+    binary = options.wire_format == "binary"
+    if resumed_state is not None:
+        encoded = encode_binary_frame(resumed_state) if binary else encode_json(resumed_state).encode()
+        state = zlib.compress(encoded, game_config.RESUME_COMPRESSION_LEVEL)
+        message["state"] = state if binary else base64.b64encode(state).decode("ascii")
+    if binary: return _FRAME_KIND.pack(FRAME_EVENT) + msgpack.packb(message)
+    return json.dumps(message, separators=_COMPACT_JSON)
+
+
+def decode_session_state(message: Dict[str, Any]) -> Optional[bytes]:
+    """Reference decoder for a session message: the encoded dungeon_data frame it carries, or None if not resumed."""
+    state = message.get("state")
+    if state is None: return None
+    return zlib.decompress(base64.b64decode(state) if isinstance(state, str) else state)
+
+
+def encode_tile_changes(changes: Dict[int, int], width: int) -> events.TileChanges:
+    """Packs {flat cell index: tile} into a delta-encoded tile_changes message."""
+    cells: List[int] = []; tiles: List[int] = []
+    previous_idx = 0
+    for idx in sorted(changes):
+        cells.append(idx - previous_idx); tiles.append(changes[idx])
+        previous_idx = idx
+    return events.TileChanges(width=width, cells=cells, tiles=tiles)
+
+
+def decode_tile_changes(message: Dict[str, Any]) -> List[Tuple[int, int, int]]:
+    """Reference decoder for a tile_changes message: returns (x, y, tile) in row-major order."""
+    width = message["width"]; idx = 0
+    decoded: List[Tuple[int, int, int]] = []
+    for gap, tile in zip(message["cells"], message["tiles"]):
+        idx += gap
+        y, x = divmod(idx, width)
+        decoded.append((x, y, tile))
+    return decoded
+
+
+# Responses that carry a full snapshot of some state: only the last one of each type in a turn matters.
+_STATE_SNAPSHOT_EVENTS = (events.PlayerStatsUpdate, events.PlayerMoved)
+
+
+def coalesce_state_snapshots(responses: List[TurnResponse]) -> List[TurnResponse]:
+    """
+    Drops player_stats_update and player_moved responses that a later response of the same type in the turn
+    supersedes. The surviving snapshot keeps its position, so the order of everything else is unchanged.
+    """
+    seen: set = set()
+    kept: List[TurnResponse] = []
+    for response in reversed(responses):
+        if isinstance(response, _STATE_SNAPSHOT_EVENTS):
+            if type(response) in seen: continue
+            seen.add(type(response))
+        kept.append(response)
+    kept.reverse()
+    return kept
+
+
+def batch_tile_changes(responses: List[TurnResponse], width: int) -> List[TurnResponse]:
+    """
+    Replaces the tile_change responses of a turn with one tile_changes message, placed where the last
+    tile_change was, so no change reaches the client before the event that caused it (e.g. the tiles a
+    monster uncovers come after its monster_moved). A later change to the same cell wins. Changes made
+    before a dungeon_data response (the player took the stairs) are dropped, since the new level's map
+    replaces them; width must be the width of the map current at the end of the turn.
+    """
+    batched: List[TurnResponse] = []
+    changes: Dict[int, int] = {}
+    slot = -1
+    for response in responses:
+        if isinstance(response, events.TileChange):
+            slot = len(batched)
+            changes[response.y * width + response.x] = response.new_tile_type
+            continue
+        if isinstance(response, schemas.DungeonDataServerResponse):
+            changes = {}; slot = -1
+        batched.append(response)
+    if slot >= 0:
+        batched.insert(slot, encode_tile_changes(changes, width))
+    return batched
+
+
+def stats_updates_as_deltas(responses: List[TurnResponse], last_sent: Optional[Dict[str, Any]]
+                            ) -> Tuple[List[TurnResponse], Optional[Dict[str, Any]]]:
+    """
+    Replaces player_stats_update responses with player_stats_delta messages carrying only the fields that
+    differ from last_sent (the stats dict the client last received); updates that change nothing are
+    dropped. With no baseline yet the full update is kept; a dungeon_data response resets the baseline to the
+    stats it carries. Returns the responses and the new baseline.
+    """
+    converted: List[TurnResponse] = []
+    for response in responses:
+        if not isinstance(response, events.PlayerStatsUpdate):
+            if isinstance(response, schemas.DungeonDataServerResponse): last_sent = response.player_stats.model_dump(mode="json")
+            converted.append(response); continue
+        stats = response.stats.model_dump(mode="json")
+        if last_sent is None:
+            converted.append(response)
+        else:
+            changes = {key: value for key, value in stats.items() if last_sent.get(key) != value}
+            if changes: converted.append(events.PlayerStatsDelta(changes))
+        last_sent = stats
+    return converted, last_sent
@@ -99,11 +99,38 @@ class MonsterAppearedServerResponse(BaseModel):
     type: Literal["monster_appeared"] = "monster_appeared"
     monster_info: MonsterInfoResponse
 
+class TileChangesServerResponse(BaseModel):
+    """
+    All tile changes of one turn. cells holds flat indices (y * width + x) in ascending order,
+    delta-encoded: the first entry is absolute, each later one is the gap from the previous index.
+    tiles[i] is the new tile type for cells[i].
+    """
+    type: Literal["tile_changes"] = "tile_changes"; width: int
+    cells: List[int]; tiles: List[int]
+
+class PlayerStatsDeltaServerResponse(BaseModel):
+    """Only the PlayerStatsResponse fields that changed since the last stats sent (opt-in, ?stats=delta)."""
+    type: Literal["player_stats_delta"] = "player_stats_delta"; changes: Dict[str, Any]
+
+class SessionServerResponse(BaseModel):
+    """
+    First message on a connection that asked for a session (?session=new or ?session=<token>). Reconnecting with
+    the token, to any worker, resumes the game; resumed is true when it did, and state then holds the game's
+    dungeon_data, compressed (protocol.encode_session_frame). JSON mode sends state as base64 text.
+    """
+    type: Literal["session"] = "session"; token: str; resumed: bool; state: Optional[str] = None
+
 # Update the Union type for all possible server responses
 ServerResponse = Union[
     DungeonDataServerResponse, PlayerMovedServerResponse, InvalidMoveServerResponse,
     TileChangeServerResponse, GameMessageServerResponse, PlayerStatsUpdateServerResponse,
     CombatEventServerResponse, EntityDiedServerResponse, PlayerDiedServerResponse,
     MonsterMovedServerResponse, ErrorServerResponse, PlayerLeveledUpServerResponse,
-    MonsterAppearedServerResponse # Added new response type
-]
\ No newline at end of file
+    MonsterAppearedServerResponse, # Added new response type
+    TileChangesServerResponse, PlayerStatsDeltaServerResponse, SessionServerResponse
+]
+
+class TurnResultServerResponse(BaseModel):
+    """Every response of one client action, in order, sent as a single frame (opt-in envelope)."""
+    type: Literal["turn_result"] = "turn_result"
+    responses: List[ServerResponse]
\ No newline at end of file
@@ -0,0 +1,218 @@
+# backend/app/session_memory.py
+"""
+Keeps the memory a worker spends on games bounded. ActiveGames holds the games of open /ws/dungeon connections,
+least recently active first. SessionReaper runs in the background and every SESSION_REAP_INTERVAL_SECONDS:
+
+  - closes connections that sent nothing for SESSION_IDLE_TIMEOUT_SECONDS (session games stay resumable),
+  - expires session-store games past their TTL,
+  - while the games held in memory (open connections' and the session store's resident ones) exceed
+    SESSION_MEMORY_BUDGET_BYTES, evicts the least recently used. With a spill store (SESSION_EVICTION = "disk")
+    the game is snapshotted to disk and comes back on its connection's next message, or when its session
+    resumes; without one it is dropped, and its connection closed.
+
+Games are sized with GameState.memory_usage(). The bookkeeping runs on the event loop; disk work (spill reads and
+writes, expiring stores) runs on the turn runner. A game whose turn is running or queued is neither measured (its
+last size is used) nor evicted, and one being written to or read back from the spill is waited for by get() and pop().
+"""
+import asyncio
+import bisect
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from .core import config as game_config
+from .core import metrics
+from .core.game_state import GameState
+from .session_store import SessionStore, new_session_token
+from .turn_runner import TurnRunner
+
+logger = logging.getLogger(__name__)
+
+# WebSocket close codes (application range) sent to connections the server closes.
+CLOSE_IDLE = 4000
+CLOSE_EVICTED = 4001
+CLOSE_RESUMED_ELSEWHERE = 4002 # another connection resumed the session this one was playing
+
+# Upper bounds of the idle-time histogram in memory_report(); game sizes use metrics.BYTES_BUCKETS.
+IDLE_BUCKETS_SECONDS = (10, 60, 300, 900, 3600)
+
+
+@dataclass
+class ActiveGame:
+    connection: Any # the WebSocket; anything with an async close(code, reason)
+    gs: Optional[GameState] # None while evicted
+    session_token: Optional[str]
+    client_id: str
+    last_active: float # time.monotonic() of the connection's last message
+    size: int = 0 # memory_usage() when last measured
+    spill_key: Optional[str] = None # key of the evicted game in the spill store; None if it was dropped
+    in_transit: Optional[asyncio.Event] = None # set while the game is being spilled or restored; cleared when done
+
+
+class ActiveGames:
+    """Games by connection, least recently active first. Evicted games are restored from spill by get()."""
+    def __init__(self, spill: Optional[SessionStore] = None, turn_runner: Optional[TurnRunner] = None):
+        self.spill = spill
+        self.turn_runner = turn_runner or TurnRunner()
+        self._games: 'OrderedDict[Any, ActiveGame]' = OrderedDict()
+
+    def __contains__(self, connection: Any) -> bool: return connection in self._games
+    def __len__(self) -> int: return len(self._games)
+
+    def add(self, connection: Any, gs: GameState, session_token: Optional[str] = None):
+        self._games[connection] = ActiveGame(connection, gs, session_token, gs.client_id, time.monotonic())
+
+    async def get(self, connection: Any) -> Optional[GameState]:
+        """The connection's game, now most recently used; None if there is none or it was dropped."""
+        entry = self._games.get(connection)
+        if entry is None: return None
+        entry.last_active = time.monotonic()
+        self._games.move_to_end(connection)
+        await self._restore(entry)
+        return entry.gs
+
+    async def pop(self, connection: Any, restore: bool = True) -> Optional[GameState]:
+        """Removes the connection's game and returns it; an evicted game is only read back from disk if restore."""
+        entry = self._games.pop(connection, None)
+        if entry is None: return None
+        if restore: await self._restore(entry)
+        else:
+            await self._settle(entry)
+            if entry.spill_key is not None:
+                spill_key, entry.spill_key = entry.spill_key, None
+                await self.turn_runner.offload(self.spill.delete, spill_key)
+        return entry.gs
+
+    def entries(self) -> List[ActiveGame]:
+        return list(self._games.values())
+
+    def holder(self, session_token: str) -> Optional[ActiveGame]:
+        """The entry of the open connection playing session_token, if there is one."""
+        return next((entry for entry in self._games.values() if entry.session_token == session_token), None)
+
+    async def evict(self, entry: ActiveGame):
+        """Moves entry's game to the spill store, or drops it when there is none. The caller checked it is idle."""
+        await self._settle(entry)
+        gs = entry.gs
+        if gs is None: return
+        gs.discard_prefetched_level()
+        if self.spill is not None:
+            spill_key = new_session_token()
+            # Marked before the write is handed off, so get() waits for it instead of playing on the game.
+            async with self._transit(entry):
+                await self.turn_runner.run(gs, self.spill.save, spill_key, gs)
+            entry.spill_key = spill_key
+        entry.gs = None; entry.size = 0
+
+    async def _restore(self, entry: ActiveGame):
+        await self._settle(entry)
+        if entry.gs is not None or entry.spill_key is None: return
+        async with self._transit(entry):
+            entry.gs = await self.turn_runner.offload(self._unspill, entry.spill_key)
+        entry.spill_key = None
+
+    def _unspill(self, spill_key: str) -> Optional[GameState]:
+        gs = self.spill.load(spill_key)
+        self.spill.delete(spill_key)
+        return gs
+
+    @staticmethod
+    async def _settle(entry: ActiveGame):
+        """Waits until no spill write or read of entry's game is in flight."""
+        while entry.in_transit is not None: await entry.in_transit.wait()
+
+    @staticmethod
+    @contextlib.asynccontextmanager
+    async def _transit(entry: ActiveGame):
+        entry.in_transit = done = asyncio.Event()
+        try: yield
+        finally: entry.in_transit = None; done.set()
+
+
+class SessionReaper:
+    def __init__(self, active_games: ActiveGames, session_store: SessionStore, turn_runner: TurnRunner,
+                 idle_timeout: float = game_config.SESSION_IDLE_TIMEOUT_SECONDS,
+                 memory_budget: int = game_config.SESSION_MEMORY_BUDGET_BYTES):
+        self.active_games = active_games
+        self.session_store = session_store
+        self.turn_runner = turn_runner
+        self.idle_timeout = idle_timeout
+        self.memory_budget = memory_budget
+
+    async def run(self, interval: float = game_config.SESSION_REAP_INTERVAL_SECONDS):
+        while True:
+            await asyncio.sleep(interval)
+            try: await self.reap()
+            except Exception as e: logger.error(f"Session reaper failed: {e}", exc_info=True)
+
+    async def reap(self):
+        now = time.monotonic()
+        for entry in self.active_games.entries():
+            if now - entry.last_active > self.idle_timeout:
+                logger.info(f"Closing idle connection of {entry.client_id}.")
+                await self._close(entry, CLOSE_IDLE, "Idle timeout")
+        await self.turn_runner.offload(self.session_store.expire)
+        if self.active_games.spill is not None: await self.turn_runner.offload(self.active_games.spill.expire)
+        await self.enforce_budget()
+
+    async def enforce_budget(self):
+        """Evicts least recently used games until the games in memory fit the budget."""
+        candidates = self._resident(time.monotonic())
+        total = sum(size for _, size, _, _ in candidates)
+        if total <= self.memory_budget: return
+        candidates.sort(key=lambda candidate: candidate[0])
+        for _, size, owner, _ in candidates:
+            if total <= self.memory_budget: break
+            if isinstance(owner, ActiveGame):
+                if owner.gs is None or owner.in_transit is not None or self.turn_runner.busy(owner.gs): continue
+                gs = owner.gs
+                await self.active_games.evict(owner)
+                if owner.session_token is not None: self.session_store.release(owner.session_token, gs)
+                logger.info(f"Evicted the game of {owner.client_id} ({size} bytes).")
+                if owner.spill_key is None: await self._close(owner, CLOSE_EVICTED, "Game evicted")
+            elif not await self.turn_runner.offload(self.session_store.evict, owner): continue
+            total -= size
+
+    def memory_report(self) -> Dict[str, Any]:
+        """
+        Aggregate bytes of the games in memory, for sizing hosts: totals, and how many games fall under each size
+        and idle-time bound (cumulative, like the le buckets of /metrics histograms). Nothing identifies a client.
+        """
+        now = time.monotonic()
+        resident = self._resident(now)
+        sizes = [size for _, size, _, _ in resident]
+        return {"budget_bytes": self.memory_budget, "total_bytes": sum(sizes), "sessions": len(resident),
+                "connected": sum(isinstance(owner, ActiveGame) for _, _, owner, _ in resident),
+                "sessions_by_bytes": _histogram(sizes, metrics.BYTES_BUCKETS),
+                "sessions_by_idle_seconds": _histogram([now - last_active for last_active, _, _, _ in resident], IDLE_BUCKETS_SECONDS)}
+
+    def _resident(self, now: float) -> list:
+        """(last used, bytes, owner, client id) per game in memory; owner is an ActiveGame or a session-store token."""
+        resident = []; seen = set()
+        for entry in self.active_games.entries():
+            if entry.gs is None: continue
+            if not self.turn_runner.busy(entry.gs): entry.size = entry.gs.memory_usage()
+            resident.append((entry.last_active, entry.size, entry, entry.client_id)); seen.add(id(entry.gs))
+        for token, gs, saved_at in self.session_store.resident():
+            if id(gs) in seen: continue # the store's copy of an open connection's game
+            resident.append((saved_at, gs.memory_usage(), token, gs.client_id))
+        return resident
+
+    async def _close(self, entry: ActiveGame, code: int, reason: str):
+        await close_connection(entry, code, reason)
+
+
+def _histogram(values: List[float], buckets: Sequence[float]) -> Dict[str, int]:
+    values = sorted(values)
+    counts = {str(bound): bisect.bisect_right(values, bound) for bound in buckets}
+    counts["+Inf"] = len(values)
+    return counts
+
+
+async def close_connection(entry: ActiveGame, code: int, reason: str):
+    """Closes entry's connection; one that is already gone is only logged."""
+    try: await entry.connection.close(code=code, reason=reason)
+    except Exception as e: logger.warning(f"Could not close the connection of {entry.client_id}: {e}")
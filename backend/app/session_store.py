@@ -0,0 +1,213 @@
+# backend/app/session_store.py
+"""
+Where games live between connections. A /ws/dungeon client that asks for a session gets a token, and its
+GameState is saved to the configured SessionStore after every turn; reconnecting with the token loads it back.
+With a store shared between processes (SQLite on a local disk), that works on any uvicorn worker and across
+restarts, so a host can run one worker per core. Shared stores hold GameState snapshots (core/snapshot.py).
+A session belongs to the worker that last loaded (or first saved) it: resuming on another worker takes it over,
+and the old worker's next save raises SessionTakenOver instead of overwriting the newer game.
+
+A session can be resumed for SESSION_TTL_SECONDS after it was last saved (every turn, and on disconnect), so a
+client that drops off keeps its run through a reconnect instead of generating a new dungeon.
+"""
+import abc
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .core import config as game_config
+from .core.game_state import GameState
+
+
+class SessionTakenOver(Exception):
+    """Raised by save() when another worker has loaded the session since this one did."""
+    pass
+
+
+def new_session_token() -> str:
+    return secrets.token_urlsafe(18)
+
+
+def encode_game_state(gs: GameState) -> bytes:
+    return gs.snapshot()
+
+
+def decode_game_state(data: bytes) -> GameState:
+    return GameState.restore(data)
+
+
+class SessionStore(abc.ABC):
+    """Games by session token. Methods may be called from turn-runner threads."""
+    @abc.abstractmethod
+    def load(self, token: str) -> Optional[GameState]:
+        pass
+
+    @abc.abstractmethod
+    def save(self, token: str, gs: GameState):
+        """Stores gs under token; raises SessionTakenOver if a store in another worker now owns the session."""
+        pass
+
+    @abc.abstractmethod
+    def delete(self, token: str):
+        pass
+
+    def expire(self) -> int:
+        """Drops sessions not saved within the TTL; returns how many were dropped."""
+        return 0
+
+    def resident(self) -> List[Tuple[str, GameState, float]]:
+        """(token, game, time.monotonic() of its last save) for games this store keeps in memory, oldest first."""
+        return []
+
+    def evict(self, token: str) -> bool:
+        """Takes a resident game out of memory (to the store's spill, if it has one); returns whether it was resident."""
+        return False
+
+    def release(self, token: str, gs: GameState):
+        """Forgets the resident game of token if it is gs: its open connection evicted it and saves it again later."""
+        pass
+
+    def close(self):
+        pass
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Keeps the GameState objects themselves, so resume works within this worker process only. An LRU by save
+    time: games not saved for ttl seconds expire, and past max_sessions the least recently saved is evicted.
+    Evicted games go to spill (a store on disk) and are loaded back from it on resume; with no spill they are lost.
+    """
+    def __init__(self, ttl: float = game_config.SESSION_TTL_SECONDS, max_sessions: int = game_config.SESSION_MEMORY_MAX_SESSIONS,
+                 spill: Optional[SessionStore] = None):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.spill = spill
+        self._games: 'OrderedDict[str, Tuple[GameState, float]]' = OrderedDict() # token -> (game, saved at), oldest first
+        self._spilled: 'OrderedDict[str, float]' = OrderedDict() # token -> when it was spilled, oldest first
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int: return len(self._games)
+
+    def load(self, token: str) -> Optional[GameState]:
+        with self._lock:
+            entry = self._games.get(token)
+            if entry is not None:
+                if time.monotonic() - entry[1] <= self.ttl: return entry[0]
+                del self._games[token]
+            if token not in self._spilled: return None
+            del self._spilled[token]
+        gs = self.spill.load(token)
+        self.spill.delete(token)
+        if gs is not None: self.save(token, gs)
+        return gs
+
+    def save(self, token: str, gs: GameState):
+        with self._lock:
+            self._games[token] = (gs, time.monotonic())
+            self._games.move_to_end(token)
+            stale_spill = self._spilled.pop(token, None) is not None
+            while len(self._games) > self.max_sessions: self._evict_locked(next(iter(self._games)))
+        if stale_spill: self.spill.delete(token)
+
+    def delete(self, token: str):
+        with self._lock:
+            self._games.pop(token, None)
+            spilled = self._spilled.pop(token, None) is not None
+        if spilled: self.spill.delete(token)
+
+    def expire(self) -> int:
+        deadline = time.monotonic() - self.ttl; dropped = 0
+        with self._lock:
+            while self._games and next(iter(self._games.values()))[1] < deadline:
+                self._games.popitem(last=False); dropped += 1
+            while self._spilled and next(iter(self._spilled.values())) < deadline: self._spilled.popitem(last=False)
+        if self.spill is not None: self.spill.expire()
+        return dropped
+
+    def resident(self) -> List[Tuple[str, GameState, float]]:
+        with self._lock: return [(token, gs, saved_at) for token, (gs, saved_at) in self._games.items()]
+
+    def evict(self, token: str) -> bool:
+        with self._lock:
+            if token not in self._games: return False
+            self._evict_locked(token)
+            return True
+
+    def release(self, token: str, gs: GameState):
+        with self._lock:
+            if token in self._games and self._games[token][0] is gs: del self._games[token]
+
+    def _evict_locked(self, token: str):
+        gs, _ = self._games.pop(token)
+        if self.spill is not None: self.spill.save(token, gs); self._spilled[token] = time.monotonic()
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Encoded games in one SQLite table; every worker process on the host opens the same file. Each row records
+    its owner, the store that last loaded or first saved it: load() claims the session, and save() only
+    overwrites a row this store owns (compare-and-swap in one UPDATE). A lazy store (the eviction spill) creates
+    its file on the first save, so a worker that never evicts leaves nothing on disk.
+    """
+    def __init__(self, path: str = game_config.SESSION_STORE_PATH, ttl: float = game_config.SESSION_TTL_SECONDS,
+                 lazy: bool = False):
+        self.path = path
+        self.ttl = ttl
+        self.owner = new_session_token() # this store's (and so this worker's) id in the owner column
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        if not lazy: self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS sessions (token TEXT PRIMARY KEY, data BLOB NOT NULL, saved_at REAL NOT NULL, owner TEXT)")
+            db.execute("CREATE INDEX IF NOT EXISTS sessions_saved_at ON sessions (saved_at)")
+            if "owner" not in [column[1] for column in db.execute("PRAGMA table_info(sessions)")]: # a file from before owners
+                db.execute("ALTER TABLE sessions ADD COLUMN owner TEXT")
+            self._db = db
+        return self._db
+
+    def __len__(self) -> int:
+        with self._lock: return self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] if self._db else 0
+
+    def load(self, token: str) -> Optional[GameState]:
+        with self._lock:
+            if self._db is None: return None
+            rows = self._db.execute("UPDATE sessions SET owner = ? WHERE token = ? AND saved_at >= ? RETURNING data",
+                                    (self.owner, token, time.time() - self.ttl)).fetchall() # fetched in full, so the UPDATE completes
+        return decode_game_state(rows[0][0]) if rows else None
+
+    def save(self, token: str, gs: GameState):
+        data = encode_game_state(gs)
+        with self._lock:
+            db = self._open(); now = time.time()
+            if db.execute("UPDATE sessions SET data = ?, saved_at = ?, owner = ? WHERE token = ? AND (owner = ? OR owner IS NULL)",
+                          (data, now, self.owner, token, self.owner)).rowcount: return
+            if not db.execute("INSERT OR IGNORE INTO sessions (token, data, saved_at, owner) VALUES (?, ?, ?, ?)",
+                              (token, data, now, self.owner)).rowcount:
+                raise SessionTakenOver(token)
+
+    def delete(self, token: str):
+        with self._lock:
+            if self._db is not None: self._db.execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+    def expire(self) -> int:
+        with self._lock:
+            if self._db is None: return 0
+            return self._db.execute("DELETE FROM sessions WHERE saved_at < ?", (time.time() - self.ttl,)).rowcount
+
+    def close(self):
+        with self._lock:
+            if self._db is not None: self._db.close(); self._db = None
+
+
+SESSION_STORES: Dict[str, Callable[[], SessionStore]] = {
+    "memory": InMemorySessionStore,
+    "sqlite": SQLiteSessionStore,
+}
@@ -0,0 +1,223 @@
+# backend/app/simulation.py
+"""
+Headless batch simulation: plays whole games against GameState from seeds, with a scripted or random
+player policy and no FastAPI or wire encoding, and aggregates balance and throughput stats.
+
+Each game is repeatable by (seed, policy): the policy draws from its own random.Random(seed) and the
+dungeon is generated from the seed. Batches fan the games out over a process pool, one game per task,
+so results do not depend on the worker count.
+
+    python -m app.simulation --games 1000 --policy descend --workers 8
+"""
+import abc
+import argparse
+import logging
+import os
+import random
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .core import config as game_config
+from .core import events
+from .core.game_state import GameState
+from .core.tiles import TILE_DOOR_CLOSED, TILE_STAIRS_DOWN
+
+SIMULATION_CLIENT_ID = "simulation"  # one shared logger name, however many games a worker plays
+_STEPS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+# A policy's next action: ("move", (x, y)) or ("use_item", item_id).
+Action = Tuple[str, object]
+
+
+@dataclass
+class GameResult:
+    seed: int
+    policy: str
+    turns: int
+    depth: int               # deepest dungeon level reached
+    died: bool
+    player_level: int
+    monsters_killed: int
+    damage_taken: int
+    elapsed: float = field(default=0.0, compare=False)
+
+
+@dataclass
+class BatchReport:
+    results: List[GameResult]
+    wall_time: float
+    workers: int
+
+    @property
+    def total_turns(self) -> int: return sum(r.turns for r in self.results)
+
+    @property
+    def turns_per_second(self) -> float: return self.total_turns / self.wall_time if self.wall_time else 0.0
+
+    @property
+    def death_depths(self) -> Counter: return Counter(r.depth for r in self.results if r.died)
+
+    def summary(self) -> Dict[str, float]:
+        games = len(self.results) or 1
+        return {
+            "games": len(self.results), "workers": self.workers, "wall_time_s": round(self.wall_time, 3),
+            "turns_per_second": round(self.turns_per_second, 1),
+            "death_rate": sum(r.died for r in self.results) / games,
+            "mean_depth": statistics.fmean(r.depth for r in self.results) if self.results else 0.0,
+            "max_depth": max((r.depth for r in self.results), default=0),
+            "mean_turns": self.total_turns / games,
+            "mean_player_level": statistics.fmean(r.player_level for r in self.results) if self.results else 0.0,
+            "mean_kills": sum(r.monsters_killed for r in self.results) / games,
+        }
+
+
+# --- Policies ---
+
+def _step_targets(gs: GameState) -> List[Tuple[int, int]]:
+    """Adjacent tiles a move can act on: walkable tiles, closed doors and monsters to attack."""
+    px, py = gs.player.pos["x"], gs.player.pos["y"]
+    game_map = gs.map_manager.actual_dungeon_map
+    targets = []
+    for dx, dy in _STEPS:
+        x, y = px + dx, py + dy
+        if not (0 <= y < len(game_map) and 0 <= x < len(game_map[0])): continue
+        if gs.entity_manager.get_monster_at(x, y) or game_map[y][x] == TILE_DOOR_CLOSED or gs._is_walkable_for_entity(x, y, "player"):
+            targets.append((x, y))
+    return targets
+
+
+class SimulationPolicy(abc.ABC):
+    """Plays the player's side of one game; a new instance is made per game with that game's RNG."""
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+
+    @abc.abstractmethod
+    def next_action(self, gs: GameState) -> Action:
+        pass
+
+
+class RandomPolicy(SimulationPolicy):
+    """Moves to (or attacks) a random adjacent target."""
+    def next_action(self, gs: GameState) -> Action:
+        targets = _step_targets(gs)
+        return ("move", self.rng.choice(targets) if targets else (gs.player.pos["x"], gs.player.pos["y"]))
+
+
+class DescendPolicy(RandomPolicy):
+    """
+    Scripted diver: drinks a potion below config.SIMULATION_HEAL_FRACTION of max HP, fights adjacent monsters,
+    otherwise walks downhill on a distance field toward the stairs (full map knowledge, rebuilt when the level
+    or its doors change), stepping randomly when the way is blocked.
+    """
+    def __init__(self, rng: random.Random):
+        super().__init__(rng)
+        self._field: Optional[List[int]] = None
+        self._field_key: Optional[Tuple[int, int]] = None
+
+    def _stairs_field(self, gs: GameState) -> Optional[List[int]]:
+        key = (gs.current_dungeon_level, gs.map_manager.terrain_version)
+        if key != self._field_key:
+            stairs = _find_stairs(gs)
+            self._field = gs.map_manager.build_distance_field({"x": stairs[0], "y": stairs[1]}, "player") if stairs else None
+            self._field_key = key
+        return self._field
+
+    def next_action(self, gs: GameState) -> Action:
+        stats = gs.player.get_effective_stats()
+        if stats["hp"] < stats["max_hp"] * game_config.SIMULATION_HEAL_FRACTION:
+            potion = next((item for item in gs.player.inventory if item.get("effect_id") == "heal"), None)
+            if potion: return ("use_item", potion["id"])
+        px, py = gs.player.pos["x"], gs.player.pos["y"]
+        for dx, dy in _STEPS:
+            if gs.entity_manager.get_monster_at(px + dx, py + dy): return ("move", (px + dx, py + dy))
+        field = self._stairs_field(gs)
+        if field is not None:
+            path = gs.map_manager.path_down_distance_field(field, gs.player.pos, "player", gs.entity_manager, None)
+            if path and len(path) > 1: return ("move", (path[1]["x"], path[1]["y"]))
+        return super().next_action(gs)
+
+
+def _find_stairs(gs: GameState) -> Optional[Tuple[int, int]]:
+    for y, row in enumerate(gs.map_manager.actual_dungeon_map):
+        for x, tile in enumerate(row):
+            if tile == TILE_STAIRS_DOWN: return x, y
+    return None
+
+
+SIMULATION_POLICIES: Dict[str, type] = {
+    "random": RandomPolicy,
+    "descend": DescendPolicy,
+}
+
+
+# --- Running games ---
+
+def run_game(seed: int, policy: str = "descend", max_turns: int = game_config.SIMULATION_MAX_TURNS) -> GameResult:
+    """Plays one game from seed until the player dies or max_turns player actions have been taken."""
+    player_policy: SimulationPolicy = SIMULATION_POLICIES[policy](random.Random(seed))
+    start = time.perf_counter()
+    gs = GameState(client_id=SIMULATION_CLIENT_ID)
+    gs.coalesce_state_snapshots = False  # nothing is sent, so skip the wire-only stages
+    gs.generate_new_dungeon(seed=seed, is_new_level=False)
+    turns = kills = damage_taken = 0
+    while turns < max_turns and not gs.game_over:
+        action, argument = player_policy.next_action(gs)
+        if action == "use_item": responses = gs.handle_use_item(argument)
+        else: responses = gs.handle_player_move(*argument)
+        for response in responses:
+            if isinstance(response, events.EntityDied): kills += 1
+            elif isinstance(response, events.CombatEvent) and response.defender_faction == "player": damage_taken += response.damage_done
+        turns += 1
+    return GameResult(seed=seed, policy=policy, turns=turns, depth=gs.current_dungeon_level, died=gs.game_over,
+                      player_level=gs.player.level, monsters_killed=kills, damage_taken=damage_taken,
+                      elapsed=time.perf_counter() - start)
+
+
+def _run_game_task(task: Tuple[int, str, int]) -> GameResult:
+    return run_game(*task)
+
+
+def _quiet_worker_logging():
+    logging.getLogger(f"GameState.{SIMULATION_CLIENT_ID}").setLevel(logging.WARNING)
+
+
+def run_batch(seeds: Iterable[int], policy: str = "descend", max_turns: int = game_config.SIMULATION_MAX_TURNS,
+              workers: Optional[int] = None) -> BatchReport:
+    """
+    Runs one game per seed across a process pool (workers=None uses every core; workers=1 runs in-process)
+    and returns the results in seed order.
+    """
+    if policy not in SIMULATION_POLICIES: raise ValueError(f"Unknown simulation policy: {policy}")
+    tasks = [(seed, policy, max_turns) for seed in seeds]
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    if workers == 1:
+        _quiet_worker_logging()
+        results = [_run_game_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_quiet_worker_logging) as pool:
+            results = list(pool.map(_run_game_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    return BatchReport(results=results, wall_time=time.perf_counter() - start, workers=workers)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run headless dungeon games in a process pool.")
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--policy", choices=sorted(SIMULATION_POLICIES), default="descend")
+    parser.add_argument("--max-turns", type=int, default=game_config.SIMULATION_MAX_TURNS)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    report = run_batch(range(args.first_seed, args.first_seed + args.games), args.policy, args.max_turns, args.workers)
+    for key, value in report.summary().items():
+        print(f"{key:<20}{value:>12.3f}" if isinstance(value, float) else f"{key:<20}{value:>12}")
+    print("deaths by depth     " + ", ".join(f"{depth}: {count}" for depth, count in sorted(report.death_depths.items())))
+
+
+if __name__ == "__main__":
+    main()
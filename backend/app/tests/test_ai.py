@@ -9,13 +9,11 @@ from app.core.monsters.definitions import MONSTER_TEMPLATES, TILE_MONSTER_GOBLIN
 from app.core.game_state import GameState 
 from app.core.player import Player 
 from app.core.map_manager import MapManager 
+from app.core.entity_manager import EntityManager
 from app.core.tiles import TILE_FLOOR, TILE_FOG 
 from app.core import config as game_config
-from app.schemas import ( 
-    MonsterMovedServerResponse, CombatEventServerResponse, 
-    PlayerStatsUpdateServerResponse, PlayerDiedServerResponse,
-    PlayerStatsResponse, InventoryItemDetail, Position 
-)
+from app.core import events
+from app.schemas import PlayerStatsResponse, InventoryItemDetail
 
 # --- Mock Client Map Storage ---
 _mock_client_map_storage_for_ai_tests = [[TILE_FOG for _ in range(10)] for _ in range(10)]
@@ -35,6 +33,7 @@ def reset_mock_client_map():
 @pytest.fixture
 def mock_gs() -> MagicMock:
     gs = MagicMock(spec=GameState)
+    gs.rng = random.Random(0)
     gs.player = MagicMock(spec=Player)
     gs.player.pos = {"x": 0, "y": 0} 
     gs.player.hp = game_config.PLAYER_INITIAL_HP
@@ -52,6 +51,7 @@ def mock_gs() -> MagicMock:
     gs.map_manager.dungeon_map_for_client.__getitem__.side_effect = get_mock_row_for_ai_tests
     gs.map_manager.dungeon_map_for_client.__len__.side_effect = lambda: len(_mock_client_map_storage_for_ai_tests)
     gs.map_manager.update_fov = MagicMock(return_value=[]) 
+    gs.entity_manager = EntityManager()
     gs._has_line_of_sight = MagicMock(return_value=False) 
     gs._find_path_bfs = MagicMock(return_value=None)      
     gs._is_walkable_for_entity = MagicMock(return_value=True) 
@@ -99,10 +99,10 @@ def test_chaser_ai_attacks_if_player_adjacent_and_los(mock_gs: MagicMock, chaser
             inventory=[], equipment={"weapon":None, "armor":None}
         )
         mock_resolve_attack.return_value = [
-            CombatEventServerResponse(
+            events.CombatEvent(
                 attacker_id=monster["id"], defender_faction="player", damage_done=2, 
                 defender_hp_current=mock_gs.player.hp-2, defender_hp_max=mock_gs.player.hp, message="Test Attack"
-            ), PlayerStatsUpdateServerResponse(stats=dummy_player_stats_response)
+            ), events.PlayerStatsUpdate(stats=dummy_player_stats_response)
         ]
         responses = ai.execute_turn(monster, mock_gs)
     mock_gs._has_line_of_sight.assert_called_once_with({"x": 1, "y": 0}, {"x": 0, "y": 0})
@@ -111,8 +111,8 @@ def test_chaser_ai_attacks_if_player_adjacent_and_los(mock_gs: MagicMock, chaser
     assert monster["ai_state"] == "chasing" 
     assert monster["last_known_player_pos"] == {"x": 0, "y": 0}
     assert monster["x"] == 1 and monster["y"] == 0 
-    assert any(isinstance(r, CombatEventServerResponse) for r in responses)
-    assert not any(isinstance(r, MonsterMovedServerResponse) for r in responses)
+    assert any(isinstance(r, events.CombatEvent) for r in responses)
+    assert not any(isinstance(r, events.MonsterMoved) for r in responses)
 
 def test_chaser_ai_moves_towards_player_if_los_and_path(mock_gs: MagicMock, chaser_monster_data: dict):
     ai = ChaserAI()
@@ -135,7 +135,7 @@ def test_chaser_ai_moves_towards_player_if_los_and_path(mock_gs: MagicMock, chas
     assert monster["x"] == 1 and monster["y"] == 0 
     assert monster["ai_state"] == "chasing"
     assert monster["last_known_player_pos"] == {"x": 0, "y": 0}
-    assert any(isinstance(r, MonsterMovedServerResponse) for r in responses)
+    assert any(isinstance(r, events.MonsterMoved) for r in responses)
     assert _mock_client_map_storage_for_ai_tests[0][2] == TILE_FLOOR 
 
 def test_chaser_ai_moves_to_lkp_if_no_los(mock_gs: MagicMock, chaser_monster_data: dict):
@@ -157,7 +157,7 @@ def test_chaser_ai_moves_to_lkp_if_no_los(mock_gs: MagicMock, chaser_monster_dat
     assert monster["x"] == 4 and monster["y"] == 5 
     assert monster["ai_state"] == "searching_lkp" 
     assert monster["turns_since_player_seen"] == 2 
-    assert any(isinstance(r, MonsterMovedServerResponse) for r in responses)
+    assert any(isinstance(r, events.MonsterMoved) for r in responses)
 
 def test_chaser_ai_lkp_times_out(mock_gs: MagicMock, chaser_monster_data: dict):
     ai = ChaserAI()
@@ -173,12 +173,12 @@ def test_chaser_ai_lkp_times_out(mock_gs: MagicMock, chaser_monster_data: dict):
     mock_gs._has_line_of_sight.return_value = False
     mock_gs._find_path_bfs.return_value = None 
 
-    with patch('random.random', return_value=1.0): # Ensure no random move if LKP times out
+    with patch.object(mock_gs.rng, 'random', return_value=1.0): # Ensure no random move if LKP times out
         responses = ai.execute_turn(monster, mock_gs)
     assert monster["ai_state"] == "idle" 
     assert monster["last_known_player_pos"] is None 
     assert monster["turns_since_player_seen"] == game_config.MONSTER_LKP_TIMEOUT_TURNS
-    assert not any(isinstance(r, MonsterMovedServerResponse) for r in responses)
+    assert not any(isinstance(r, events.MonsterMoved) for r in responses)
 
 def test_chaser_ai_idle_random_move(mock_gs: MagicMock, chaser_monster_data: dict):
     ai = ChaserAI()
@@ -196,12 +196,12 @@ def test_chaser_ai_idle_random_move(mock_gs: MagicMock, chaser_monster_data: dic
     def custom_is_walkable(x, y, entity_type): return (x == 5 and y == 6)
     mock_gs._is_walkable_for_entity.side_effect = custom_is_walkable
 
-    with patch('random.random', return_value=0.4), \
-         patch('random.choice', return_value=(5,6)) as mock_random_choice: 
+    with patch.object(mock_gs.rng, 'random', return_value=0.4), \
+         patch.object(mock_gs.rng, 'choice', return_value=(5,6)) as mock_random_choice: 
         responses = ai.execute_turn(monster, mock_gs)
     mock_random_choice.assert_called_once_with([(5,6)])
     assert monster["x"] == 5 and monster["y"] == 6 
-    assert any(isinstance(r, MonsterMovedServerResponse) for r in responses)
+    assert any(isinstance(r, events.MonsterMoved) for r in responses)
 
 def test_chaser_ai_idle_no_random_move(mock_gs: MagicMock, chaser_monster_data: dict):
     ai = ChaserAI()
@@ -213,10 +213,10 @@ def test_chaser_ai_idle_no_random_move(mock_gs: MagicMock, chaser_monster_data:
     mock_gs._find_path_bfs.reset_mock()
     mock_gs._has_line_of_sight.return_value = False
     mock_gs._find_path_bfs.return_value = None 
-    with patch('random.random', return_value=0.6): 
+    with patch.object(mock_gs.rng, 'random', return_value=0.6): 
         responses = ai.execute_turn(monster, mock_gs)
     assert monster["x"] == 5 and monster["y"] == 5 
-    assert not any(isinstance(r, MonsterMovedServerResponse) for r in responses)
+    assert not any(isinstance(r, events.MonsterMoved) for r in responses)
 
 def test_chaser_ai_no_path_attempts_random_move(mock_gs: MagicMock, chaser_monster_data: dict):
     ai = ChaserAI()
@@ -230,10 +230,10 @@ def test_chaser_ai_no_path_attempts_random_move(mock_gs: MagicMock, chaser_monst
     mock_gs._has_line_of_sight.return_value = True 
     mock_gs._find_path_bfs.return_value = None 
 
-    with patch('random.random', return_value=0.5): 
+    with patch.object(mock_gs.rng, 'random', return_value=0.5): 
         def specific_random_walkable(x,y,entity_type): return (x,y) in [(3,0),(1,0),(2,1),(2,-1)] and entity_type=="monster"
         mock_gs._is_walkable_for_entity.side_effect = specific_random_walkable
-        with patch('random.choice', return_value=(3,0)) as mock_random_choice:
+        with patch.object(mock_gs.rng, 'choice', return_value=(3,0)) as mock_random_choice:
             global _mock_client_map_storage_for_ai_tests
             _mock_client_map_storage_for_ai_tests[0][2] = TILE_FLOOR 
             responses = ai.execute_turn(monster, mock_gs)
@@ -244,7 +244,7 @@ def test_chaser_ai_no_path_attempts_random_move(mock_gs: MagicMock, chaser_monst
     assert monster["x"] == 3 and monster["y"] == 0 
     assert monster["ai_state"] == "chasing" 
     assert monster["last_known_player_pos"] == {"x": 0, "y": 0}
-    assert any(isinstance(r, MonsterMovedServerResponse) for r in responses)
+    assert any(isinstance(r, events.MonsterMoved) for r in responses)
     assert _mock_client_map_storage_for_ai_tests[0][2] == TILE_FLOOR 
 
 def test_chaser_ai_reaches_lkp_becomes_idle(mock_gs: MagicMock, chaser_monster_data: dict):
@@ -270,7 +270,7 @@ def test_chaser_ai_reaches_lkp_becomes_idle(mock_gs: MagicMock, chaser_monster_d
     _mock_client_map_storage_for_ai_tests[0][1] = TILE_FLOOR 
 
     # Patch random.random to ensure "no path random move" and "idle random move" don't trigger if logic is flawed
-    with patch('random.random', return_value=1.0):
+    with patch.object(mock_gs.rng, 'random', return_value=1.0):
         responses = ai.execute_turn(monster, mock_gs)
 
     assert monster["x"] == 0 and monster["y"] == 0 
@@ -278,9 +278,9 @@ def test_chaser_ai_reaches_lkp_becomes_idle(mock_gs: MagicMock, chaser_monster_d
     assert monster["last_known_player_pos"] is None
     assert monster["turns_since_player_seen"] == 2 
     
-    assert any(isinstance(r, MonsterMovedServerResponse) for r in responses)
-    moved_response = next(r for r in responses if isinstance(r, MonsterMovedServerResponse))
-    assert moved_response.new_pos == Position(x=0, y=0)
+    assert any(isinstance(r, events.MonsterMoved) for r in responses)
+    moved_response = next(r for r in responses if isinstance(r, events.MonsterMoved))
+    assert (moved_response.x, moved_response.y) == (0, 0)
     assert _mock_client_map_storage_for_ai_tests[0][1] == TILE_FLOOR
 
 
@@ -293,13 +293,13 @@ def test_ranged_ai_attacks_if_player_in_los_and_range(mock_gs: MagicMock, ranged
          patch('app.core.monsters.ai.resolve_monster_attack_on_player') as mock_resolve_attack:
         mock_apply_attack.return_value = (1, mock_gs.player.hp-1, False, "Skel shoots")
         dummy_stats = PlayerStatsResponse(hp=mock_gs.player.hp-1,max_hp=mock_gs.player.hp,attack=1,defense=1,level=1,xp=0,xp_to_next_level=100,inventory=[],equipment={})
-        mock_resolve_attack.return_value = [CombatEventServerResponse(attacker_id="id",damage_done=1,defender_hp_current=1,defender_hp_max=1,message=""), PlayerStatsUpdateServerResponse(stats=dummy_stats)]
+        mock_resolve_attack.return_value = [events.CombatEvent(attacker_id="id",damage_done=1,defender_hp_current=1,defender_hp_max=1,message=""), events.PlayerStatsUpdate(stats=dummy_stats)]
         responses = ai.execute_turn(monster,mock_gs)
     mock_gs._has_line_of_sight.assert_called_once_with({"x":3,"y":0},{"x":0,"y":0})
     mock_apply_attack.assert_called_once(); mock_resolve_attack.assert_called_once()
     assert monster["ai_state"]=="engaging"; assert monster["last_known_player_pos"]=={"x":0,"y":0}
-    assert monster["x"]==3 and monster["y"]==0; assert any(isinstance(r,CombatEventServerResponse) for r in responses)
-    assert not any(isinstance(r,MonsterMovedServerResponse) for r in responses)
+    assert monster["x"]==3 and monster["y"]==0; assert any(isinstance(r,events.CombatEvent) for r in responses)
+    assert not any(isinstance(r,events.MonsterMoved) for r in responses)
 
 def test_ranged_ai_moves_closer_if_player_in_los_but_out_of_range(mock_gs: MagicMock, ranged_monster_data: dict):
     ai = RangedAI(); monster = ranged_monster_data
@@ -311,7 +311,7 @@ def test_ranged_ai_moves_closer_if_player_in_los_but_out_of_range(mock_gs: Magic
     responses = ai.execute_turn(monster,mock_gs)
     mock_gs._find_path_bfs.assert_called_with({"x":7,"y":0},{"x":0,"y":0},"monster")
     assert monster["x"]==6 and monster["y"]==0; assert monster["ai_state"]=="engaging"
-    assert any(isinstance(r,MonsterMovedServerResponse) for r in responses)
+    assert any(isinstance(r,events.MonsterMoved) for r in responses)
     assert _mock_client_map_storage_for_ai_tests[0][7] == TILE_FLOOR
 
 def test_ranged_ai_kites_if_player_adjacent_and_los(mock_gs: MagicMock, ranged_monster_data: dict):
@@ -325,7 +325,7 @@ def test_ranged_ai_kites_if_player_adjacent_and_los(mock_gs: MagicMock, ranged_m
     responses = ai.execute_turn(monster,mock_gs)
     mock_gs._find_path_bfs.assert_not_called()
     assert monster["x"]==2 and monster["y"]==0; assert monster["ai_state"]=="engaging"
-    assert any(isinstance(r,MonsterMovedServerResponse) for r in responses)
+    assert any(isinstance(r,events.MonsterMoved) for r in responses)
     assert _mock_client_map_storage_for_ai_tests[0][1]==TILE_FLOOR
 
 def test_ranged_ai_moves_to_lkp_if_no_los(mock_gs: MagicMock, ranged_monster_data: dict):
@@ -338,7 +338,7 @@ def test_ranged_ai_moves_to_lkp_if_no_los(mock_gs: MagicMock, ranged_monster_dat
     responses=ai.execute_turn(monster,mock_gs)
     mock_gs._find_path_bfs.assert_called_with({"x":5,"y":5},{"x":1,"y":1},"monster")
     assert monster["x"]==4 and monster["y"]==5; assert monster["ai_state"]=="searching_lkp"
-    assert monster["turns_since_player_seen"]==2; assert any(isinstance(r,MonsterMovedServerResponse) for r in responses)
+    assert monster["turns_since_player_seen"]==2; assert any(isinstance(r,events.MonsterMoved) for r in responses)
 
 def test_ranged_ai_lkp_times_out_becomes_idle(mock_gs: MagicMock, ranged_monster_data: dict):
     ai=RangedAI(); monster=ranged_monster_data
@@ -348,10 +348,10 @@ def test_ranged_ai_lkp_times_out_becomes_idle(mock_gs: MagicMock, ranged_monster
     mock_gs.player.pos={"x":0,"y":0}
     mock_gs._has_line_of_sight.reset_mock(); mock_gs._has_line_of_sight.return_value=False
     mock_gs._find_path_bfs.reset_mock(); mock_gs._find_path_bfs.return_value=None
-    with patch('random.random',return_value=1.0): responses=ai.execute_turn(monster,mock_gs)
+    with patch.object(mock_gs.rng, 'random',return_value=1.0): responses=ai.execute_turn(monster,mock_gs)
     assert monster["ai_state"]=="idle"; assert monster["last_known_player_pos"] is None
     assert monster["turns_since_player_seen"]==game_config.MONSTER_LKP_TIMEOUT_TURNS
-    assert not any(isinstance(r,MonsterMovedServerResponse) for r in responses)
+    assert not any(isinstance(r,events.MonsterMoved) for r in responses)
 
 def test_ranged_ai_idle_random_move(mock_gs: MagicMock, ranged_monster_data: dict):
     ai=RangedAI(); monster=ranged_monster_data
@@ -362,10 +362,10 @@ def test_ranged_ai_idle_random_move(mock_gs: MagicMock, ranged_monster_data: dic
     mock_gs._is_walkable_for_entity.reset_mock()
     def custom_is_walkable(x,y,entity_type): return(x==5 and y==4)
     mock_gs._is_walkable_for_entity.side_effect=custom_is_walkable
-    with patch('random.random',return_value=0.4), patch('random.choice',return_value=(5,4)) as mrc:
+    with patch.object(mock_gs.rng, 'random',return_value=0.4), patch.object(mock_gs.rng, 'choice',return_value=(5,4)) as mrc:
         responses=ai.execute_turn(monster,mock_gs)
     mrc.assert_called_once_with([(5,4)]); assert monster["x"]==5 and monster["y"]==4
-    assert any(isinstance(r,MonsterMovedServerResponse) for r in responses)
+    assert any(isinstance(r,events.MonsterMoved) for r in responses)
 
 def test_ranged_ai_no_path_to_target_attempts_random_move(mock_gs: MagicMock, ranged_monster_data: dict):
     ai=RangedAI(); monster=ranged_monster_data
@@ -374,16 +374,16 @@ def test_ranged_ai_no_path_to_target_attempts_random_move(mock_gs: MagicMock, ra
     mock_gs._has_line_of_sight.reset_mock(); mock_gs._has_line_of_sight.return_value=True
     mock_gs._find_path_bfs.reset_mock(); mock_gs._find_path_bfs.return_value=None
     mock_gs._is_walkable_for_entity.reset_mock()
-    with patch('random.random',return_value=0.5):
+    with patch.object(mock_gs.rng, 'random',return_value=0.5):
         def srw(x,y,et): return (x,y)==(7,1) and et=="monster"
         mock_gs._is_walkable_for_entity.side_effect=srw
-        with patch('random.choice',return_value=(7,1)) as mrc:
+        with patch.object(mock_gs.rng, 'choice',return_value=(7,1)) as mrc:
             global _mock_client_map_storage_for_ai_tests
             _mock_client_map_storage_for_ai_tests[0][7]=TILE_FLOOR
             responses=ai.execute_turn(monster,mock_gs)
     mock_gs._find_path_bfs.assert_called_with({"x":7,"y":0},{"x":0,"y":0},"monster")
     mrc.assert_called_once_with([(7,1)]); assert monster["x"]==7 and monster["y"]==1
-    assert any(isinstance(r,MonsterMovedServerResponse) for r in responses)
+    assert any(isinstance(r,events.MonsterMoved) for r in responses)
     assert _mock_client_map_storage_for_ai_tests[0][7]==TILE_FLOOR
 
 def test_ranged_ai_reaches_lkp_becomes_idle(mock_gs: MagicMock, ranged_monster_data: dict):
@@ -398,11 +398,11 @@ def test_ranged_ai_reaches_lkp_becomes_idle(mock_gs: MagicMock, ranged_monster_d
     mock_gs._find_path_bfs.reset_mock(); mock_gs._find_path_bfs.return_value = [{"x": 1, "y": 0}, {"x": 0, "y": 0}]
     mock_gs._is_walkable_for_entity.reset_mock(); mock_gs._is_walkable_for_entity.return_value = True
     
-    with patch('random.random', return_value=1.0): # Prevent random moves
+    with patch.object(mock_gs.rng, 'random', return_value=1.0): # Prevent random moves
         responses = ai.execute_turn(monster, mock_gs)
 
     assert monster["x"] == 0 and monster["y"] == 0 
     assert monster["ai_state"] == "idle"
     assert monster["last_known_player_pos"] is None
     assert monster["turns_since_player_seen"] == 3 
-    assert any(isinstance(r, MonsterMovedServerResponse) for r in responses)
\ No newline at end of file
+    assert any(isinstance(r, events.MonsterMoved) for r in responses)
\ No newline at end of file
@@ -4,7 +4,7 @@ import random
 from collections import deque
 from typing import List, Set, Tuple
 
-from app.core.dungeon_generator import DungeonGenerator, Room
+from app.core.dungeon_generator import DungeonGenerator, Room, RoomLookup
 from app.core.tiles import (
     TILE_FLOOR, TILE_WALL, TILE_EMPTY, TILE_DOOR_CLOSED, TILE_DOOR_OPEN,
     TILE_ITEM_POTION, TILE_ITEM_SCROLL_TELEPORT,
@@ -217,4 +217,29 @@ def test_dungeon_generator_wall_integrity_simple(dungeon_generator_instance: Dun
                         is_tiny_isolated_room = True
                 
                 if not is_tiny_isolated_room:
-                     assert adj_tiles_passable > 0, f"Traversable tile at ({x},{y}) value {tile} has no passable non-diagonal neighbors."
\ No newline at end of file
+                     assert adj_tiles_passable > 0, f"Traversable tile at ({x},{y}) value {tile} has no passable non-diagonal neighbors."
+
+def test_room_lookup_matches_linear_scan(dungeon_generator_instance: DungeonGenerator):
+    gen = dungeon_generator_instance
+    gen.generate_dungeon()
+    rooms = gen.rooms + [Room(0, 0, 4, 4), Room(2, 2, 4, 4)] # Overlapping rooms: first one wins
+    lookup = RoomLookup(rooms)
+    for y in range(-1, gen.map_height + 1):
+        for x in range(-1, gen.map_width + 1):
+            expected = next((i for i, room in enumerate(rooms) if room.is_inside(x, y)), None)
+            assert lookup.room_index_at(x, y) == expected
+
+def test_room_lookup_empty():
+    assert RoomLookup([]).room_index_at(0, 0) is None
+
+def test_seeded_generation_leaves_global_random_alone():
+    random.seed(123); expected_next = random.random()
+    random.seed(123)
+    first = DungeonGenerator(40, 30, seed=9)
+    interleaved = DungeonGenerator(40, 30, seed=9)
+    other = DungeonGenerator(40, 30, seed=10)
+    map_a, start_a = first.generate_dungeon(8, 4, 7)
+    other.generate_dungeon(8, 4, 7)
+    map_b, start_b = interleaved.generate_dungeon(8, 4, 7)
+    assert random.random() == expected_next
+    assert start_a == start_b and [list(row) for row in map_a] == [list(row) for row in map_b]
@@ -116,4 +116,67 @@ def test_get_monster_by_id_found(entity_manager: EntityManager):
 def test_get_monster_by_id_not_found(entity_manager: EntityManager):
     monster1_data = create_monster_data("m1", 5, 5)
     entity_manager.add_monster(monster1_data)
-    assert entity_manager.get_monster_by_id("nonexistent_id") is None
\ No newline at end of file
+    assert entity_manager.get_monster_by_id("nonexistent_id") is None
+
+def test_move_monster_updates_position_index(entity_manager: EntityManager):
+    monster1_data = create_monster_data("m1", 5, 5)
+    entity_manager.add_monster(monster1_data)
+
+    entity_manager.move_monster(monster1_data, 6, 5)
+    assert monster1_data["x"] == 6 and monster1_data["y"] == 5
+    assert entity_manager.get_monster_at(5, 5) is None
+    assert entity_manager.get_monster_at(6, 5) is monster1_data
+
+def test_remove_monster_clears_position_index(entity_manager: EntityManager):
+    monster1_data = create_monster_data("m1", 5, 5)
+    entity_manager.add_monster(monster1_data)
+    entity_manager.move_monster(monster1_data, 4, 4)
+
+    assert entity_manager.remove_monster(monster1_data)
+    assert entity_manager.get_monster_at(4, 4) is None
+    assert entity_manager.get_monster_by_id("m1") is None
+
+def test_move_unmanaged_monster_does_not_touch_index(entity_manager: EntityManager):
+    monster1_data = create_monster_data("m1", 5, 5)
+    entity_manager.add_monster(monster1_data)
+    stray = create_monster_data("m1", 5, 5) # Same id, different object
+
+    entity_manager.move_monster(stray, 1, 1)
+    assert stray["x"] == 1
+    assert entity_manager.get_monster_at(5, 5) is monster1_data
+    assert entity_manager.get_monster_at(1, 1) is None
+
+# --- Path cache ---
+
+def _straight_path(length: int):
+    return [{"x": x, "y": 0} for x in range(length)]
+
+def test_cached_path_is_reused_as_monster_advances(entity_manager: EntityManager):
+    target = {"x": 4, "y": 0}
+    entity_manager.store_path("m1", target, 0, _straight_path(5))
+
+    assert entity_manager.get_cached_path("m1", {"x": 0, "y": 0}, target, 0, lambda x, y: True) == _straight_path(5)
+    remaining = entity_manager.get_cached_path("m1", {"x": 1, "y": 0}, target, 0, lambda x, y: True)
+    assert remaining == _straight_path(5)[1:]
+    assert entity_manager.get_cached_path("m1", {"x": 2, "y": 0}, target, 0, lambda x, y: True) == _straight_path(5)[2:]
+    assert (entity_manager.path_cache_hits, entity_manager.path_cache_misses) == (3, 0)
+
+@pytest.mark.parametrize("target, version, start, walkable", [
+    ({"x": 3, "y": 0}, 0, {"x": 0, "y": 0}, True),  # target changed
+    ({"x": 4, "y": 0}, 1, {"x": 0, "y": 0}, True),  # terrain changed (e.g. door opened)
+    ({"x": 4, "y": 0}, 0, {"x": 3, "y": 0}, True),  # monster left the path
+    ({"x": 4, "y": 0}, 0, {"x": 0, "y": 0}, False), # next step blocked
+])
+def test_cached_path_misses_and_is_dropped(entity_manager: EntityManager, target, version, start, walkable):
+    entity_manager.store_path("m1", {"x": 4, "y": 0}, 0, _straight_path(5))
+    assert entity_manager.get_cached_path("m1", start, target, version, lambda x, y: walkable) is None
+    assert entity_manager.path_cache_misses == 1
+    assert entity_manager.get_cached_path("m1", {"x": 0, "y": 0}, {"x": 4, "y": 0}, 0, lambda x, y: True) is None
+
+def test_removing_monster_drops_cached_path(entity_manager: EntityManager):
+    monster1_data = create_monster_data("m1", 0, 0)
+    entity_manager.add_monster(monster1_data)
+    entity_manager.store_path("m1", {"x": 4, "y": 0}, 0, _straight_path(5))
+    entity_manager.remove_monster(monster1_data)
+    entity_manager.add_monster(monster1_data)
+    assert entity_manager.get_cached_path("m1", {"x": 0, "y": 0}, {"x": 4, "y": 0}, 0, lambda x, y: True) is None
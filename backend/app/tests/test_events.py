@@ -0,0 +1,46 @@
+# backend/app/tests/test_events.py
+from dataclasses import dataclass
+import pytest
+
+from app import schemas
+from app.core import events
+
+# Every event paired with the schema model documenting its wire form.
+EVENT_SAMPLES = [
+    (events.PlayerMoved(3, 4), schemas.PlayerMovedServerResponse),
+    (events.InvalidMove("Path blocked.", 3, 4), schemas.InvalidMoveServerResponse),
+    (events.TileChange(5, 6, 8), schemas.TileChangeServerResponse),
+    (events.TileChanges(10, [3, 22], [1, 2]), schemas.TileChangesServerResponse),
+    (events.GameMessage(text="hello"), schemas.GameMessageServerResponse),
+    (events.CombatEvent(damage_done=2, defender_hp_current=5, defender_hp_max=9, message="hit",
+                        attacker_faction="player", defender_id="m1", defender_type="Goblin"), schemas.CombatEventServerResponse),
+    (events.EntityDied(entity_id="m1", entity_type="Goblin", x=1, y=2, message="dies"), schemas.EntityDiedServerResponse),
+    (events.PlayerDied(message="slain"), schemas.PlayerDiedServerResponse),
+    (events.MonsterMoved("m1", 7, 8), schemas.MonsterMovedServerResponse),
+    (events.PlayerLeveledUp(new_level=2, message="up"), schemas.PlayerLeveledUpServerResponse),
+    (events.MonsterAppeared("m1", 7, 8, "Goblin", 4), schemas.MonsterAppearedServerResponse),
+    (events.PlayerStatsDelta({"hp": 3, "inventory": []}), schemas.PlayerStatsDeltaServerResponse),
+]
+
+@pytest.mark.parametrize("event, model", EVENT_SAMPLES, ids=lambda value: getattr(value, "type", None))
+def test_event_wire_form_matches_schema(event, model):
+    wire = event.to_wire()
+    assert wire["type"] == event.type
+    assert model.model_validate(wire).model_dump(mode="json") == wire
+
+def test_player_stats_update_wire_form_matches_schema():
+    stats = schemas.PlayerStatsResponse(hp=5, max_hp=10, attack=2, defense=1, level=1, xp=0, xp_to_next_level=100,
+                                        inventory=[], equipment={"weapon": None, "armor": None})
+    wire = events.PlayerStatsUpdate(stats=stats).to_wire()
+    assert schemas.PlayerStatsUpdateServerResponse.model_validate(wire).model_dump(mode="json") == wire
+
+def test_events_have_no_instance_dict():
+    with pytest.raises(AttributeError):
+        events.TileChange(1, 2, 3).extra = 1
+
+def test_events_must_define_their_wire_form():
+    @dataclass(slots=True)
+    class Incomplete(events.Event):
+        type = "incomplete"
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -11,7 +11,7 @@ from app.core.map_manager import MapManager
 from app.core.entity_manager import EntityManager
 from app.core import config as game_config
 from app.core.tiles import TILE_FLOOR, TILE_WALL, TILE_FOG
-from app.schemas import GameMessageServerResponse, PlayerMovedServerResponse, TileChangeServerResponse, Position
+from app.core import events
 
 # --- Fixtures ---
 
@@ -53,6 +53,7 @@ def mock_entity_manager() -> MagicMock:
 @pytest.fixture
 def mock_game_state(mock_player: MagicMock, mock_map_manager: MagicMock, mock_entity_manager: MagicMock) -> MagicMock:
     gs = MagicMock(spec=GameState)
+    gs.rng = random.Random(0)
     gs.player = mock_player
     gs.map_manager = mock_map_manager
     gs.entity_manager = mock_entity_manager
@@ -87,7 +88,7 @@ def test_apply_heal_effect_heals_player(mock_game_state: MagicMock):
     responses = item_effects.apply_heal_effect(mock_game_state, item_data)
     
     assert player.hp == 15
-    assert any(isinstance(r, GameMessageServerResponse) and f"heal for {heal_amount} HP" in r.text for r in responses)
+    assert any(isinstance(r, events.GameMessage) and f"heal for {heal_amount} HP" in r.text for r in responses)
 
 def test_apply_heal_effect_caps_at_max_hp(mock_game_state: MagicMock):
     player = mock_game_state.player
@@ -98,7 +99,7 @@ def test_apply_heal_effect_caps_at_max_hp(mock_game_state: MagicMock):
     responses = item_effects.apply_heal_effect(mock_game_state, item_data)
     
     assert player.hp == 20 
-    assert any(isinstance(r, GameMessageServerResponse) and "heal for 2 HP" in r.text for r in responses)
+    assert any(isinstance(r, events.GameMessage) and "heal for 2 HP" in r.text for r in responses)
 
 def test_apply_heal_effect_at_max_hp(mock_game_state: MagicMock):
     player = mock_game_state.player
@@ -109,7 +110,7 @@ def test_apply_heal_effect_at_max_hp(mock_game_state: MagicMock):
     responses = item_effects.apply_heal_effect(mock_game_state, item_data)
     
     assert player.hp == 20 
-    assert any(isinstance(r, GameMessageServerResponse) and "health is already full" in r.text for r in responses)
+    assert any(isinstance(r, events.GameMessage) and "health is already full" in r.text for r in responses)
 
 # --- Tests for apply_teleport_random_effect ---
 
@@ -121,8 +122,8 @@ def test_apply_teleport_random_effect_successful(mock_game_state: MagicMock):
     if initial_pos["x"] == 0 and initial_pos["y"] == 0: 
         mock_game_state.map_manager.actual_dungeon_map[0][1] = TILE_FLOOR
 
-    # CRITICAL FIX: Configure the mock update_fov to return a TileChangeServerResponse for this test
-    dummy_tile_change = TileChangeServerResponse(pos=Position(x=0,y=0), new_tile_type=TILE_FLOOR)
+    # CRITICAL FIX: Configure the mock update_fov to return a TileChange event for this test
+    dummy_tile_change = events.TileChange(0, 0, TILE_FLOOR)
     mock_game_state.map_manager.update_fov.return_value = [dummy_tile_change]
     # Also, mock reveal_room_and_connected_corridors if it might be called and needs to return something
     mock_game_state.map_manager.reveal_room_and_connected_corridors.return_value = []
@@ -132,9 +133,9 @@ def test_apply_teleport_random_effect_successful(mock_game_state: MagicMock):
     responses = item_effects.apply_teleport_random_effect(mock_game_state, item_data)
     
     assert player.pos != initial_pos, "Player position should change"
-    assert any(isinstance(r, GameMessageServerResponse) and ("teleports you" in r.text.lower() or "reappearing elsewhere" in r.text.lower()) for r in responses)
-    assert any(isinstance(r, PlayerMovedServerResponse) for r in responses)
-    assert any(isinstance(r, TileChangeServerResponse) for r in responses), "TileChangeServerResponse for FoV not found"
+    assert any(isinstance(r, events.GameMessage) and ("teleports you" in r.text.lower() or "reappearing elsewhere" in r.text.lower()) for r in responses)
+    assert any(isinstance(r, events.PlayerMoved) for r in responses)
+    assert any(isinstance(r, events.TileChange) for r in responses), "TileChange event for FoV not found"
     mock_game_state.map_manager.update_fov.assert_called_once_with(player.pos) # Verify it was called
 
 
@@ -155,8 +156,8 @@ def test_apply_teleport_random_effect_no_valid_locations(mock_game_state: MagicM
     responses = item_effects.apply_teleport_random_effect(mock_game_state, item_data)
     
     assert player.pos == initial_pos, "Player position should not change if teleport fizzles"
-    assert any(isinstance(r, GameMessageServerResponse) and "fizzles" in r.text.lower() for r in responses)
-    assert not any(isinstance(r, PlayerMovedServerResponse) for r in responses), "PlayerMoved should not occur if teleport fizzles"
+    assert any(isinstance(r, events.GameMessage) and "fizzles" in r.text.lower() for r in responses)
+    assert not any(isinstance(r, events.PlayerMoved) for r in responses), "PlayerMoved should not occur if teleport fizzles"
     mock_game_state.map_manager.update_fov.assert_not_called() # FoV update should not happen if teleport fails this way
 
 
@@ -184,7 +185,7 @@ def test_apply_teleport_random_effect_avoids_monsters(mock_game_state: MagicMock
     mock_game_state.entity_manager.get_monster_at = lambda x, y: {"id": "m1"} if x == 0 and y == 1 else None
     
     # Configure update_fov to return a dummy response when called
-    dummy_tile_change = TileChangeServerResponse(pos=Position(x=0,y=0), new_tile_type=TILE_FLOOR)
+    dummy_tile_change = events.TileChange(0, 0, TILE_FLOOR)
     mock_game_state.map_manager.update_fov.return_value = [dummy_tile_change]
 
 
@@ -199,14 +200,14 @@ def test_apply_teleport_random_effect_avoids_monsters(mock_game_state: MagicMock
         
         if player.pos["x"] == 0 and player.pos["y"] == 0: # The only valid non-monster spot
             teleported_successfully_to_valid_spot = True
-            assert any(isinstance(r, PlayerMovedServerResponse) for r in responses)
+            assert any(isinstance(r, events.PlayerMoved) for r in responses)
             mock_game_state.map_manager.update_fov.assert_called_once_with(player.pos)
             break
         
         assert not (player.pos["x"] == 0 and player.pos["y"] == 1), "Player should not teleport onto a monster"
         # If it fizzled (player pos didn't change from (2,2))
         if player.pos["x"] == 2 and player.pos["y"] == 2:
-            assert any(isinstance(r, GameMessageServerResponse) and "fizzles" in r.text.lower() for r in responses)
+            assert any(isinstance(r, events.GameMessage) and "fizzles" in r.text.lower() for r in responses)
             mock_game_state.map_manager.update_fov.assert_not_called()
 
 
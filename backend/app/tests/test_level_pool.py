@@ -0,0 +1,68 @@
+# backend/app/tests/test_level_pool.py
+from concurrent.futures import Future, ProcessPoolExecutor
+import pytest
+
+from app.core.game_state import GameState
+from app.core.level_pool import LevelPool, LevelSpec, build_level
+from app.core.tiles import TILE_STAIRS_DOWN
+
+class _InlineExecutor:
+    """Runs submitted builds immediately and records them."""
+    def __init__(self): self.submitted = []
+    def submit(self, fn, *args):
+        self.submitted.append(args[0]); future = Future(); future.set_result(fn(*args)); return future
+    def shutdown(self, wait=True, cancel_futures=False): pass
+
+def _stairs_position(gs: GameState):
+    level_map = gs.map_manager.actual_dungeon_map
+    return next((x, y) for y, row in enumerate(level_map) for x, tile in enumerate(row) if tile == TILE_STAIRS_DOWN)
+
+def _descend(gs: GameState):
+    return gs._handle_descend_stairs_interaction(*_stairs_position(gs))
+
+def test_build_level_is_deterministic_per_seed():
+    a, b = build_level(LevelSpec(17, 1)), build_level(LevelSpec(17, 1))
+    assert a.start == b.start and a.map.to_list() == b.map.to_list()
+    assert [(m["x"], m["y"], m["type_name"]) for m in a.monsters] == [(m["x"], m["y"], m["type_name"]) for m in b.monsters]
+    assert a.rng.random() == b.rng.random()
+    assert any(TILE_STAIRS_DOWN in row for row in a.map)
+
+def test_pool_hands_each_prefetch_out_once_and_builds_inline_otherwise():
+    executor = _InlineExecutor(); pool = LevelPool(executor)
+    spec = LevelSpec(3, 2)
+    pool.prefetch(spec); pool.prefetch(spec)
+    assert len(pool) == 2
+    first, second, third = pool.take(spec), pool.take(spec), pool.take(spec)
+    assert len(pool) == 0 and len(executor.submitted) == 2
+    assert first is not second and first.map.to_list() == third.map.to_list()
+
+def test_pool_drops_oldest_past_max_pending():
+    pool = LevelPool(_InlineExecutor(), max_pending=2)
+    for seed in range(3): pool.prefetch(LevelSpec(seed, 2))
+    assert len(pool) == 2 and LevelSpec(0, 2) not in pool._pending
+
+def test_descend_with_pool_matches_inline_generation():
+    def play(level_pool):
+        gs = GameState(client_id="pool_test"); gs.level_pool = level_pool
+        gs.generate_new_dungeon(seed=21)
+        _descend(gs)
+        return gs.current_dungeon_level, gs.map_manager.actual_dungeon_map.to_list(), gs.player.pos, gs.rng.random()
+    executor = _InlineExecutor()
+    assert play(LevelPool(executor)) == play(None)
+    assert executor.submitted[0] == LevelSpec(22, 2)
+
+def test_new_game_discards_unused_prefetch():
+    pool = LevelPool(_InlineExecutor())
+    gs = GameState(client_id="pool_test"); gs.level_pool = pool
+    gs.generate_new_dungeon(seed=5); gs.generate_new_dungeon(seed=6)
+    assert len(pool) == 1 and LevelSpec(6 + 1, 2) in pool._pending
+
+def test_levels_build_in_worker_processes():
+    pool = LevelPool(ProcessPoolExecutor(max_workers=1))
+    try:
+        gs = GameState(client_id="pool_test"); gs.level_pool = pool
+        gs.generate_new_dungeon(seed=8)
+        responses, descended = _descend(gs)
+        assert descended and gs.current_dungeon_level == 2
+        assert gs.map_manager.actual_dungeon_map.to_list() == build_level(LevelSpec(9, 2)).map.to_list()
+    finally: pool.shutdown()
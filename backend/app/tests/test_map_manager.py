@@ -8,7 +8,7 @@ from app.core.player import Player
 from app.core.dungeon_generator import Room 
 from app.core.tiles import TILE_FLOOR, TILE_WALL, TILE_DOOR_CLOSED, TILE_DOOR_OPEN, TILE_EMPTY, TILE_FOG, TILE_ITEM_POTION
 from app.core import config as game_config
-from app.schemas import TileChangeServerResponse, Position
+from app.core import events
 
 
 @pytest.fixture
@@ -280,4 +280,250 @@ def test_find_path_bfs_player_can_target_monster_tile_for_attack(map_manager_ins
     entity_manager_instance.add_monster({"id": "target_m", "x": monster_pos["x"], "y": monster_pos["y"], "type_name": "goblin"})
 
     path = map_manager_instance.find_path_bfs(player_start_pos, monster_pos, "player", entity_manager_instance, player_start_pos)
-    assert path is None # Player pathfinding shouldn't path *onto* a monster.
\ No newline at end of file
+    assert path is None # Player pathfinding shouldn't path *onto* a monster.
+
+# --- Tests for incremental update_fov ---
+def _walk_player_and_collect_client_maps(map_manager: MapManager, walk: list) -> list:
+    snapshots = []
+    for pos in walk:
+        map_manager.update_fov(pos)
+        snapshots.append([list(row) for row in map_manager.dungeon_map_for_client])
+    return snapshots
+
+def test_update_fov_incremental_matches_full_rescan(monkeypatch):
+    from app.core.dungeon_generator import DungeonGenerator
+    gen = DungeonGenerator(60, 40, seed=4242)
+    map_data, start = gen.generate_dungeon()
+    walk, (x, y) = [], start
+    for _ in range(40):
+        walk.append({"x": x, "y": y})
+        for dx, dy in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
+            if map_data[y + dy][x + dx] == TILE_FLOOR and {"x": x + dx, "y": y + dy} not in walk:
+                x, y = x + dx, y + dy
+                break
+
+    incremental = MapManager()
+    incremental.initialize_maps([list(row) for row in map_data], 60, 40)
+    monkeypatch.setattr(game_config, "FOV_INCREMENTAL_UPDATES", True)
+    incremental_maps = _walk_player_and_collect_client_maps(incremental, walk)
+
+    full = MapManager()
+    full.initialize_maps([list(row) for row in map_data], 60, 40)
+    monkeypatch.setattr(game_config, "FOV_INCREMENTAL_UPDATES", False)
+    full_maps = _walk_player_and_collect_client_maps(full, walk)
+
+    assert incremental_maps == full_maps
+    assert incremental.ever_revealed_tiles == full.ever_revealed_tiles
+
+def test_update_fov_incremental_only_touches_nearby_tiles(map_manager_instance: MapManager, monkeypatch):
+    monkeypatch.setattr(game_config, "FOV_INCREMENTAL_UPDATES", True)
+    width = 200
+    actual_map = [[TILE_FLOOR for _ in range(width)] for _ in range(3)]
+    map_manager_instance.initialize_maps(actual_map, width, 3)
+    map_manager_instance.update_fov({"x": 10, "y": 1})
+    responses = map_manager_instance.update_fov({"x": 11, "y": 1})
+    radius = game_config.PLAYER_VIEW_RADIUS
+    assert len(responses) > 0
+    for r in responses:
+        assert abs(r.x - 11) <= radius
+        assert r.new_tile_type == TILE_FLOOR
+
+def test_update_fov_incremental_picks_up_room_reveals(map_manager_instance: MapManager, mock_game_state: MagicMock, monkeypatch):
+    monkeypatch.setattr(game_config, "FOV_INCREMENTAL_UPDATES", True)
+    actual_map = [[TILE_FLOOR for _ in range(30)] for _ in range(3)]
+    map_manager_instance.initialize_maps(actual_map, 30, 3)
+    map_manager_instance.update_fov({"x": 1, "y": 1})
+    map_manager_instance.generated_rooms = [Room(x=25, y=0, width=5, height=3)]
+    map_manager_instance.reveal_room_and_connected_corridors(0, mock_game_state)
+    responses = map_manager_instance.update_fov({"x": 1, "y": 1})
+    revealed_positions = {(r.x, r.y) for r in responses}
+    assert {(x, y) for x in range(25, 30) for y in range(3)} <= revealed_positions
+    assert map_manager_instance.dungeon_map_for_client[1][27] == TILE_FLOOR
+
+
+# --- Tests for FoV strategies ---
+from app.core.map_manager import FOV_STRATEGIES
+
+@pytest.mark.parametrize("test_map", [los_map_data, los_map_data_with_door, los_map_data_with_open_door, los_map_clear_diag])
+def test_bresenham_cached_fov_matches_per_tile_rays(map_manager_instance: MapManager, test_map):
+    map_manager_instance.actual_dungeon_map = test_map
+    for y in range(len(test_map)):
+        for x in range(len(test_map[0])):
+            center = {"x": x, "y": y}
+            for radius in (1, 2, 5):
+                assert FOV_STRATEGIES["bresenham_cached"](map_manager_instance, center, radius) == \
+                       FOV_STRATEGIES["bresenham"](map_manager_instance, center, radius)
+
+@pytest.mark.parametrize("strategy_name", sorted(FOV_STRATEGIES))
+def test_fov_strategies_respect_walls_and_doors(map_manager_instance: MapManager, strategy_name: str):
+    strategy = FOV_STRATEGIES[strategy_name]
+    corridor = [[TILE_FLOOR, TILE_FLOOR, TILE_WALL, TILE_FLOOR, TILE_FLOOR]]
+    map_manager_instance.actual_dungeon_map = corridor
+    visible = strategy(map_manager_instance, {"x": 0, "y": 0}, 5)
+    assert (1, 0) in visible and (2, 0) in visible
+    assert (3, 0) not in visible and (4, 0) not in visible
+
+    map_manager_instance.actual_dungeon_map = [[TILE_FLOOR, TILE_DOOR_OPEN, TILE_FLOOR, TILE_DOOR_CLOSED, TILE_FLOOR]]
+    visible = strategy(map_manager_instance, {"x": 0, "y": 0}, 5)
+    assert (2, 0) in visible and (3, 0) in visible
+    assert (4, 0) not in visible
+
+@pytest.mark.parametrize("strategy_name", sorted(FOV_STRATEGIES))
+def test_fov_strategies_respect_radius(map_manager_instance: MapManager, strategy_name: str):
+    map_manager_instance.actual_dungeon_map = [[TILE_FLOOR for _ in range(11)] for _ in range(11)]
+    visible = FOV_STRATEGIES[strategy_name](map_manager_instance, {"x": 5, "y": 5}, 3)
+    assert (5, 5) in visible and (8, 5) in visible and (5, 2) in visible
+    assert (9, 5) not in visible
+    assert (8, 8) not in visible # distance sqrt(18) > 3
+    assert all((x - 5) ** 2 + (y - 5) ** 2 <= 9 for x, y in visible)
+
+
+# --- Tests for find_path_bfs on generated maps ---
+from collections import deque
+from app.core.dungeon_generator import DungeonGenerator
+
+def _reference_distances(map_manager: MapManager, entity_manager: EntityManager, start: tuple) -> dict:
+    dist = {start: 0}; queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in [(0,1),(0,-1),(1,0),(-1,0)]:
+            nxt = (x + dx, y + dy)
+            if nxt not in dist and map_manager.is_walkable_for_entity(nxt[0], nxt[1], "monster", entity_manager, None):
+                dist[nxt] = dist[(x, y)] + 1; queue.append(nxt)
+    return dist
+
+def test_find_path_bfs_returns_shortest_contiguous_paths(map_manager_instance: MapManager, entity_manager_instance: EntityManager):
+    map_data, start = DungeonGenerator(60, 40, seed=99).generate_dungeon(max_rooms=12)
+    map_manager_instance.actual_dungeon_map = map_data
+    distances = _reference_distances(map_manager_instance, entity_manager_instance, start)
+    start_pos = {"x": start[0], "y": start[1]}
+
+    for (tx, ty), expected_steps in list(distances.items())[::37]:
+        path = map_manager_instance.find_path_bfs(start_pos, {"x": tx, "y": ty}, "monster", entity_manager_instance, None)
+        assert path is not None and path[0] is start_pos
+        assert path[-1] == {"x": tx, "y": ty}
+        assert len(path) == expected_steps + 1
+        assert all(abs(a["x"] - b["x"]) + abs(a["y"] - b["y"]) == 1 for a, b in zip(path, path[1:]))
+        assert map_manager_instance.last_search_nodes_expanded >= expected_steps
+
+def test_find_path_monster_can_start_on_its_own_tile(map_manager_instance: MapManager, entity_manager_instance: EntityManager):
+    map_manager_instance.actual_dungeon_map = [[TILE_FLOOR] * 5]
+    entity_manager_instance.add_monster({"id": "walker", "x": 0, "y": 0, "type_name": "goblin"})
+    player_pos = {"x": 4, "y": 0}
+    for search in (map_manager_instance.find_path_bfs, map_manager_instance.find_path_astar):
+        path = search({"x": 0, "y": 0}, player_pos, "monster", entity_manager_instance, player_pos)
+        assert path is not None and path[-1] == player_pos and len(path) == 5
+
+
+# --- Tests for find_path_astar ---
+
+def test_find_path_astar_matches_bfs_lengths_with_fewer_expansions(map_manager_instance: MapManager, entity_manager_instance: EntityManager):
+    map_data, start = DungeonGenerator(80, 60, seed=5).generate_dungeon(max_rooms=20)
+    map_manager_instance.actual_dungeon_map = map_data
+    start_pos = {"x": start[0], "y": start[1]}
+    bfs_expanded = astar_expanded = 0
+    targets = [(x, y) for y in range(1, 60, 7) for x in range(1, 80, 7)]
+
+    for tx, ty in targets:
+        end_pos = {"x": tx, "y": ty}
+        bfs_path = map_manager_instance.find_path_bfs(start_pos, end_pos, "player", entity_manager_instance, None)
+        bfs_expanded += map_manager_instance.last_search_nodes_expanded
+        astar_path = map_manager_instance.find_path_astar(start_pos, end_pos, "player", entity_manager_instance, None)
+        astar_expanded += map_manager_instance.last_search_nodes_expanded
+        assert (bfs_path is None) == (astar_path is None)
+        if astar_path:
+            assert len(astar_path) == len(bfs_path)
+            assert astar_path[0] is start_pos and astar_path[-1] == end_pos
+            assert all(abs(a["x"] - b["x"]) + abs(a["y"] - b["y"]) == 1 for a, b in zip(astar_path, astar_path[1:]))
+    assert astar_expanded < bfs_expanded
+
+def test_find_path_astar_respects_blocking_monsters_and_doors(map_manager_instance: MapManager, entity_manager_instance: EntityManager):
+    map_manager_instance.actual_dungeon_map = [
+        [TILE_FLOOR, TILE_FLOOR, TILE_FLOOR],
+        [TILE_FLOOR, TILE_WALL, TILE_DOOR_CLOSED],
+        [TILE_FLOOR, TILE_FLOOR, TILE_FLOOR],
+    ]
+    entity_manager_instance.add_monster({"id": "blocker", "x": 0, "y": 1, "type_name": "goblin"})
+    start_pos, end_pos = {"x": 0, "y": 0}, {"x": 0, "y": 2}
+    assert map_manager_instance.find_path_astar(start_pos, end_pos, "monster", entity_manager_instance, None) is None
+    player_path = map_manager_instance.find_path_astar(start_pos, end_pos, "player", entity_manager_instance, None)
+    assert player_path is not None and {"x": 2, "y": 1} in player_path
+
+def test_find_path_uses_configured_algorithm(map_manager_instance: MapManager, entity_manager_instance: EntityManager, monkeypatch):
+    from app.core import map_manager as map_manager_module
+    calls = []
+    monkeypatch.setattr(map_manager_module, "PATHFINDING_STRATEGIES", {
+        "bfs": lambda self, *args: calls.append("bfs"), "astar": lambda self, *args: calls.append("astar")})
+    for algorithm in ("astar", "bfs"):
+        monkeypatch.setattr(game_config, "PATHFINDING_ALGORITHM", algorithm)
+        map_manager_instance.find_path({"x": 0, "y": 0}, {"x": 3, "y": 0}, "player", entity_manager_instance, None)
+    assert calls == ["astar", "bfs"]
+
+
+# --- Tests for distance fields ---
+
+def test_build_distance_field_stops_at_walls_and_closed_doors(map_manager_instance: MapManager):
+    map_manager_instance.actual_dungeon_map = [
+        [TILE_FLOOR, TILE_FLOOR, TILE_DOOR_CLOSED, TILE_FLOOR],
+        [TILE_FLOOR, TILE_WALL, TILE_WALL, TILE_FLOOR],
+        [TILE_FLOOR, TILE_FLOOR, TILE_DOOR_OPEN, TILE_FLOOR],
+    ]
+    field = map_manager_instance.build_distance_field({"x": 0, "y": 0})
+    assert field[:4] == [0, 1, -1, 7]
+    assert field[4:8] == [1, -1, -1, 6]
+    assert field[8:] == [2, 3, 4, 5]
+
+def test_path_down_distance_field_matches_bfs_length(map_manager_instance: MapManager, entity_manager_instance: EntityManager):
+    map_data, start = DungeonGenerator(60, 40, seed=31).generate_dungeon(max_rooms=12)
+    map_manager_instance.actual_dungeon_map = map_data
+    player_pos = {"x": start[0], "y": start[1]}
+    field = map_manager_instance.build_distance_field(player_pos)
+    for idx in range(0, len(field), 29):
+        if field[idx] <= 0: continue
+        monster_pos = {"x": idx % 60, "y": idx // 60}
+        path = map_manager_instance.path_down_distance_field(field, monster_pos, "monster", entity_manager_instance, player_pos)
+        bfs_path = map_manager_instance.find_path_bfs(monster_pos, player_pos, "monster", entity_manager_instance, player_pos)
+        assert path is not None and path[0] is monster_pos and path[-1] == player_pos
+        assert len(path) == len(bfs_path) == field[idx] + 1
+
+def test_path_down_distance_field_first_step_avoids_monsters(map_manager_instance: MapManager, entity_manager_instance: EntityManager):
+    map_manager_instance.actual_dungeon_map = [[TILE_FLOOR] * 4]
+    player_pos = {"x": 3, "y": 0}
+    field = map_manager_instance.build_distance_field(player_pos)
+    entity_manager_instance.add_monster({"id": "blocker", "x": 1, "y": 0, "type_name": "goblin"})
+    assert map_manager_instance.path_down_distance_field(field, {"x": 0, "y": 0}, "monster", entity_manager_instance, player_pos) is None
+    assert map_manager_instance.path_down_distance_field(field, {"x": 2, "y": 0}, "monster", entity_manager_instance, player_pos) == [{"x": 2, "y": 0}, player_pos]
+
+def test_distance_field_routes_monsters_around_items(map_manager_instance: MapManager, entity_manager_instance: EntityManager):
+    W, F, P = TILE_WALL, TILE_FLOOR, TILE_ITEM_POTION
+    map_manager_instance.actual_dungeon_map = [
+        [W] * 9,
+        [W, F, F, F, P, F, F, F, W], # the short route is blocked by a potion monsters cannot step on
+        [W, F, W, W, W, W, W, F, W],
+        [W, F, F, F, F, F, F, F, W],
+        [W] * 9,
+    ]
+    player_pos, monster_pos = {"x": 7, "y": 1}, {"x": 1, "y": 1}
+    field = map_manager_instance.build_distance_field(player_pos, "monster")
+    assert field[1 * 9 + 4] == -1
+    path = map_manager_instance.path_down_distance_field(field, monster_pos, "monster", entity_manager_instance, player_pos)
+    assert path == map_manager_instance.find_path_bfs(monster_pos, player_pos, "monster", entity_manager_instance, player_pos)
+    assert path[1] == {"x": 1, "y": 2} and len(path) == 11
+
+
+# --- Tests for get_room_at_pos ---
+
+def test_get_room_at_pos_uses_current_rooms(map_manager_instance: MapManager):
+    room_a, room_b = Room(x=1, y=1, width=3, height=2), Room(x=6, y=0, width=2, height=4)
+    map_manager_instance.set_generated_rooms([room_a, room_b])
+    assert map_manager_instance.get_room_at_pos(2, 2) == (0, room_a)
+    assert map_manager_instance.get_room_at_pos(7, 3) == (1, room_b)
+    assert map_manager_instance.get_room_at_pos(5, 1) is None
+    assert map_manager_instance.get_room_at_pos(-1, 0) is None
+
+    room_c = Room(x=10, y=10, width=2, height=2)
+    map_manager_instance.generated_rooms.append(room_c) # Mutated in place
+    assert map_manager_instance.get_room_at_pos(11, 11) == (2, room_c)
+    map_manager_instance.generated_rooms = [room_b] # Replaced directly
+    assert map_manager_instance.get_room_at_pos(2, 2) is None
+    assert map_manager_instance.get_room_at_pos(6, 0) == (0, room_b)
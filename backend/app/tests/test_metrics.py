@@ -0,0 +1,71 @@
+# backend/app/tests/test_metrics.py
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+
+from app import main
+from app.core import metrics
+from app.core.game_state import GameState
+from app.protocol import ConnectionOptions
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Metrics created in a test go to a fresh registry."""
+    monkeypatch.setattr(metrics, "REGISTRY", [])
+    return metrics.REGISTRY
+
+def test_counter_renders_labelled_samples(registry):
+    counter = metrics.Counter("test_total", "A test counter.", ("kind",))
+    counter.inc("a"); counter.inc("a", amount=2); counter.inc('say "hi"\n')
+    assert metrics.render().splitlines() == [
+        "# HELP test_total A test counter.", "# TYPE test_total counter",
+        'test_total{kind="a"} 3', 'test_total{kind="say \\"hi\\"\\n"} 1',
+    ]
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = metrics.Histogram("test_seconds", "A test histogram.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0): histogram.observe(value)
+    lines = metrics.render().splitlines()
+    assert lines[2:] == ['test_seconds_bucket{le="0.1"} 2', 'test_seconds_bucket{le="1.0"} 3', 'test_seconds_bucket{le="+Inf"} 4',
+                         "test_seconds_sum 3.65", "test_seconds_count 4"]
+
+def test_gauge_is_read_when_rendered(registry):
+    value = [1]
+    metrics.Gauge("test_gauge", "A test gauge.", lambda: value[0])
+    value[0] = 7
+    assert metrics.render().splitlines()[-1] == "test_gauge 7"
+
+def test_game_functions_are_timed():
+    before = {name: metrics.FUNCTION_DURATION.count(name) for name in ("generate_new_dungeon", "update_fov", "handle_player_move")}
+    gs = GameState(client_id="metrics_test")
+    gs.generate_new_dungeon(seed=3)
+    gs.handle_player_move(gs.player.pos["x"] + 1, gs.player.pos["y"])
+    for name, count in before.items():
+        assert metrics.FUNCTION_DURATION.count(name) > count, name
+
+def test_path_searches_count_expanded_nodes():
+    gs = GameState(client_id="metrics_test")
+    gs.generate_new_dungeon(seed=3)
+    mm = gs.map_manager
+    before = metrics.PATH_SEARCH_NODES.value("bfs")
+    mm.find_path_bfs(gs.player.pos, gs.player.pos | {"x": gs.player.pos["x"] + 2}, "player", gs.entity_manager, None)
+    assert metrics.PATH_SEARCH_NODES.value("bfs") == before + mm.last_search_nodes_expanded > before
+
+def test_turns_count_responses_and_bytes():
+    gs = GameState(client_id="metrics_test")
+    dungeon_data = main.RESPONSES_SENT.value("dungeon_data")
+    frames = main.play_turn(gs, {"action": "generate_dungeon", "seed": 3}, ConnectionOptions())
+    assert main.RESPONSES_SENT.value("dungeon_data") == dungeon_data + 1
+    websocket = MagicMock(); websocket.send_text = AsyncMock()
+    text_bytes = main.BYTES_SENT.value("text")
+    sent = asyncio.run(main.send_frames(websocket, frames))
+    assert sent == sum(len(frame.encode()) for frame in frames) and main.BYTES_SENT.value("text") == text_bytes + sent
+    assert asyncio.run(main.send_frames(websocket, ['{"message":"caf\u00e9"}'])) == 19 # counted in UTF-8 bytes
+
+def test_metrics_endpoint_serves_text_format():
+    response = asyncio.run(main.read_metrics())
+    body = response.body.decode()
+    assert response.media_type.startswith("text/plain")
+    for name in ("dungeon_function_duration_seconds", "dungeon_responses_sent_total", "dungeon_bytes_sent_total",
+                 "dungeon_active_sessions", "dungeon_path_search_nodes_expanded_total", "dungeon_connection_bytes_sent"):
+        assert f"# TYPE {name} " in body
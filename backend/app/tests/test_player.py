@@ -272,4 +272,30 @@ def test_effective_stats_with_armor(new_player: Player):
     armor_bonus = new_player.equipment["armor"].get("defense_bonus", 0)
     
     eff_stats = new_player.get_effective_stats()
-    assert eff_stats["defense"] == base_defense + armor_bonus
\ No newline at end of file
+    assert eff_stats["defense"] == base_defense + armor_bonus
+
+# --- Test Stats Response Cache ---
+def test_stats_response_is_reused_until_something_changes(new_player: Player):
+    first = new_player.create_player_stats_response()
+    version = new_player.stats_version
+    assert new_player.create_player_stats_response() is first
+    assert new_player.stats_version == version
+    new_player.take_damage(1)
+    second = new_player.create_player_stats_response()
+    assert second is not first and second.hp == first.hp - 1
+    assert new_player.stats_version == version + 1
+    assert second.inventory is first.inventory, "unchanged items must not be rebuilt"
+
+def test_stats_response_tracks_item_changes(new_player: Player):
+    first = new_player.create_player_stats_response()
+    new_player.add_item_to_inventory(ITEM_TYPE_POTION_HEAL) # stacks: only the quantity changes
+    stacked = new_player.create_player_stats_response()
+    assert stacked.inventory[0].quantity == first.inventory[0].quantity + 1
+    armor = new_player.add_item_to_inventory(ITEM_TYPE_ARMOR_LEATHER)
+    new_player.equip_item(armor["id"])
+    equipped = new_player.create_player_stats_response()
+    assert equipped.equipment["armor"].id == armor["id"]
+    new_player.equipment["armor"] = None
+    assert new_player.create_player_stats_response().equipment["armor"] is None
+    assert new_player.create_player_stats_response().model_dump() == PlayerStatsResponse.model_validate(
+        new_player.create_player_stats_response().model_dump()).model_dump()
@@ -0,0 +1,214 @@
+# backend/app/tests/test_protocol.py
+import asyncio
+import json
+import struct
+import msgpack
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.game_state import GameState
+from app.main import send_responses
+from app.protocol import (
+    ConnectionOptions, batch_tile_changes, coalesce_state_snapshots, to_wire, decode_tile_changes, encode_tile_changes, encode_turn_frames, stats_updates_as_deltas,
+    FRAME_DUNGEON_DATA, FRAME_TILE_CHANGES, FRAME_EVENT, FRAME_TURN
+)
+from app.core import events
+from app.schemas import DungeonDataServerResponse, PlayerStatsResponse
+
+def _tile_change(x: int, y: int, tile: int) -> events.TileChange:
+    return events.TileChange(x, y, tile)
+
+# --- tile_changes encoding ---
+
+def test_encode_tile_changes_is_delta_encoded_and_round_trips():
+    message = encode_tile_changes({25: 1, 3: 2, 26: 5}, width=10)
+    assert message.cells == [3, 22, 1]
+    assert message.tiles == [2, 1, 5]
+    assert decode_tile_changes(message.to_wire()) == [(3, 0, 2), (5, 2, 1), (6, 2, 5)]
+
+def test_batch_tile_changes_goes_after_the_last_change_and_keeps_last_write():
+    responses = [
+        events.GameMessage(text="before"),
+        _tile_change(1, 1, 2), events.GameMessage(text="between"),
+        _tile_change(0, 0, 1), _tile_change(1, 1, 3), events.GameMessage(text="after"),
+    ]
+    batched = batch_tile_changes(responses, width=4)
+    assert [r.type for r in batched] == ["game_message", "game_message", "tile_changes", "game_message"]
+    assert decode_tile_changes(batched[2].to_wire()) == [(0, 0, 1), (1, 1, 3)]
+
+def test_batch_tile_changes_follow_the_monster_move_that_caused_them():
+    responses = [_tile_change(2, 2, 1), events.MonsterMoved("m1", 3, 1), _tile_change(3, 2, 1)] # the tile it left
+    assert [r.type for r in batch_tile_changes(responses, width=4)] == ["monster_moved", "tile_changes"]
+
+def test_batch_tile_changes_drops_changes_superseded_by_new_level():
+    new_level = MagicMock(spec=DungeonDataServerResponse)
+    batched = batch_tile_changes([_tile_change(1, 1, 2), new_level, _tile_change(2, 0, 1)], width=4)
+    assert batched[0] is new_level
+    assert decode_tile_changes(batched[1].to_wire()) == [(2, 0, 1)]
+
+def test_batch_tile_changes_without_tile_changes_is_unchanged():
+    responses = [events.GameMessage(text="nothing to see")]
+    assert batch_tile_changes(responses, width=4) == responses
+
+# --- GameState integration ---
+
+def _client_map_after_moves(batched: bool, moves: int):
+    gs = GameState(client_id="protocol_test"); gs.logger = MagicMock()
+    gs.batch_tile_changes = batched
+    dungeon = gs.generate_new_dungeon(seed=11, is_new_level=False)
+    client_map = [list(row) for row in dungeon.map]
+    frames_per_turn = []
+    for _ in range(moves):
+        x, y = gs.player.pos["x"], gs.player.pos["y"]
+        target = next(((x + dx, y + dy) for dx, dy in [(1, 0), (0, 1), (-1, 0), (0, -1)]
+                       if gs._is_walkable_for_entity(x + dx, y + dy, "player")), (x, y))
+        responses = gs.handle_player_move(*target)
+        frames_per_turn.append(sum(r.type in ("tile_change", "tile_changes") for r in responses))
+        for response in responses:
+            if isinstance(response, events.TileChange):
+                client_map[response.y][response.x] = response.new_tile_type
+            elif isinstance(response, events.TileChanges):
+                for tx, ty, tile in decode_tile_changes(response.to_wire()):
+                    client_map[ty][tx] = tile
+    return client_map, frames_per_turn
+
+def test_game_state_batched_tile_changes_reproduce_client_map():
+    plain_map, plain_frames = _client_map_after_moves(batched=False, moves=6)
+    batched_map, batched_frames = _client_map_after_moves(batched=True, moves=6)
+    assert batched_map == plain_map
+    assert all(frames <= 1 for frames in batched_frames)
+    assert sum(plain_frames) > sum(batched_frames)
+
+# --- turn_result envelope ---
+
+def test_connection_options_default_to_original_protocol():
+    options = ConnectionOptions.from_query_params({})
+    assert not options.turn_envelope and not options.batch_tile_changes
+    options = ConnectionOptions.from_query_params({"envelope": "turn_result", "tile_changes": "batched"})
+    assert options.turn_envelope and options.batch_tile_changes
+
+def test_encode_turn_frames_without_envelope_sends_one_frame_per_response():
+    responses = [events.GameMessage(text="a"), None, _tile_change(1, 2, 3)]
+    frames = encode_turn_frames(responses, ConnectionOptions(turn_envelope=False))
+    assert [json.loads(frame)["type"] for frame in frames] == ["game_message", "tile_change"]
+
+def test_encode_turn_frames_with_envelope_sends_one_ordered_frame():
+    responses = [events.GameMessage(text="a"), _tile_change(1, 2, 3), events.GameMessage(text="b")]
+    frames = encode_turn_frames(responses, ConnectionOptions(turn_envelope=True))
+    assert len(frames) == 1
+    envelope = json.loads(frames[0])
+    assert envelope["type"] == "turn_result"
+    assert envelope["responses"] == [to_wire(r) for r in responses]
+
+def test_send_responses_writes_envelope_once():
+    websocket = MagicMock(); websocket.send_text = AsyncMock()
+    responses = [events.GameMessage(text="a"), events.GameMessage(text="b")]
+    asyncio.run(send_responses(websocket, responses, ConnectionOptions(turn_envelope=True)))
+    assert websocket.send_text.await_count == 1
+    asyncio.run(send_responses(websocket, responses))
+    assert websocket.send_text.await_count == 3
+
+# --- Binary wire format ---
+
+def decode_binary_frame(frame: bytes) -> list:
+    """
+    Reference decoder for ?format=binary frames. Returns the JSON-mode message dicts the frame stands for;
+    tile records come back as tile_change messages.
+    """
+    kind = frame[0]
+    if kind == FRAME_TURN:
+        messages, offset = [], 1
+        while offset < len(frame):
+            (length,) = struct.unpack_from("<I", frame, offset); offset += 4
+            messages.extend(decode_binary_frame(frame[offset:offset + length])); offset += length
+        return messages
+    if kind == FRAME_DUNGEON_DATA:
+        width, height = struct.unpack_from("<HH", frame, 1)
+        cells = frame[5:5 + width * height]
+        message = msgpack.unpackb(frame[5 + width * height:])
+        message["map"] = [list(cells[y * width:(y + 1) * width]) for y in range(height)]
+        return [message]
+    if kind == FRAME_TILE_CHANGES:
+        return [{"type": "tile_change", "pos": {"x": x, "y": y}, "new_tile_type": tile}
+                for x, y, tile in struct.iter_unpack("<HHB", frame[1:])]
+    if kind == FRAME_EVENT:
+        return [msgpack.unpackb(frame[1:])]
+    raise ValueError(f"Unknown frame kind {kind}")
+
+def _dungeon_turn():
+    gs = GameState(client_id="binary_test"); gs.logger = MagicMock()
+    dungeon = gs.generate_new_dungeon(seed=5, is_new_level=False)
+    return gs, dungeon
+
+def test_connection_options_binary_is_opt_in():
+    assert ConnectionOptions.from_query_params({}).wire_format == "json"
+    assert ConnectionOptions.from_query_params({"format": "binary"}).wire_format == "binary"
+    assert ConnectionOptions.from_query_params({"format": "xml"}).wire_format == "json"
+
+def test_binary_dungeon_data_round_trips_and_is_smaller():
+    _, dungeon = _dungeon_turn()
+    (frame,) = encode_turn_frames([dungeon], ConnectionOptions(wire_format="binary"))
+    assert isinstance(frame, bytes) and frame[0] == FRAME_DUNGEON_DATA
+    assert decode_binary_frame(frame) == [dungeon.model_dump(mode="json")]
+    (json_frame,) = encode_turn_frames([dungeon], ConnectionOptions(wire_format="json"))
+    assert len(frame) * 2 < len(json_frame.encode())
+
+def test_binary_tile_changes_are_packed_records():
+    single = _tile_change(300, 2, 8)
+    batched = encode_tile_changes({4 * 10 + 1: 1, 7: 2}, width=10)
+    frames = encode_turn_frames([single, batched], ConnectionOptions(wire_format="binary"))
+    assert frames[0] == bytes([FRAME_TILE_CHANGES]) + struct.pack("<HHB", 300, 2, 8)
+    assert len(frames[1]) == 1 + 2 * 5
+    assert [m["pos"] for m in decode_binary_frame(frames[1])] == [{"x": 7, "y": 0}, {"x": 1, "y": 4}]
+
+def test_binary_turn_envelope_matches_json_messages():
+    gs, _ = _dungeon_turn()
+    x, y = gs.player.pos["x"], gs.player.pos["y"]
+    target = next((x + dx, y + dy) for dx, dy in [(1, 0), (0, 1), (-1, 0), (0, -1)] if gs._is_walkable_for_entity(x + dx, y + dy, "player"))
+    responses = gs.handle_player_move(*target) + [events.GameMessage(text="done")]
+    (frame,) = encode_turn_frames(responses, ConnectionOptions(wire_format="binary", turn_envelope=True))
+    assert frame[0] == FRAME_TURN
+    assert decode_binary_frame(frame) == [to_wire(r) for r in responses]
+
+def test_send_responses_uses_bytes_frames_in_binary_mode():
+    websocket = MagicMock(); websocket.send_text = AsyncMock(); websocket.send_bytes = AsyncMock()
+    asyncio.run(send_responses(websocket, [events.GameMessage(text="a")], ConnectionOptions(wire_format="binary")))
+    assert websocket.send_bytes.await_count == 1 and websocket.send_text.await_count == 0
+
+# --- player_stats_delta ---
+
+def _stats(**overrides) -> PlayerStatsResponse:
+    fields = dict(hp=10, max_hp=10, attack=2, defense=1, level=1, xp=0, xp_to_next_level=100, inventory=[],
+                  equipment={"weapon": None, "armor": None})
+    return PlayerStatsResponse(**{**fields, **overrides})
+
+def test_stats_updates_as_deltas_sends_changed_fields_only():
+    responses = [events.PlayerStatsUpdate(_stats()), events.GameMessage(text="ouch"),
+                 events.PlayerStatsUpdate(_stats(hp=7)), events.PlayerStatsUpdate(_stats(hp=7))]
+    converted, last_sent = stats_updates_as_deltas(responses, None)
+    assert [r.type for r in converted] == ["player_stats_update", "game_message", "player_stats_delta"]
+    assert converted[2].changes == {"hp": 7}
+    assert last_sent["hp"] == 7
+    converted, _ = stats_updates_as_deltas([events.PlayerStatsUpdate(_stats(hp=7, xp=5))], last_sent)
+    assert converted[0].to_wire() == {"type": "player_stats_delta", "changes": {"xp": 5}}
+
+def test_game_state_stats_deltas_track_client_stats():
+    gs = GameState(client_id="delta_test"); gs.logger = MagicMock()
+    gs.player_stats_delta = True
+    dungeon = gs.generate_new_dungeon(seed=3, is_new_level=False)
+    client_stats = dungeon.player_stats.model_dump(mode="json")
+    for _ in range(3):
+        for response in gs.handle_equip_item("missing") + gs.handle_unequip_item("weapon") + gs.handle_use_item("missing"):
+            if isinstance(response, events.PlayerStatsDelta): client_stats.update(response.changes)
+            elif isinstance(response, events.PlayerStatsUpdate): client_stats = response.stats.model_dump(mode="json")
+    assert client_stats == gs.player.create_player_stats_response().model_dump(mode="json")
+
+# --- state snapshot coalescing ---
+
+def test_coalesce_state_snapshots_keeps_last_of_each_in_place():
+    stats_a, stats_b = _stats(hp=9), _stats(hp=8)
+    responses = [events.PlayerMoved(1, 1), events.PlayerStatsUpdate(stats_a), events.GameMessage(text="hit"),
+                 events.PlayerStatsUpdate(stats_b), events.PlayerMoved(1, 2), events.MonsterMoved("m", 3, 3)]
+    coalesced = coalesce_state_snapshots(responses)
+    assert [r.type for r in coalesced] == ["game_message", "player_stats_update", "player_moved", "monster_moved"]
+    assert coalesced[1].stats is stats_b and (coalesced[2].x, coalesced[2].y) == (1, 2)
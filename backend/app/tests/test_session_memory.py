@@ -0,0 +1,150 @@
+# backend/app/tests/test_session_memory.py
+import asyncio
+import json
+import sys
+import threading
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+
+from app.core.game_state import GameState
+from app.core.tile_grid import TileBitset, TileGrid
+from app.session_memory import CLOSE_EVICTED, CLOSE_IDLE, ActiveGames, SessionReaper
+from app.session_store import InMemorySessionStore, SQLiteSessionStore
+from app.turn_runner import ThreadTurnRunner, TurnRunner
+
+def _game(seed: int = 3, **dungeon_args) -> GameState:
+    gs = GameState(client_id=f"memory_{seed}")
+    gs.generate_new_dungeon(seed=seed, **dungeon_args)
+    return gs
+
+def _connection() -> MagicMock:
+    connection = MagicMock(); connection.close = AsyncMock()
+    return connection
+
+@pytest.fixture
+def spill(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "spill.sqlite3"))
+    yield store
+    store.close()
+
+def test_tile_containers_report_their_buffers():
+    assert sys.getsizeof(TileGrid(200, 200)) > 200 * 200 > sys.getsizeof(TileGrid(10, 10))
+    assert sys.getsizeof(TileBitset(200, 200)) > 200 * 200 // 8
+
+def test_memory_usage_grows_with_the_level():
+    small, large = _game(), _game(width=200, height=200, max_rooms=120)
+    assert 20_000 < small.memory_usage() < large.memory_usage()
+    assert GameState(client_id="empty").memory_usage() < small.memory_usage()
+
+def test_active_games_are_kept_in_lru_order():
+    active_games = ActiveGames()
+    first, second = _connection(), _connection()
+    active_games.add(first, _game(1)); active_games.add(second, _game(2))
+    assert asyncio.run(active_games.get(first)).client_id == "memory_1"
+    assert [entry.connection for entry in active_games.entries()] == [second, first]
+    assert asyncio.run(active_games.pop(second)).client_id == "memory_2" and second not in active_games and len(active_games) == 1
+
+def test_idle_connections_are_closed():
+    active_games = ActiveGames()
+    idle, busy = _connection(), _connection()
+    active_games.add(idle, _game(1)); active_games.add(busy, _game(2))
+    active_games.entries()[0].last_active -= 120
+    asyncio.run(SessionReaper(active_games, InMemorySessionStore(), TurnRunner(), idle_timeout=60).reap())
+    idle.close.assert_awaited_once_with(code=CLOSE_IDLE, reason="Idle timeout")
+    busy.close.assert_not_awaited()
+
+def test_over_budget_games_are_evicted_to_disk_in_lru_order(spill):
+    active_games = ActiveGames(spill)
+    old, recent = _connection(), _connection()
+    old_gs, recent_gs = _game(1), _game(2)
+    session_store = InMemorySessionStore()
+    active_games.add(old, old_gs, "old_token"); session_store.save("old_token", old_gs)
+    active_games.add(recent, recent_gs)
+    reaper = SessionReaper(active_games, session_store, TurnRunner(), memory_budget=recent_gs.memory_usage() + 1)
+    asyncio.run(reaper.enforce_budget())
+    old_entry, recent_entry = active_games.entries()
+    assert old_entry.gs is None and old_entry.spill_key is not None and recent_entry.gs is recent_gs
+    assert session_store.load("old_token") is None # the store let go of the evicted game too
+    old.close.assert_not_awaited()
+    restored = asyncio.run(active_games.get(old))
+    assert restored is not old_gs and restored.snapshot() == old_gs.snapshot() and len(spill) == 0
+
+def test_over_budget_games_without_a_spill_are_dropped():
+    active_games = ActiveGames()
+    connection = _connection()
+    active_games.add(connection, _game())
+    asyncio.run(SessionReaper(active_games, InMemorySessionStore(), TurnRunner(), memory_budget=0).enforce_budget())
+    connection.close.assert_awaited_once_with(code=CLOSE_EVICTED, reason="Game evicted")
+    assert asyncio.run(active_games.get(connection)) is None
+
+def test_games_with_a_turn_in_progress_are_not_evicted():
+    active_games = ActiveGames()
+    gs = _game(); turn_runner = ThreadTurnRunner()
+    active_games.add(_connection(), gs)
+    reaper = SessionReaper(active_games, InMemorySessionStore(), turn_runner, memory_budget=0)
+    started, finish = threading.Event(), threading.Event()
+    def turn(): started.set(); finish.wait(5)
+    async def main():
+        running = asyncio.ensure_future(turn_runner.run(gs, turn))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        await reaper.enforce_budget()
+        finish.set(); await running
+    try: asyncio.run(main())
+    finally: turn_runner.shutdown()
+    assert active_games.entries()[0].gs is gs
+
+def test_get_waits_for_an_eviction_in_flight(spill):
+    turn_runner = ThreadTurnRunner()
+    active_games = ActiveGames(spill, turn_runner)
+    connection, gs = _connection(), _game()
+    active_games.add(connection, gs)
+    reaper = SessionReaper(active_games, InMemorySessionStore(), turn_runner, memory_budget=0)
+    writing, finish = threading.Event(), threading.Event()
+    save = spill.save
+    def slow_save(*args): writing.set(); finish.wait(5); save(*args)
+    spill.save = slow_save
+    async def main():
+        evicting = asyncio.ensure_future(reaper.enforce_budget())
+        await asyncio.get_running_loop().run_in_executor(None, writing.wait, 5)
+        getting = asyncio.ensure_future(active_games.get(connection))
+        await asyncio.sleep(0.05)
+        assert not getting.done() # the event loop is free while the game is written out
+        finish.set(); await evicting
+        return await getting
+    try: restored = asyncio.run(main())
+    finally: turn_runner.shutdown()
+    assert restored is not gs and restored.snapshot() == gs.snapshot() and len(spill) == 0
+
+def test_memory_store_evicts_to_disk_and_resumes(spill):
+    store = InMemorySessionStore(spill=spill)
+    gs = _game()
+    store.save("token", gs)
+    assert [token for token, _, _ in store.resident()] == ["token"]
+    assert store.evict("token") and store.resident() == [] and len(spill) == 1
+    resumed = store.load("token")
+    assert resumed.snapshot() == gs.snapshot() and len(spill) == 0 and len(store) == 1
+
+def test_memory_store_spills_past_max_sessions(spill):
+    store = InMemorySessionStore(max_sessions=1, spill=spill)
+    store.save("a", _game(1)); store.save("b", _game(2))
+    assert len(store) == 1 and len(spill) == 1
+    assert store.load("a").client_id == "memory_1"
+
+def test_memory_report_counts_each_game_once():
+    active_games, store = ActiveGames(), InMemorySessionStore()
+    connected, disconnected = _game(1), _game(2)
+    active_games.add(_connection(), connected, "a"); store.save("a", connected); store.save("b", disconnected)
+    report = SessionReaper(active_games, store, TurnRunner(), memory_budget=10**9).memory_report()
+    assert report["total_bytes"] == connected.memory_usage() + disconnected.memory_usage()
+    assert (report["sessions"], report["connected"]) == (2, 1)
+    assert report["sessions_by_bytes"]["+Inf"] == report["sessions_by_idle_seconds"]["10"] == 2
+    assert "memory_1" not in json.dumps(report) # aggregates only: no client address leaves the worker
+
+def test_lazy_spill_creates_its_file_on_first_eviction(tmp_path):
+    path = tmp_path / "spill.sqlite3"
+    store = InMemorySessionStore(spill=SQLiteSessionStore(str(path), lazy=True))
+    store.save("token", _game()); store.expire()
+    assert store.load("missing") is None and len(store.spill) == 0 and not path.exists()
+    try:
+        assert store.evict("token") and path.exists() and store.load("token").client_id == "memory_3"
+    finally: store.spill.close()
@@ -0,0 +1,168 @@
+# backend/app/tests/test_session_store.py
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+import msgpack
+import pytest
+
+from app import main, session_store as session_store_module
+from app.core.game_state import GameState
+from app.core.level_pool import LevelPool
+from app.core.tiles import TILE_FOG
+from app.protocol import ConnectionOptions, decode_session_state, encode_session_frame, encode_turn_frames
+from app.schemas import DungeonDataServerResponse
+from app.session_memory import CLOSE_RESUMED_ELSEWHERE, ActiveGames
+from app.session_store import InMemorySessionStore, SessionTakenOver, SQLiteSessionStore, decode_game_state, encode_game_state
+
+def _played_game(seed: int = 12, turns: int = 15) -> GameState:
+    gs = GameState(client_id="session_test")
+    gs.generate_new_dungeon(seed=seed)
+    for turn in range(turns):
+        dx, dy = [(1, 0), (0, 1), (-1, 0), (0, -1)][turn % 4]
+        gs.handle_player_move(gs.player.pos["x"] + dx, gs.player.pos["y"] + dy)
+    return gs
+
+def _same_game(a: GameState, b: GameState):
+    assert a.player.pos == b.player.pos and a.player.hp == b.player.hp and a.player.inventory == b.player.inventory
+    assert a.map_manager.actual_dungeon_map.to_list() == b.map_manager.actual_dungeon_map.to_list()
+    assert a.map_manager.dungeon_map_for_client.to_list() == b.map_manager.dungeon_map_for_client.to_list()
+    assert a.entity_manager.get_all_monsters() == b.entity_manager.get_all_monsters()
+    assert a.rng.getstate() == b.rng.getstate() and a.current_dungeon_level == b.current_dungeon_level
+
+def test_encoded_game_plays_on_identically():
+    gs = _played_game()
+    restored = decode_game_state(encode_game_state(gs))
+    _same_game(gs, restored)
+    move = (gs.player.pos["x"] + 1, gs.player.pos["y"])
+    assert [r.to_wire() for r in gs.handle_player_move(*move)] == [r.to_wire() for r in restored.handle_player_move(*move)]
+
+def test_level_pool_is_left_behind_and_reattached():
+    pool = LevelPool(ThreadPoolExecutor(max_workers=1))
+    try:
+        gs = GameState(client_id="session_test"); gs.attach_level_pool(pool)
+        gs.generate_new_dungeon(seed=3)
+        restored = decode_game_state(encode_game_state(gs))
+        assert restored.level_pool is None and not restored._next_level_prefetched
+        restored.attach_level_pool(pool)
+        assert restored._next_level_prefetched and len(pool) == 2
+    finally: pool.shutdown()
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    store = InMemorySessionStore() if request.param == "memory" else SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"))
+    yield store
+    store.close()
+
+def test_store_round_trip(store):
+    gs = _played_game()
+    store.save("token", gs)
+    _same_game(gs, store.load("token"))
+    assert store.load("missing") is None
+    store.delete("token")
+    assert store.load("token") is None and len(store) == 0
+
+def test_sqlite_store_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    writer, reader = SQLiteSessionStore(path), SQLiteSessionStore(path) # as two workers would open it
+    try:
+        gs = _played_game()
+        writer.save("token", gs)
+        _same_game(gs, reader.load("token"))
+    finally: writer.close(); reader.close()
+
+def test_sqlite_session_belongs_to_the_worker_that_resumed_it(tmp_path):
+    path = str(tmp_path / "sessions.sqlite3")
+    first, second = SQLiteSessionStore(path), SQLiteSessionStore(path)
+    try:
+        first.save("token", _played_game(turns=0))
+        resumed = second.load("token"); second.save("token", resumed)
+        with pytest.raises(SessionTakenOver): first.save("token", _played_game(turns=3)) # a stale holder
+        _same_game(resumed, first.load("token")) # resuming takes it back
+        first.save("token", resumed)
+        with pytest.raises(SessionTakenOver): second.save("token", resumed)
+    finally: first.close(); second.close()
+
+def test_open_session_and_resume(monkeypatch):
+    monkeypatch.setattr(main, "session_store", InMemorySessionStore())
+    assert asyncio.run(main.open_session(None)) == (None, None)
+    fresh_gs, token = asyncio.run(main.open_session("new"))
+    assert fresh_gs is None and token
+    gs = GameState(client_id="session_test")
+    main.play_turn(gs, {"action": "generate_dungeon", "seed": 4}, ConnectionOptions(), token)
+    resumed_gs, same_token = asyncio.run(main.open_session(token))
+    assert resumed_gs is gs and same_token == token
+    assert asyncio.run(main.open_session("unknown"))[1] not in (None, "unknown", token)
+
+def test_resuming_a_held_session_takes_it_from_the_old_connection(monkeypatch, tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"))
+    monkeypatch.setattr(main, "session_store", store); monkeypatch.setattr(main, "active_games", ActiveGames())
+    gs = _played_game(); store.save("token", _played_game(turns=0)) # the store lags behind the live game
+    old_connection = MagicMock(); old_connection.close = AsyncMock()
+    main.active_games.add(old_connection, gs, "token")
+    try: resumed_gs, token = asyncio.run(main.open_session("token"))
+    finally: store.close()
+    assert resumed_gs is gs and token == "token" # not a fork from the store
+    assert old_connection not in main.active_games # so its exit neither saves nor touches the game
+    old_connection.close.assert_awaited_once_with(code=CLOSE_RESUMED_ELSEWHERE, reason="Session resumed elsewhere")
+
+def test_resumed_monsters_in_fog_are_announced_again():
+    gs = _played_game()
+    monster = gs.entity_manager.get_all_monsters()[0]
+    client_map = gs.map_manager.dungeon_map_for_client
+    gs.revealed_monster_ids.add(monster["id"]); client_map[monster["y"]][monster["x"]] = TILE_FOG # seen earlier, now in fog
+    message = json.loads(main.session_frame(gs, "token", True, ConnectionOptions()))
+    assert monster["id"] not in {m["id"] for m in json.loads(decode_session_state(message))["monsters"]}
+    client_map[monster["y"]][monster["x"]] = gs.map_manager.actual_dungeon_map[monster["y"]][monster["x"]]
+    assert monster["id"] in {r.monster_id for r in gs._check_and_reveal_newly_visible_monsters()}
+
+def test_dungeon_data_response_rebuilds_the_client_view():
+    gs = _played_game()
+    restored = decode_game_state(encode_game_state(gs))
+    response = restored.dungeon_data_response()
+    assert isinstance(response, DungeonDataServerResponse)
+    assert response.map == gs.map_manager.dungeon_map_for_client.to_list()
+    assert response.player_start_pos.x == gs.player.pos["x"] and response.current_dungeon_level == 1
+    client_map = gs.map_manager.dungeon_map_for_client
+    assert {m.id for m in response.monsters} == {m["id"] for m in gs.entity_manager.get_all_monsters() if client_map[m["y"]][m["x"]] != TILE_FOG}
+
+def test_memory_store_is_a_ttl_bounded_lru(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_store_module.time, "monotonic", lambda: now[0])
+    store = InMemorySessionStore(ttl=60, max_sessions=2)
+    games = [GameState(client_id=f"lru_{i}") for i in range(3)]
+    store.save("a", games[0]); now[0] += 30
+    store.save("b", games[1]); store.save("a", games[0]) # saving again makes "a" the most recent
+    store.save("c", games[2])
+    assert store.load("b") is None and store.load("a") is games[0] and len(store) == 2
+    now[0] += 45
+    assert store.expire() == 0 and store.load("c") is games[2]
+    now[0] += 30
+    assert store.load("a") is None and store.expire() == 1 and len(store) == 0
+
+def test_sqlite_store_expires_old_sessions(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_store_module.time, "time", lambda: now[0])
+    store = SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"), ttl=60)
+    try:
+        store.save("old", _played_game(turns=0)); now[0] += 45
+        store.save("new", _played_game(turns=0)); now[0] += 30
+        assert store.load("old") is None and store.load("new") is not None
+        assert store.expire() == 1 and len(store) == 1
+    finally: store.close()
+
+@pytest.mark.parametrize("wire_format", ["json", "binary"])
+def test_resume_is_one_compressed_frame(wire_format):
+    gs = _played_game()
+    state = gs.dungeon_data_response()
+    options = ConnectionOptions(wire_format=wire_format, turn_envelope=True)
+    frame = encode_session_frame("token", True, state, options)
+    message = json.loads(frame) if wire_format == "json" else msgpack.unpackb(frame[1:])
+    assert message["type"] == "session" and message["token"] == "token" and message["resumed"]
+    (uncompressed,) = encode_turn_frames([state], ConnectionOptions(wire_format=wire_format))
+    assert decode_session_state(message) == (uncompressed.encode() if wire_format == "json" else uncompressed)
+    assert len(frame) < len(uncompressed) / 2
+
+def test_new_session_frame_carries_no_state():
+    message = json.loads(encode_session_frame("token", False, None, ConnectionOptions()))
+    assert message == {"type": "session", "token": "token", "resumed": False} and decode_session_state(message) is None
@@ -0,0 +1,47 @@
+# backend/app/tests/test_simulation.py
+import random
+import pytest
+
+from app.core.game_state import GameState
+from app.simulation import SIMULATION_POLICIES, DescendPolicy, run_batch, run_game
+
+@pytest.mark.parametrize("policy", sorted(SIMULATION_POLICIES))
+def test_run_game_is_repeatable_per_seed(policy):
+    first = run_game(7, policy, max_turns=150)
+    assert first == run_game(7, policy, max_turns=150)
+    assert 0 < first.turns <= 150 and first.depth >= 1
+
+def test_run_game_stops_at_max_turns():
+    result = run_game(2, "random", max_turns=5)
+    assert result.turns == 5 or result.died
+
+def test_run_batch_results_do_not_depend_on_worker_count():
+    seeds = range(4)
+    serial = run_batch(seeds, "descend", max_turns=80, workers=1)
+    pooled = run_batch(seeds, "descend", max_turns=80, workers=2)
+    assert [r.seed for r in pooled.results] == list(seeds)
+    assert pooled.results == serial.results
+
+def test_run_batch_summary():
+    report = run_batch(range(3), "random", max_turns=40, workers=1)
+    summary = report.summary()
+    assert summary["games"] == 3 and summary["workers"] == 1
+    assert report.total_turns == sum(r.turns for r in report.results)
+    assert sum(report.death_depths.values()) == sum(r.died for r in report.results)
+    assert {"turns_per_second", "death_rate", "mean_depth", "max_depth", "mean_kills"} <= summary.keys()
+
+def test_run_batch_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        run_batch([0], "teleport", workers=1)
+
+def test_descend_policy_reuses_stairs_field_until_terrain_changes():
+    gs = GameState(client_id="test_simulation")
+    gs.generate_new_dungeon(seed=11, is_new_level=False)
+    policy = DescendPolicy(random.Random(0))
+    policy.next_action(gs)
+    field = policy._field
+    policy.next_action(gs)
+    assert policy._field is field
+    gs.map_manager.terrain_version += 1
+    policy.next_action(gs)
+    assert policy._field is not field
@@ -0,0 +1,91 @@
+# backend/app/tests/test_snapshot.py
+import pytest
+
+from app.core.game_state import GameState
+from app.core.level_pool import LevelSpec
+from app.core.snapshot import SnapshotError
+from app.core.monsters.definitions import MONSTER_TEMPLATES
+from app.core.tiles import TILE_MONSTER_GOBLIN
+
+def _played_game(seed: int = 12, turns: int = 15, **dungeon_args) -> GameState:
+    gs = GameState(client_id="snapshot_test")
+    gs.generate_new_dungeon(seed=seed, **dungeon_args)
+    for turn in range(turns):
+        dx, dy = [(1, 0), (0, 1), (-1, 0), (0, -1)][turn % 4]
+        gs.handle_player_move(gs.player.pos["x"] + dx, gs.player.pos["y"] + dy)
+    return gs
+
+def _assert_same_game(a: GameState, b: GameState):
+    ma, mb = a.map_manager, b.map_manager
+    assert ma.actual_dungeon_map == mb.actual_dungeon_map and ma.dungeon_map_for_client == mb.dungeon_map_for_client
+    for name in ("ever_revealed_tiles", "visible_tiles", "_pending_revealed_tiles", "visited_room_indices", "_client_view_synced"):
+        assert getattr(ma, name) == getattr(mb, name), name
+    assert [vars(r) for r in ma.generated_rooms] == [vars(r) for r in mb.generated_rooms]
+    assert a.entity_manager.get_all_monsters() == b.entity_manager.get_all_monsters()
+    assert a.revealed_monster_ids == b.revealed_monster_ids
+    for name in ("pos", "hp", "max_hp", "attack", "defense", "level", "xp", "xp_to_next_level", "inventory", "equipment"):
+        assert getattr(a.player, name) == getattr(b.player, name), name
+    for name in ("client_id", "game_over", "seed", "current_dungeon_level", "_next_level_spec"):
+        assert getattr(a, name) == getattr(b, name), name
+    assert a.rng.getstate() == b.rng.getstate()
+
+def test_round_trip_is_exact():
+    gs = _played_game()
+    gs.player.add_item_to_inventory("potion_heal"); gs.player.add_item_to_inventory("potion_heal")
+    gs.player.add_item_to_inventory("scroll_teleport")
+    restored = GameState.restore(gs.snapshot())
+    _assert_same_game(gs, restored)
+    assert restored.snapshot() == gs.snapshot()
+
+def test_equipment_and_inventory_share_item_identity():
+    gs = _played_game(turns=0)
+    dagger = gs.player.add_item_to_inventory("weapon_dagger")
+    gs.player.equipment["weapon"] = dagger
+    restored = GameState.restore(gs.snapshot())
+    assert restored.player.equipment["weapon"] is restored.player.inventory[-1] and restored.player.equipment["armor"] is None
+
+def test_restored_game_plays_on_identically():
+    gs = _played_game()
+    restored = GameState.restore(gs.snapshot())
+    for turn in range(20):
+        dx, dy = [(0, 1), (1, 0), (0, -1), (-1, 0)][turn % 4]
+        move = (gs.player.pos["x"] + dx, gs.player.pos["y"] + dy)
+        assert [r.to_wire() for r in gs.handle_player_move(*move)] == [r.to_wire() for r in restored.handle_player_move(*move)]
+    _assert_same_game(gs, restored)
+
+def test_unusual_records_are_stored_whole():
+    gs = _played_game(turns=0)
+    gs.entity_manager.add_monster({**MONSTER_TEMPLATES[TILE_MONSTER_GOBLIN], "id": "test_goblin", "x": 1, "y": 1, "hp": 3,
+                                   "last_known_player_pos": None, "note": ["extra", 1]})
+    gs.revealed_monster_ids.add("test_goblin")
+    gs.player.inventory.append({"id": "custom", "type_key": "potion_heal", "quantity": 1, "bonus": 2.5})
+    restored = GameState.restore(gs.snapshot())
+    _assert_same_game(gs, restored)
+
+def test_game_without_a_map():
+    gs = GameState(client_id="snapshot_test")
+    restored = GameState.restore(gs.snapshot())
+    assert restored.map_manager.actual_dungeon_map is None and restored.player.pos == gs.player.pos
+    assert restored.rng.getstate() == gs.rng.getstate()
+
+@pytest.mark.parametrize("seed", [2**63, -2**63 - 1, 10**30])
+def test_seeds_outside_64_bits_round_trip(seed):
+    gs = _played_game(seed=seed, turns=3)
+    gs._next_level_spec = LevelSpec(seed + 1, gs.current_dungeon_level + 1)
+    _assert_same_game(gs, GameState.restore(gs.snapshot()))
+
+def test_large_map_snapshot_is_small():
+    gs = _played_game(seed=4, turns=5, width=200, height=200, max_rooms=120)
+    data = gs.snapshot()
+    assert len(data) < 16 * 1024
+    _assert_same_game(gs, GameState.restore(data))
+
+@pytest.mark.parametrize("mangle", [
+    lambda data: b"XXXX" + data[4:],
+    lambda data: data[:4] + bytes([99]) + data[5:],
+    lambda data: data[:3],
+    lambda data: data[:len(data) // 2],
+])
+def test_invalid_snapshots_are_rejected(mangle):
+    with pytest.raises(SnapshotError):
+        GameState.restore(mangle(_played_game(turns=0).snapshot()))
@@ -0,0 +1,133 @@
+# backend/app/tests/test_tile_grid.py
+import pickle
+import sys
+import pytest
+
+from app.core.tile_grid import TileGrid, TileBitset
+from app.core.dungeon_generator import DungeonGenerator
+from app.core.tiles import TILE_EMPTY, TILE_FLOOR, TILE_WALL, TILE_FOG, TILE_DOOR_OPEN
+
+# --- Fixtures ---
+
+@pytest.fixture
+def small_rows():
+    return [
+        [TILE_WALL, TILE_WALL, TILE_WALL],
+        [TILE_WALL, TILE_FLOOR, TILE_DOOR_OPEN],
+        [TILE_WALL, TILE_WALL, TILE_WALL],
+    ]
+
+# --- Test Cases ---
+
+def test_tile_grid_new_grid_is_filled():
+    grid = TileGrid(4, 3, TILE_FOG)
+    assert len(grid) == 3
+    assert len(grid[0]) == 4
+    assert grid.count(TILE_FOG) == 12
+
+def test_tile_grid_row_indexing_reads_and_writes(small_rows):
+    grid = TileGrid.from_rows(small_rows)
+    assert grid[1][1] == TILE_FLOOR
+    assert grid[1][2] == TILE_DOOR_OPEN
+    grid[2][0] = TILE_FLOOR
+    assert grid[2][0] == TILE_FLOOR
+    assert grid.cells[2 * grid.width + 0] == TILE_FLOOR
+
+def test_tile_grid_tuple_indexing_is_x_y(small_rows):
+    grid = TileGrid.from_rows(small_rows)
+    assert grid[2, 1] == TILE_DOOR_OPEN
+    grid[0, 2] = TILE_FLOOR
+    assert grid[2][0] == TILE_FLOOR
+    with pytest.raises(IndexError):
+        grid[3, 0]
+    with pytest.raises(TypeError):
+        grid[0] = [TILE_FLOOR] * 3
+
+def test_tile_grid_round_trips_to_list(small_rows):
+    grid = TileGrid.from_rows(small_rows)
+    assert grid.to_list() == small_rows
+    assert [list(row) for row in grid] == small_rows
+
+def test_tile_grid_from_bytes_checks_size():
+    with pytest.raises(ValueError):
+        TileGrid.from_bytes(3, 3, bytes(8))
+
+def test_tile_grid_copy_and_pickle_are_independent(small_rows):
+    grid = TileGrid.from_rows(small_rows)
+    clone = grid.copy()
+    restored = pickle.loads(pickle.dumps(grid))
+    assert clone == grid and restored == grid
+    clone[1][1] = TILE_WALL
+    restored[1][1] = TILE_EMPTY
+    assert grid[1][1] == TILE_FLOOR
+
+def test_tile_grid_replace_keeps_row_views_live(small_rows):
+    grid = TileGrid.from_rows(small_rows)
+    row = grid[1]
+    grid.replace(TILE_WALL, TILE_EMPTY)
+    assert grid.count(TILE_WALL) == 0
+    assert row[0] == TILE_EMPTY
+
+def test_tile_grid_is_smaller_than_nested_lists():
+    rows = [[TILE_WALL] * 50 for _ in range(30)] # the default map size
+    list_bytes = sys.getsizeof(rows) + sum(sys.getsizeof(r) for r in rows)
+    grid = TileGrid.from_rows(rows)
+    assert sys.getsizeof(grid) < list_bytes // 7 # a list spends 8 bytes per tile on the pointer alone
+
+def test_tile_grid_rows_index_like_lists(small_rows):
+    grid = TileGrid.from_rows(small_rows)
+    assert list(grid[-1]) == small_rows[-1] and [list(row) for row in grid] == small_rows
+    with pytest.raises(IndexError):
+        grid[len(small_rows)]
+
+def test_dungeon_generator_returns_tile_grid():
+    gen = DungeonGenerator(60, 40, seed=7)
+    map_data, _ = gen.generate_dungeon(max_rooms=8)
+    assert isinstance(map_data, TileGrid)
+    assert map_data.count(TILE_EMPTY) == 0
+
+
+# --- TileBitset ---
+
+def test_tile_bitset_set_operations():
+    bitset = TileBitset(5, 4, [(1, 0), (4, 3)])
+    bitset.add((2, 2))
+    assert (1, 0) in bitset and (2, 2) in bitset and (4, 3) in bitset
+    assert (0, 0) not in bitset and (9, 9) not in bitset
+    assert len(bitset) == 3 and bitset
+    bitset.discard((1, 0)); bitset.discard((9, 9))
+    assert (1, 0) not in bitset and len(bitset) == 2
+    bitset.clear()
+    assert not bitset and len(bitset) == 0
+    with pytest.raises(IndexError):
+        bitset.add((5, 0))
+
+def test_tile_bitset_iterates_row_major():
+    positions = [(3, 2), (0, 0), (7, 0), (1, 1), (0, 2), (8, 1)]
+    bitset = TileBitset(9, 3, positions)
+    assert list(bitset) == sorted(positions, key=lambda pos: (pos[1], pos[0]))
+
+def test_tile_bitset_union_intersection_difference():
+    a = TileBitset(6, 6, [(0, 0), (1, 1), (2, 2)])
+    b = TileBitset(6, 6, [(2, 2), (5, 5)])
+    assert set(a | b) == {(0, 0), (1, 1), (2, 2), (5, 5)}
+    assert set(a & b) == {(2, 2)}
+    assert set(a - b) == {(0, 0), (1, 1)}
+    a.update(b)
+    assert a == {(0, 0), (1, 1), (2, 2), (5, 5)}
+    with pytest.raises(ValueError):
+        a | TileBitset(5, 6)
+
+def test_tile_bitset_copy_and_pickle():
+    bitset = TileBitset(10, 10, [(3, 4), (9, 9)])
+    clone, restored = bitset.copy(), pickle.loads(pickle.dumps(bitset))
+    assert clone == bitset and restored == bitset
+    clone.add((0, 0))
+    assert (0, 0) not in bitset
+
+def test_tile_bitset_is_smaller_than_tuple_set():
+    positions = [(x, y) for y in range(80) for x in range(120)]
+    tuple_set = set(positions)
+    set_bytes = sys.getsizeof(tuple_set) + sum(sys.getsizeof(pos) for pos in positions)
+    bitset = TileBitset(120, 80, positions)
+    assert sys.getsizeof(bitset._bits) * 50 < set_bytes
@@ -0,0 +1,70 @@
+# backend/app/tests/test_turn_runner.py
+import asyncio
+import json
+import threading
+import time
+import pytest
+
+from app.core.game_state import GameState
+from app.main import handle_client_action, play_turn
+from app.protocol import ConnectionOptions
+from app.schemas import ErrorServerResponse
+from app.turn_runner import TURN_RUNNERS, ThreadTurnRunner
+
+@pytest.fixture
+def thread_runner():
+    runner = ThreadTurnRunner(max_workers=4)
+    yield runner
+    runner.shutdown()
+
+@pytest.mark.parametrize("runner_name", sorted(TURN_RUNNERS))
+def test_turns_of_one_session_run_in_arrival_order(runner_name):
+    runner = TURN_RUNNERS[runner_name]()
+    gs = GameState(client_id="runner_test"); order = []
+    def turn(i):
+        time.sleep(0.02 if i == 0 else 0.0) # the first turn is the slowest
+        order.append(i); return i
+    async def main():
+        return await asyncio.gather(*(runner.run(gs, turn, i) for i in range(5)))
+    try: assert asyncio.run(main()) == [0, 1, 2, 3, 4]
+    finally: runner.shutdown()
+    assert order == [0, 1, 2, 3, 4]
+
+def test_thread_runner_runs_sessions_concurrently(thread_runner: ThreadTurnRunner):
+    first, second = GameState(client_id="a"), GameState(client_id="b")
+    released = threading.Event()
+    async def main():
+        waiting = asyncio.ensure_future(thread_runner.run(first, released.wait, 2.0))
+        await thread_runner.run(second, released.set)
+        return await waiting
+    assert asyncio.run(main()) is True # the first session's turn was unblocked by the second's
+
+def test_thread_runner_keeps_event_loop_free(thread_runner: ThreadTurnRunner):
+    gs = GameState(client_id="runner_test")
+    async def main():
+        ticks = 0
+        slow_turn = asyncio.ensure_future(thread_runner.run(gs, time.sleep, 0.2))
+        while not slow_turn.done():
+            await asyncio.sleep(0.01); ticks += 1
+        return ticks
+    assert asyncio.run(main()) >= 10
+
+def test_play_turn_encodes_the_action_responses():
+    gs = GameState(client_id="runner_test")
+    frames = play_turn(gs, {"action": "generate_dungeon", "seed": 3}, ConnectionOptions())
+    assert [json.loads(frame)["type"] for frame in frames] == ["dungeon_data"]
+    x, y = gs.player.pos["x"], gs.player.pos["y"]
+    frames = play_turn(gs, {"action": "player_move", "new_pos": {"x": x + 1, "y": y}}, ConnectionOptions(turn_envelope=True))
+    assert len(frames) == 1 and json.loads(frames[0])["type"] == "turn_result"
+
+def test_handle_client_action_reports_bad_messages():
+    gs = GameState(client_id="runner_test")
+    unknown = handle_client_action(gs, {"action": "dance"})
+    invalid = handle_client_action(gs, {"action": "player_move", "new_pos": "north"})
+    assert isinstance(unknown[0], ErrorServerResponse) and "dance" in unknown[0].message
+    assert isinstance(invalid[0], ErrorServerResponse)
+
+def test_thread_runner_offloads_session_store_work(thread_runner: ThreadTurnRunner):
+    async def main():
+        return await thread_runner.offload(threading.current_thread)
+    assert asyncio.run(main()) is not threading.main_thread()
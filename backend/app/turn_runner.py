@@ -0,0 +1,70 @@
+# backend/app/turn_runner.py
+"""
+Where /ws/dungeon turns run. A turn (parsing the action, GameState.handle_*, FOV, monster AI and encoding the
+frames) is CPU work; run inline it blocks the event loop, and every other connection in the worker waits
+for it. ThreadTurnRunner hands each turn, and each session-store load or save, to a thread pool so the event
+loop only does socket I/O.
+
+Turns of one session always run one at a time and in arrival order: each GameState has a FIFO lock that
+a turn holds from submission to completion. Different sessions' turns may run concurrently, and they
+share nothing mutable except the LevelPool, which is lock-protected.
+
+Offloading keeps the event loop responsive; it does not add CPU. Turns hold the GIL, so a worker's turns run one
+at a time whatever TURN_WORKER_THREADS is, and a session's turn waits for those of every other session in the
+worker. Turn latency under load is bounded only by running more worker processes (see core/config.py).
+"""
+import asyncio
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from .core import config as game_config
+from .core.game_state import GameState
+
+T = TypeVar("T")
+
+
+class TurnRunner:
+    """Runs turns inline on the event loop (the original behaviour)."""
+    def __init__(self):
+        self._session_locks: 'weakref.WeakKeyDictionary[GameState, asyncio.Lock]' = weakref.WeakKeyDictionary()
+
+    async def run(self, gs: GameState, turn: Callable[..., T], *args: Any) -> T:
+        lock = self._session_locks.get(gs)
+        if lock is None: lock = self._session_locks[gs] = asyncio.Lock()
+        async with lock:
+            return await self._execute(turn, *args)
+
+    async def offload(self, work: Callable[..., T], *args: Any) -> T:
+        """Runs blocking work that belongs to no one game's turn (session-store reads and writes) where turns run."""
+        return await self._execute(work, *args)
+
+    def busy(self, gs: GameState) -> bool:
+        """Whether a turn of gs is running or queued. When it is not, code on the event loop may read gs safely."""
+        lock = self._session_locks.get(gs)
+        return lock is not None and lock.locked()
+
+    async def _execute(self, turn: Callable[..., T], *args: Any) -> T:
+        return turn(*args)
+
+    def shutdown(self):
+        pass
+
+
+class ThreadTurnRunner(TurnRunner):
+    """Runs turns on a shared thread pool; the event loop awaits them without blocking."""
+    def __init__(self, max_workers: int = game_config.TURN_WORKER_THREADS):
+        super().__init__()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="turn")
+
+    async def _execute(self, turn: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, turn, *args)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+TURN_RUNNERS: Dict[str, Callable[[], TurnRunner]] = {
+    "inline": TurnRunner,
+    "thread": ThreadTurnRunner,
+}
@@ -0,0 +1,81 @@
+# backend/benchmarks/bench_events.py
+"""
+Responses per second for the hot per-step messages (monster_moved, tile_change, player_moved, combat_event):
+building Pydantic response models and dumping them for send_json (before) against building core/events.py
+events and converting them to wire dicts at the edge (after). Also times whole monster-heavy turns end to end,
+from GameState.handle_player_move through JSON encoding.
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_events
+"""
+import json
+import time
+from unittest.mock import MagicMock
+
+from app import schemas
+from app.core import events
+from app.core.game_state import GameState
+from app.protocol import ConnectionOptions, encode_turn_frames
+
+ROUNDS = 20_000
+TURNS = 300
+SEED = 77
+
+
+def _pydantic_step(i: int):
+    """What one monster step plus a player move cost before events existed: models built, then dumped."""
+    return [
+        schemas.MonsterMovedServerResponse(monster_id="m1", new_pos=schemas.Position(x=i % 50, y=3)),
+        schemas.TileChangeServerResponse(pos=schemas.Position(x=i % 50, y=4), new_tile_type=1),
+        schemas.TileChangeServerResponse(pos=schemas.Position(x=i % 50, y=5), new_tile_type=2),
+        schemas.PlayerMovedServerResponse(player_pos=schemas.Position(x=4, y=i % 30)),
+        schemas.CombatEventServerResponse(attacker_id="m1", attacker_type="Goblin", defender_faction="player",
+                                          damage_done=2, defender_hp_current=20, defender_hp_max=30, message="Goblin hits you."),
+    ]
+
+
+def _event_step(i: int):
+    return [
+        events.MonsterMoved("m1", i % 50, 3),
+        events.TileChange(i % 50, 4, 1),
+        events.TileChange(i % 50, 5, 2),
+        events.PlayerMoved(4, i % 30),
+        events.CombatEvent(attacker_id="m1", attacker_type="Goblin", defender_faction="player",
+                           damage_done=2, defender_hp_current=20, defender_hp_max=30, message="Goblin hits you."),
+    ]
+
+
+def _responses_per_second(build, encode) -> float:
+    count = 0
+    start = time.perf_counter()
+    for i in range(ROUNDS):
+        for response in build(i):
+            encode(response); count += 1
+    return count / (time.perf_counter() - start)
+
+
+def _turns_per_second() -> float:
+    gs = GameState(client_id="bench_events"); gs.logger = MagicMock()
+    gs.generate_new_dungeon(seed=SEED, width=80, height=50, max_rooms=20, is_new_level=False)
+    options = ConnectionOptions()
+    start = time.perf_counter()
+    for turn in range(TURNS):
+        if gs.game_over: gs.generate_new_dungeon(seed=SEED + turn, width=80, height=50, max_rooms=20, is_new_level=False)
+        x, y = gs.player.pos["x"], gs.player.pos["y"]
+        dx, dy = [(1, 0), (0, 1), (-1, 0), (0, -1)][(turn // 3) % 4]
+        encode_turn_frames(gs.handle_player_move(x + dx, y + dy), options)
+    return TURNS / (time.perf_counter() - start)
+
+
+def main():
+    before = _responses_per_second(_pydantic_step, lambda r: json.dumps(r.model_dump(mode="json")))
+    after = _responses_per_second(_event_step, lambda r: json.dumps(r.to_wire()))
+    print(f"{'representation':<34}{'responses/s':>14}")
+    print(f"{'Pydantic models + model_dump':<34}{before:>14,.0f}")
+    print(f"{'slotted events + to_wire':<34}{after:>14,.0f}   ({after / before:.1f}x)")
+    print()
+    print(f"handle_player_move + JSON encoding: {_turns_per_second():,.0f} turns/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# backend/benchmarks/bench_fov.py
+"""
+Per-turn field-of-view latency for each FOV strategy in MapManager.
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_fov
+"""
+import time
+from typing import Dict, List
+
+from app.core.dungeon_generator import DungeonGenerator
+from app.core.map_manager import MapManager, FOV_STRATEGIES
+from app.core.tiles import TILE_FLOOR
+
+RADII = [5, 10, 20]
+MAP_WIDTH, MAP_HEIGHT = 120, 80
+SEED = 2024
+SAMPLE_POSITIONS = 200
+
+
+def _floor_positions(map_data, limit: int) -> List[Dict[str, int]]:
+    positions = [{"x": x, "y": y} for y, row in enumerate(map_data) for x, tile in enumerate(row) if tile == TILE_FLOOR]
+    step = max(1, len(positions) // limit)
+    return positions[::step][:limit]
+
+
+def main():
+    generator = DungeonGenerator(MAP_WIDTH, MAP_HEIGHT, seed=SEED)
+    map_data, _ = generator.generate_dungeon(max_rooms=40)
+    map_manager = MapManager()
+    map_manager.actual_dungeon_map = map_data
+    positions = _floor_positions(map_data, SAMPLE_POSITIONS)
+
+    print(f"Map {MAP_WIDTH}x{MAP_HEIGHT}, {len(positions)} viewer positions, mean latency per FOV computation")
+    print(f"{'strategy':<18}" + "".join(f"{'r=' + str(r):>14}" for r in RADII))
+    for name, strategy in FOV_STRATEGIES.items():
+        cells = []
+        for radius in RADII:
+            strategy(map_manager, positions[0], radius)  # warm per-radius caches
+            start = time.perf_counter()
+            for pos in positions:
+                strategy(map_manager, pos, radius)
+            elapsed_us = (time.perf_counter() - start) / len(positions) * 1e6
+            cells.append(f"{elapsed_us:>11.1f} us")
+        print(f"{name:<18}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# backend/benchmarks/bench_level_pool.py
+"""
+Cost of descending the stairs with the next level built inline on the event loop (before) against handed over
+from a LevelPool that prefetched it in worker processes (after). "acquire" is just getting the level; "descend"
+is the whole stairs interaction, including FOV and building dungeon_data. With fewer cores than workers + 1 the
+background build of the following level competes with the descend itself, so compare acquire first.
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_level_pool
+"""
+import logging
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from app.core import game_state as game_state_module
+from app.core.game_state import GameState
+from app.core.level_pool import LevelPool
+from app.core.tiles import TILE_STAIRS_DOWN
+
+GAMES = 30
+IDLE_BEFORE_DESCEND = 0.1 # seconds on a level before taking the stairs, time the pool has to build ahead
+
+
+def _descend_times(level_pool: Optional[LevelPool]) -> Tuple[List[float], List[float]]:
+    acquire: List[float] = []
+    build_level, take = game_state_module.build_level, LevelPool.take
+    def timed(fn):
+        def wrapper(*args):
+            start = time.perf_counter(); result = fn(*args); acquire.append(time.perf_counter() - start)
+            return result
+        return wrapper
+    game_state_module.build_level, LevelPool.take = timed(build_level), timed(take)
+    descend: List[float] = []
+    try:
+        for seed in range(GAMES):
+            gs = GameState(client_id="bench_level_pool"); gs.level_pool = level_pool
+            gs.generate_new_dungeon(seed=seed)
+            time.sleep(IDLE_BEFORE_DESCEND)
+            level_map = gs.map_manager.actual_dungeon_map
+            stairs = next((x, y) for y, row in enumerate(level_map) for x, tile in enumerate(row) if tile == TILE_STAIRS_DOWN)
+            start = time.perf_counter(); gs._handle_descend_stairs_interaction(*stairs); descend.append(time.perf_counter() - start)
+    finally:
+        game_state_module.build_level, LevelPool.take = build_level, take
+    return acquire[1::2], descend # every other acquire is the new game's own (inline) level
+
+
+def _row(label: str, times: List[float]) -> str:
+    ms = sorted(t * 1000 for t in times)
+    return f"{label:<28}{statistics.median(ms):>10.3f}{ms[int(len(ms) * 0.99) - 1]:>10.3f}"
+
+
+def main():
+    logging.disable(logging.INFO)
+    inline_acquire, inline_descend = _descend_times(None)
+    level_pool = LevelPool(ProcessPoolExecutor(max_workers=2))
+    try: pooled_acquire, pooled_descend = _descend_times(level_pool)
+    finally: level_pool.shutdown()
+    print(f"{'ms':<28}{'p50':>10}{'p99':>10}")
+    print(_row("acquire, inline", inline_acquire))
+    print(_row("acquire, level pool", pooled_acquire))
+    print(_row("descend, inline", inline_descend))
+    print(_row("descend, level pool", pooled_descend))
+
+
+if __name__ == "__main__":
+    main()
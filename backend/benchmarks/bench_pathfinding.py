@@ -0,0 +1,123 @@
+# backend/benchmarks/bench_pathfinding.py
+"""
+Pathfinding on large generated maps:
+  * long routes: MapManager.find_path_bfs (parent pointers over flat cell indices) against the
+    previous path-copying BFS;
+  * monster-turn routes (targets a few tiles away): nodes expanded by BFS versus A*.
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_pathfinding
+"""
+import time
+import tracemalloc
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.dungeon_generator import DungeonGenerator
+from app.core.entity_manager import EntityManager
+from app.core.map_manager import MapManager
+from app.core.tiles import TILE_FLOOR
+
+MAP_WIDTH, MAP_HEIGHT = 200, 200
+SEED = 4242
+ROUTES = 20
+SHORT_ROUTES = 500
+SHORT_ROUTE_MAX_MANHATTAN = 8
+
+
+def legacy_find_path_bfs(mm: MapManager, start_pos: Dict[str, int], end_pos: Dict[str, int], entity_type: str,
+                         entity_manager: EntityManager, player_pos: Optional[Dict[str, int]]) -> Optional[List[Dict[str, int]]]:
+    """The pre-parent-pointer search: every queue entry is a full copy of the path so far."""
+    queue: deque = deque([[start_pos]])
+    visited: Set[Tuple[int, int]] = {(start_pos["x"], start_pos["y"])}
+    while queue:
+        path = queue.popleft()
+        current_node = path[-1]
+        if current_node["x"] == end_pos["x"] and current_node["y"] == end_pos["y"]:
+            return path
+        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+            next_x, next_y = current_node["x"] + dx, current_node["y"] + dy
+            if (next_x, next_y) not in visited and mm.is_walkable_for_entity(next_x, next_y, entity_type, entity_manager, player_pos):
+                visited.add((next_x, next_y))
+                new_path = list(path)
+                new_path.append({"x": next_x, "y": next_y})
+                queue.append(new_path)
+    return None
+
+
+def _long_routes(mm: MapManager, em: EntityManager, origin: Tuple[int, int], count: int) -> List[Tuple[Dict[str, int], Dict[str, int]]]:
+    """Picks the floor tiles furthest (by walking distance, doors passable) from the origin as route endpoints."""
+    dist = {origin: 0}; queue = deque([origin])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+            nxt = (x + dx, y + dy)
+            if nxt not in dist and mm.is_walkable_for_entity(nxt[0], nxt[1], "player", em, None):
+                dist[nxt] = dist[(x, y)] + 1; queue.append(nxt)
+    far = sorted((d, pos) for pos, d in dist.items() if mm.actual_dungeon_map[pos[1]][pos[0]] == TILE_FLOOR)[-count:]
+    return [({"x": origin[0], "y": origin[1]}, {"x": pos[0], "y": pos[1]}) for _, pos in far]
+
+
+def _short_routes(mm: MapManager, em: EntityManager, count: int) -> List[Tuple[Dict[str, int], Dict[str, int]]]:
+    """Reachable floor-tile pairs at most SHORT_ROUTE_MAX_MANHATTAN apart, like a monster chasing the player."""
+    floors = [(x, y) for y, row in enumerate(mm.actual_dungeon_map) for x, tile in enumerate(row) if tile == TILE_FLOOR]
+    floor_set = set(floors)
+    routes = []
+    for i, (x, y) in enumerate(floors[::max(1, len(floors) // count)]):
+        offset = SHORT_ROUTE_MAX_MANHATTAN - i % 4
+        for tx, ty in ((x + offset, y), (x, y + offset), (x - offset, y), (x, y - offset)):
+            if (tx, ty) in floor_set:
+                start_pos, end_pos = {"x": x, "y": y}, {"x": tx, "y": ty}
+                if MapManager.find_path_bfs(mm, start_pos, end_pos, "player", em, None):
+                    routes.append((start_pos, end_pos))
+                break
+    return routes[:count]
+
+
+def _nodes_expanded(search, mm: MapManager, em: EntityManager, routes) -> Tuple[float, float]:
+    total_nodes = 0
+    start = time.perf_counter()
+    for start_pos, end_pos in routes:
+        search(mm, start_pos, end_pos, "player", em, None)
+        total_nodes += mm.last_search_nodes_expanded
+    elapsed_us = (time.perf_counter() - start) / len(routes) * 1e6
+    return total_nodes / len(routes), elapsed_us
+
+
+def _measure(search, mm: MapManager, em: EntityManager, routes) -> Tuple[float, int, int]:
+    start = time.perf_counter()
+    for start_pos, end_pos in routes:
+        search(mm, start_pos, end_pos, "player", em, None)
+    elapsed_ms = (time.perf_counter() - start) / len(routes) * 1e3
+    tracemalloc.start()
+    for start_pos, end_pos in routes:
+        path = search(mm, start_pos, end_pos, "player", em, None)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak, len(path) if path else 0
+
+
+def main():
+    generator = DungeonGenerator(MAP_WIDTH, MAP_HEIGHT, seed=SEED)
+    map_data, player_start = generator.generate_dungeon(max_rooms=120)
+    mm = MapManager(); mm.actual_dungeon_map = map_data
+    em = EntityManager()
+    routes = _long_routes(mm, em, player_start, ROUTES)
+
+    print(f"Map {MAP_WIDTH}x{MAP_HEIGHT}, {len(routes)} longest routes from the player start")
+    print(f"{'search':<22}{'mean time':>14}{'peak alloc':>16}{'path len':>10}")
+    for name, search in [("legacy path-copy BFS", legacy_find_path_bfs), ("parent-pointer BFS", MapManager.find_path_bfs)]:
+        elapsed_ms, peak, path_len = _measure(search, mm, em, routes)
+        print(f"{name:<22}{elapsed_ms:>11.2f} ms{peak / 1024:>13.1f} KiB{path_len:>10}")
+
+    short_routes = _short_routes(mm, em, SHORT_ROUTES)
+    print()
+    print(f"{len(short_routes)} monster-turn routes (targets <= {SHORT_ROUTE_MAX_MANHATTAN} tiles away, Manhattan)")
+    print(f"{'search':<22}{'nodes/search':>14}{'mean time':>14}")
+    for name, search in [("BFS", MapManager.find_path_bfs), ("A* (Manhattan)", MapManager.find_path_astar)]:
+        nodes, elapsed_us = _nodes_expanded(search, mm, em, short_routes)
+        print(f"{name:<22}{nodes:>14.1f}{elapsed_us:>11.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# backend/benchmarks/bench_protocol.py
+"""
+Per-turn send latency under load: the original one-frame-per-response protocol against the negotiated
+turn_result envelope (one frame, encoded once), in JSON and in the binary wire format. Many sessions replay recorded turns concurrently on one event
+loop; every frame costs one loop round trip in the fake socket, standing in for the websocket write.
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_protocol
+"""
+import asyncio
+import json
+import statistics
+import time
+import timeit
+from typing import List
+from unittest.mock import MagicMock
+
+from app.core.game_state import GameState
+from app.protocol import ConnectionOptions, encode_turn_frames, to_wire
+from app.main import send_responses
+
+SESSIONS = 200
+TURNS = 60
+SEED = 31
+
+
+class _FakeWebSocket:
+    def __init__(self):
+        self.frames = 0
+        self.bytes_sent = 0
+
+    async def send_text(self, data: str):
+        self.frames += 1; self.bytes_sent += len(data)
+        await asyncio.sleep(0)
+
+    async def send_bytes(self, data: bytes):
+        await self.send_text(data)
+
+    async def send_json(self, data):
+        await self.send_text(json.dumps(data))
+
+
+async def _legacy_send_responses(websocket, responses, options=None):
+    """The send loop before the envelope existed: one send_json per response."""
+    for response in responses:
+        if response:
+            await websocket.send_json(to_wire(response))
+
+
+def _record_turns() -> List[list]:
+    gs = GameState(client_id="bench_protocol"); gs.logger = MagicMock()
+    turns, step = [[gs.generate_new_dungeon(seed=SEED, is_new_level=False)]], 0
+    while len(turns) < TURNS:
+        x, y = gs.player.pos["x"], gs.player.pos["y"]
+        moves = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+        dx, dy = next((m for m in moves[step % 4:] + moves[:step % 4] if gs._is_walkable_for_entity(x + m[0], y + m[1], "player")), (0, 0))
+        turns.append(gs.handle_player_move(x + dx, y + dy))
+        step += 1 if (dx, dy) == (0, 0) or len(turns) % 5 == 0 else 0
+    return turns
+
+
+async def _session(send, turns, options, latencies: List[float], websocket: _FakeWebSocket):
+    for responses in turns:
+        start = time.perf_counter()
+        await send(websocket, responses, options)
+        latencies.append(time.perf_counter() - start)
+
+
+async def _run(send, turns, options):
+    latencies: List[float] = []
+    sockets = [_FakeWebSocket() for _ in range(SESSIONS)]
+    start = time.perf_counter()
+    await asyncio.gather(*(_session(send, turns, options, latencies, ws) for ws in sockets))
+    elapsed = time.perf_counter() - start
+    return latencies, elapsed, sum(ws.frames for ws in sockets), sum(ws.bytes_sent for ws in sockets)
+
+
+def main():
+    turns = _record_turns()
+    dungeon = turns[0][0]
+    for wire_format in ("json", "binary"):
+        (frame,) = encode_turn_frames([dungeon], ConnectionOptions(wire_format=wire_format))
+        encode_us = min(timeit.repeat(lambda: encode_turn_frames([dungeon], ConnectionOptions(wire_format=wire_format)), number=50, repeat=5)) / 50 * 1e6
+        print(f"dungeon_data {len(dungeon.map[0])}x{len(dungeon.map)} as {wire_format:<7}{len(frame):>8} bytes{encode_us:>9.0f} us to encode")
+    responses_per_turn = statistics.mean(len(t) for t in turns)
+    print(f"{SESSIONS} sessions x {len(turns)} turns, {responses_per_turn:.1f} responses/turn")
+    print(f"{'protocol':<24}{'p50':>10}{'p99':>10}{'turns/s':>10}{'frames':>9}{'KiB':>9}")
+    for name, send, options in [
+        ("per-response frames", _legacy_send_responses, None),
+        ("turn_result envelope", send_responses, ConnectionOptions(turn_envelope=True)),
+        ("binary frames", send_responses, ConnectionOptions(wire_format="binary")),
+        ("binary envelope", send_responses, ConnectionOptions(turn_envelope=True, wire_format="binary")),
+    ]:
+        latencies, elapsed, frames, sent = asyncio.run(_run(send, turns, options))
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(f"{name:<24}{quantiles[49] * 1e3:>7.2f} ms{quantiles[98] * 1e3:>7.2f} ms"
+              f"{len(latencies) / elapsed:>10.0f}{frames:>9}{sent / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
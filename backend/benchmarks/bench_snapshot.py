@@ -0,0 +1,56 @@
+# backend/benchmarks/bench_snapshot.py
+"""
+Size and speed of saving a game: zlib-compressed pickle of the GameState (before) against GameState.snapshot()
+(after), on levels of increasing size after a few turns of play. Times are the median of REPEATS runs.
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_snapshot
+"""
+import logging
+import pickle
+import statistics
+import time
+import zlib
+from typing import Callable
+
+from app.core.game_state import GameState
+
+LEVELS = ((50, 30, 15), (80, 50, 30), (200, 200, 120)) # width, height, max rooms
+TURNS = 20
+REPEATS = 200
+SEED = 4
+
+
+def _median_ms(fn: Callable[[], object]) -> float:
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter(); fn(); times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def _played_game(width: int, height: int, max_rooms: int) -> GameState:
+    gs = GameState(client_id="bench_snapshot")
+    gs.generate_new_dungeon(seed=SEED, width=width, height=height, max_rooms=max_rooms)
+    for turn in range(TURNS):
+        dx, dy = [(1, 0), (0, 1), (-1, 0), (0, -1)][turn % 4]
+        gs.handle_player_move(gs.player.pos["x"] + dx, gs.player.pos["y"] + dy)
+    return gs
+
+
+def main():
+    logging.disable(logging.INFO)
+    print(f"{'level':<10}{'format':<10}{'bytes':>10}{'save ms':>10}{'load ms':>10}")
+    for width, height, max_rooms in LEVELS:
+        gs = _played_game(width, height, max_rooms)
+        pickled = zlib.compress(pickle.dumps(gs, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        snapshot = gs.snapshot()
+        label = f"{width}x{height}"
+        print(f"{label:<10}{'pickle':<10}{len(pickled):>10}"
+              f"{_median_ms(lambda: zlib.compress(pickle.dumps(gs, protocol=pickle.HIGHEST_PROTOCOL), 1)):>10.3f}"
+              f"{_median_ms(lambda: pickle.loads(zlib.decompress(pickled))):>10.3f}")
+        print(f"{label:<10}{'snapshot':<10}{len(snapshot):>10}{_median_ms(gs.snapshot):>10.3f}"
+              f"{_median_ms(lambda: GameState.restore(snapshot)):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
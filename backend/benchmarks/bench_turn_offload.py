@@ -0,0 +1,92 @@
+# backend/benchmarks/bench_turn_offload.py
+"""
+Load test for turn execution: many players on one event loop, each sending a move every THINK_TIME seconds,
+with turns run inline on the loop (before) or by ThreadTurnRunner (after). Two latencies are reported:
+
+  loop lag   how late a 5 ms timer on the same loop fires: the wait any other connection's I/O (a receive,
+             a send, a new handshake) sees. This is what offloading is meant to keep flat.
+  turn       from a move arriving to its frames being sent, for the player who sent it.
+
+Turns are the real play_turn path (validation, GameState.handle_player_move, FOV, monster AI, encoding).
+Once the players' turns saturate a core, turn latency rises in both modes: under the GIL the thread pool adds no
+CPU. What offloading buys is a loop lag that stays at about the interpreter's switch interval (5 ms) however
+many players there are, where inline it grows with the load. With TURN_WORKER_THREADS > 1 the turn threads
+contend for the GIL, and both latencies get worse.
+
+Turn p99 is not flat: every player in the worker shares one turn thread, so on one core it goes from about 5 ms
+at 1 player to about 70 ms at 96. Keeping it flat takes more worker processes, not more threads.
+
+Run from the backend/ directory:
+    python -m benchmarks.bench_turn_offload
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import List, Tuple
+
+from app.core.game_state import GameState
+from app.main import play_turn
+from app.protocol import ConnectionOptions
+from app.turn_runner import ThreadTurnRunner, TurnRunner
+
+PLAYER_COUNTS = (1, 16, 64, 96)
+TURNS = 40
+THINK_TIME = 0.05 # seconds between a player's moves
+NEW_GAME_CHANCE = 0.05 # the heavy turns: a fresh dungeon generated on the spot
+PROBE_INTERVAL = 0.005
+SEED = 13
+_STEPS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+async def _player(runner: TurnRunner, index: int, latencies: List[float]):
+    gs = GameState(client_id=f"bench_{index}")
+    options = ConnectionOptions(turn_envelope=True)
+    play_turn(gs, {"action": "generate_dungeon", "seed": SEED + index}, options)
+    rng = random.Random(index)
+    await asyncio.sleep(rng.random() * THINK_TIME) # players do not move in lockstep
+    for _ in range(TURNS):
+        if gs.game_over or rng.random() < NEW_GAME_CHANCE: message = {"action": "generate_dungeon", "seed": rng.randrange(10**6)}
+        else:
+            dx, dy = rng.choice(_STEPS)
+            message = {"action": "player_move", "new_pos": {"x": gs.player.pos["x"] + dx, "y": gs.player.pos["y"] + dy}}
+        start = time.perf_counter()
+        await runner.run(gs, play_turn, gs, message, options)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(THINK_TIME)
+
+
+async def _probe(lags: List[float], stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def _load(runner: TurnRunner, players: int) -> Tuple[List[float], List[float]]:
+    turns: List[float] = []; lags: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.ensure_future(_probe(lags, stop))
+    await asyncio.gather(*(_player(runner, i, turns) for i in range(players)))
+    stop.set(); await probe
+    return turns, lags
+
+
+def _p(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+
+def main():
+    logging.disable(logging.INFO)
+    print(f"{'mode':<8}{'players':>8}{'lag p50':>10}{'lag p99':>10}{'turn p50':>10}{'turn p99':>10}   (ms)")
+    for name, make_runner in (("inline", TurnRunner), ("thread", ThreadTurnRunner)):
+        for players in PLAYER_COUNTS:
+            runner = make_runner()
+            try: turns, lags = asyncio.run(_load(runner, players))
+            finally: runner.shutdown()
+            print(f"{name:<8}{players:>8}{_p(lags, 0.5):>10.2f}{_p(lags, 0.99):>10.2f}{_p(turns, 0.5):>10.2f}{_p(turns, 0.99):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()